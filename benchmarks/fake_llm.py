@@ -0,0 +1,140 @@
+# Offline stand-in for the OpenAI chat model, used by the benchmark suite.
+#   from benchmarks.fake_llm import FakeChatModel, Latency
+#   set_client(FakeChatModel(latency=Latency("lognormal", 0.3, 0.4), routes={"news": "premarket"}))
+# Latency and reply length are derived from a hash of the prompt, so the same
+# prompt always takes the same simulated time and gets the same answer.
+import asyncio
+import math
+import random
+import time
+import zlib
+from typing import Any, Optional
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+from src.components.chatbot import chatbot_instructions
+from src.components.summary import summary_instructions
+
+WORDS = ("market", "price", "volume", "trend", "support", "resistance", "risk", "entry", "exit", "momentum",
+         "earnings", "rates", "sector", "breakout", "pullback", "liquidity", "spread", "target", "stop", "range")
+
+
+class Latency:
+    """Time to first token, in seconds. `kind` is "constant" (a), "uniform"
+    (a..b), "normal" (mean a, stdev b, floored at 0) or "lognormal" (median a,
+    sigma b). Parsed from strings like "lognormal:0.3,0.4"."""
+
+    def __init__(self, kind: str = "constant", a: float = 0.0, b: float = 0.0):
+        if kind not in ("constant", "uniform", "normal", "lognormal"):
+            raise ValueError(f"Unknown latency distribution: {kind}")
+        self.kind, self.a, self.b = kind, a, b
+
+    @classmethod
+    def parse(cls, text: str) -> "Latency":
+        kind, _, params = text.partition(":")
+        values = [float(v) for v in params.split(",") if v] if params else []
+        return cls(kind, *values)
+
+    def sample(self, rng: random.Random) -> float:
+        if self.kind == "uniform":
+            return rng.uniform(self.a, self.b)
+        if self.kind == "normal":
+            return max(0.0, rng.gauss(self.a, self.b))
+        if self.kind == "lognormal":
+            return self.a * math.exp(rng.gauss(0.0, self.b))
+        return self.a
+
+    def __repr__(self):
+        return f"{self.kind}:{self.a:g},{self.b:g}"
+
+
+class FakeChatModel(BaseChatModel):
+    """Chat model with simulated latency and streaming throughput.
+
+    Routing prompts (the chatbot's instructions) are answered from `routes`:
+    the first key found in the latest user message wins, else
+    `default_route`. Summary prompts get a short summary; everything else gets
+    `reply_tokens` (+/- 50%) words streamed at `tokens_per_second`."""
+
+    latency: Any = Latency()
+    tokens_per_second: float = 0.0  # 0 = the whole reply arrives at once
+    reply_tokens: int = 120
+    routes: dict = {}
+    default_route: str = "intraday"
+    calls: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-benchmark"
+
+    def _script(self, messages) -> tuple:
+        first = messages[0].content if messages else ""
+        rng = random.Random(zlib.crc32("\n".join(str(m.content) for m in messages).encode()))
+        delay = self.latency.sample(rng)
+        if first == chatbot_instructions:
+            question = next((m.content for m in reversed(messages) if m.type == "human"), "").lower()
+            reply = next((answer for key, answer in self.routes.items() if key in question), self.default_route)
+        elif first == summary_instructions:
+            reply = "Summary: " + " ".join(rng.choice(WORDS) for _ in range(40))
+        else:
+            count = max(1, int(self.reply_tokens * rng.uniform(0.5, 1.5)))
+            reply = " ".join(rng.choice(WORDS) for _ in range(count))
+        tokens = reply.split(" ")
+        usage = {"input_tokens": sum(len(str(m.content)) // 4 + 4 for m in messages), "output_tokens": len(tokens)}
+        usage["total_tokens"] = usage["input_tokens"] + usage["output_tokens"]
+        return delay, tokens, usage
+
+    def _pause(self) -> float:
+        # seconds between streamed tokens
+        return 1.0 / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+
+    def _generate(self, messages, stop=None, run_manager: Optional[CallbackManagerForLLMRun] = None, **kwargs):
+        self.calls += 1
+        delay, tokens, usage = self._script(messages)
+        time.sleep(delay + self._pause() * len(tokens))
+        message = AIMessage(" ".join(tokens), usage_metadata=usage)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(self, messages, stop=None, run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+                         **kwargs):
+        self.calls += 1
+        delay, tokens, usage = self._script(messages)
+        await asyncio.sleep(delay + self._pause() * len(tokens))
+        message = AIMessage(" ".join(tokens), usage_metadata=usage)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(self, messages, stop=None, run_manager: Optional[CallbackManagerForLLMRun] = None, **kwargs):
+        self.calls += 1
+        delay, tokens, usage = self._script(messages)
+        time.sleep(delay)
+        pause = self._pause()
+        for i, token in enumerate(tokens):
+            if pause:
+                time.sleep(pause)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(
+                content=token if i == 0 else " " + token,
+                usage_metadata=usage if i == len(tokens) - 1 else None,
+            ))
+            if run_manager:
+                run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+
+    async def _astream(self, messages, stop=None, run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+                       **kwargs):
+        self.calls += 1
+        delay, tokens, usage = self._script(messages)
+        await asyncio.sleep(delay)
+        pause = self._pause()
+        for i, token in enumerate(tokens):
+            if pause:
+                await asyncio.sleep(pause)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(
+                content=token if i == 0 else " " + token,
+                usage_metadata=usage if i == len(tokens) - 1 else None,
+            ))
+            if run_manager:
+                await run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
@@ -0,0 +1,357 @@
+# Offline benchmark suite for the TradingPal graph, with benchmarks/fake_llm.py
+# standing in for the model.
+#   python benchmarks/run.py                                    # all scenarios
+#   python benchmarks/run.py --scenario fanout --latency lognormal:0.2,0.5
+#   python benchmarks/run.py --save-baseline                    # record a baseline
+# Each scenario runs in its own interpreter, so graph/router warm-up and peak
+# RSS are per scenario. Results are written as JSON (--output) and compared
+# with the baseline: latency percentiles that grow, or throughput that drops,
+# by more than --tolerance are reported and make the run exit with status 1.
+# A baseline recorded with different workload settings is not compared.
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import math
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE = os.path.join(ROOT, "benchmarks", "baselines", "suite.json")
+OUTPUT = os.path.join(ROOT, "benchmarks", "results", "latest.json")
+sys.path.insert(0, ROOT)
+
+# Scripted routing answers, keyed by a word in the question.
+ROUTES = {
+    "news": "premarket",
+    "position": "intraday",
+    "review": "postmarket",
+    "backtest": "strategy",
+    "everything": "premarket intraday postmarket strategy",
+    "weather": "human_clarification\nI can only help with trading. What would you like to know?",
+}
+SINGLE_QUERIES = (
+    "What does the overnight news mean for tech stocks?",
+    "How is my open position in NVDA doing?",
+    "Please review today's trades.",
+    "Can you backtest a simple trend-following idea for me?",
+)
+
+
+def percentile(values: list, q: float) -> float:
+    if not values:
+        return None
+    ordered = sorted(values)
+    # nearest rank: the smallest value with at least q% of the samples at or below it
+    return ordered[max(0, math.ceil(q * len(ordered) / 100) - 1)]
+
+
+def summarize(latencies: list) -> dict:
+    return {
+        "count": len(latencies),
+        "p50_s": percentile(latencies, 50),
+        "p95_s": percentile(latencies, 95),
+        "p99_s": percentile(latencies, 99),
+        "mean_s": sum(latencies) / len(latencies) if latencies else None,
+        "max_s": max(latencies) if latencies else None,
+    }
+
+
+class Recorder:
+    """Collects turn latencies and per-node durations for one scenario. Node
+    durations come from the task / task_result events of the debug stream."""
+
+    def __init__(self):
+        self.turns = []
+        self.nodes = {}
+        self.started = time.perf_counter()
+
+    def event(self, event: dict, pending: dict):
+        if event["type"] == "task":
+            pending[event["payload"]["id"]] = datetime.fromisoformat(event["timestamp"]).timestamp()
+        elif event["type"] == "task_result":
+            started = pending.pop(event["payload"]["id"], None)
+            if started is not None:
+                duration = datetime.fromisoformat(event["timestamp"]).timestamp() - started
+                self.nodes.setdefault(event["payload"]["name"], []).append(duration)
+
+    def turn(self, graph, input, config, record: bool = True) -> float:
+        pending = {}
+        started = time.perf_counter()
+        for event in graph.stream(input, config, stream_mode="debug"):
+            self.event(event, pending)
+        latency = time.perf_counter() - started
+        if record:
+            self.turns.append(latency)
+        return latency
+
+    async def aturn(self, graph, input, config) -> float:
+        pending = {}
+        started = time.perf_counter()
+        async for event in graph.astream(input, config, stream_mode="debug"):
+            self.event(event, pending)
+        latency = time.perf_counter() - started
+        self.turns.append(latency)
+        return latency
+
+    def report(self, **extra) -> dict:
+        elapsed = time.perf_counter() - self.started
+        return {
+            "latency": summarize(self.turns),
+            "throughput_turns_s": len(self.turns) / elapsed if elapsed > 0 else None,
+            "elapsed_s": elapsed,
+            "nodes": {name: summarize(values) for name, values in sorted(self.nodes.items())},
+            **extra,
+        }
+
+
+def _config():
+    return {"configurable": {"thread_id": f"bench-{uuid.uuid4().hex[:12]}"}}
+
+
+def single_turn(args) -> dict:
+    from langchain_core.messages import HumanMessage
+    from src.graph import trading_pal
+
+    graph = trading_pal()
+    recorder = Recorder()
+    for i in range(args.turns):
+        recorder.turn(graph, {"messages": [HumanMessage(SINGLE_QUERIES[i % len(SINGLE_QUERIES)])]}, _config())
+    return recorder.report()
+
+
+def fanout(args) -> dict:
+    from langchain_core.messages import HumanMessage
+    from src.graph import atrading_pal
+
+    async def run():
+        graph = atrading_pal()
+        recorder = Recorder()
+        for i in range(args.turns):
+            message = HumanMessage(f"Tell me everything about the market today ({i})")
+            await recorder.aturn(graph, {"messages": [message]}, _config())
+        return recorder
+
+    recorder = asyncio.run(run())
+    experts = sum(d for name, values in recorder.nodes.items() if name not in ("chatbot", "summary") for d in values)
+    # expert time per second of wall time: ~4 when a four-way fan-out runs
+    # fully in parallel, below 1 when the experts run one after another
+    return recorder.report(expert_time_s=experts, expert_parallelism=experts / sum(recorder.turns))
+
+
+def interrupt_resume(args) -> dict:
+    from langchain_core.messages import HumanMessage
+    from langgraph.types import Command
+    from src.graph import trading_pal
+
+    graph = trading_pal()
+    recorder = Recorder()
+    asks, answers = [], []
+    interrupted = resumed = 0
+    for _ in range(args.turns):
+        config = _config()
+        asks.append(recorder.turn(graph, {"messages": [HumanMessage("What's the weather like?")]}, config, False))
+        if graph.get_state(config).next:
+            interrupted += 1
+        answers.append(recorder.turn(graph, Command(resume="Then what does the news say about rates?"), config, False))
+        if not graph.get_state(config).next:
+            resumed += 1
+        # one turn is the round trip; the two legs differ too much for
+        # percentiles over both to be stable
+        recorder.turns.append(asks[-1] + answers[-1])
+    return recorder.report(interrupt=summarize(asks), resume=summarize(answers),
+                           interrupted=interrupted, resumed=resumed)
+
+
+def long_conversation(args) -> dict:
+    from langchain_core.messages import HumanMessage
+    from src.graph import atrading_pal
+
+    async def run():
+        graph = atrading_pal()
+        recorder = Recorder()
+        config = _config()
+        for i in range(args.long_turns):
+            query = SINGLE_QUERIES[i % len(SINGLE_QUERIES)]
+            await recorder.aturn(graph, {"messages": [HumanMessage(f"{query} (turn {i})")]}, config)
+        state = await graph.aget_state(config)
+        return recorder, state.values
+
+    recorder, values = asyncio.run(run())
+    window = max(1, len(recorder.turns) // 4)
+    early = percentile(recorder.turns[:window], 50)
+    late = percentile(recorder.turns[-window:], 50)
+    return recorder.report(
+        final_messages=len(values.get("messages", [])),
+        summary_chars=len(values.get("summary") or ""),
+        late_vs_early_p50=late / early if early else None,
+    )
+
+
+def concurrent_threads(args) -> dict:
+    from langchain_core.messages import HumanMessage
+    from src.graph import atrading_pal
+
+    async def run():
+        graph = atrading_pal()
+        recorder = Recorder()
+
+        async def conversation(n):
+            config = _config()
+            for i in range(args.turns_per_thread):
+                query = SINGLE_QUERIES[(n + i) % len(SINGLE_QUERIES)]
+                await recorder.aturn(graph, {"messages": [HumanMessage(query)]}, config)
+
+        await asyncio.gather(*(conversation(n) for n in range(args.threads)))
+        return recorder
+
+    return asyncio.run(run()).report(threads=args.threads)
+
+
+SCENARIOS = {
+    "single_turn": single_turn,
+    "fanout": fanout,
+    "interrupt_resume": interrupt_resume,
+    "long_conversation": long_conversation,
+    "concurrent_threads": concurrent_threads,
+}
+
+
+# settings that change the workload; results recorded with different values
+# aren't comparable
+WORKLOAD = ("latency", "tokens_per_second", "reply_tokens", "turns", "long_turns", "threads",
+            "turns_per_thread", "checkpointer", "cache", "fast_router")
+
+
+def config_mismatch(results: dict, baseline: dict) -> list:
+    before = baseline.get("config", {})
+    return [f"{key}: {before.get(key)!r} vs {results['config'].get(key)!r}"
+            for key in WORKLOAD if before.get(key) != results["config"].get(key)]
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    regressions = []
+    for name, current in results["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name)
+        if not before:
+            continue
+        for key in ("p50_s", "p95_s", "p99_s"):
+            old, new = before["latency"].get(key), current["latency"].get(key)
+            if old and new and new > old * (1 + tolerance):
+                regressions.append(f"{name} {key}: {old:.3f}s -> {new:.3f}s")
+        old, new = before.get("throughput_turns_s"), current.get("throughput_turns_s")
+        if old and new and new < old / (1 + tolerance):
+            regressions.append(f"{name} throughput: {old:.2f} -> {new:.2f} turns/s")
+    return regressions
+
+
+def run_scenario(name: str, args) -> dict:
+    # runs in a fresh interpreter (see main), so ru_maxrss is this
+    # scenario's own peak; settings are read by the graph at import / first use
+    os.environ["OPENAI_API_KEY"] = os.environ.get("OPENAI_API_KEY") or "offline"
+    os.environ["TRADINGPAL_CHECKPOINTER"] = args.checkpointer
+    if args.checkpointer == "sqlite":
+        os.environ["TRADINGPAL_CHECKPOINT_DB"] = os.path.join(tempfile.mkdtemp(), "bench.db")
+    if not args.cache:
+        os.environ["TRADINGPAL_CACHE"] = "0"
+    if not args.fast_router:
+        os.environ["TRADINGPAL_ROUTER_THRESHOLD"] = "2"  # never confident, so routing goes to the model
+
+    from benchmarks.fake_llm import FakeChatModel, Latency
+    from src.utils.helpers import set_client
+    import src.graph  # noqa: F401 -- count import memory as the starting point, not the scenario
+
+    model = FakeChatModel(latency=Latency.parse(args.latency), tokens_per_second=args.tokens_per_second,
+                          reply_tokens=args.reply_tokens, routes=ROUTES)
+    set_client(model)
+    start_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    # keep the nodes' fallback warnings (e.g. missing trade or news files)
+    # out of the JSON report on stdout
+    with contextlib.redirect_stdout(io.StringIO()):
+        report = SCENARIOS[name](args)
+    report["llm_calls"] = model.calls
+    report["peak_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    report["rss_growth_mb"] = report["peak_rss_mb"] - start_rss
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python benchmarks/run.py")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="run only these scenarios (repeatable)")
+    parser.add_argument("--latency", default="lognormal:0.05,0.5",
+                        help="time to first token: constant:A, uniform:A,B, normal:MEAN,SD or lognormal:MEDIAN,SIGMA")
+    parser.add_argument("--tokens-per-second", type=float, default=400.0)
+    parser.add_argument("--reply-tokens", type=int, default=120)
+    parser.add_argument("--turns", type=int, default=20)
+    parser.add_argument("--long-turns", type=int, default=30)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--turns-per-thread", type=int, default=5)
+    parser.add_argument("--checkpointer", choices=("memory", "sqlite"), default="memory")
+    parser.add_argument("--cache", action="store_true", help="keep the response cache on")
+    parser.add_argument("--fast-router", action="store_true", help="let the local classifier route")
+    parser.add_argument("--output", default=OUTPUT)
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--worker", choices=sorted(SCENARIOS), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_scenario(args.worker, args)))
+        return
+
+    results = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "config": {k: v for k, v in vars(args).items() if k not in ("output", "baseline", "save_baseline", "worker")},
+        "scenarios": {},
+    }
+    for name in args.scenario or SCENARIOS:
+        print(f"Running {name}...", file=sys.stderr)
+        out = subprocess.run([sys.executable, os.path.abspath(__file__), *sys.argv[1:], "--worker", name],
+                             cwd=ROOT, stdout=subprocess.PIPE, text=True)
+        if out.returncode != 0:
+            sys.exit(f"{name} failed (exit {out.returncode})")
+        report = json.loads(out.stdout.strip().splitlines()[-1])
+        results["scenarios"][name] = report
+        latency = report["latency"]
+        print(f"  p50 {latency['p50_s']:.3f}s  p95 {latency['p95_s']:.3f}s  p99 {latency['p99_s']:.3f}s  "
+              f"{report['throughput_turns_s']:.1f} turns/s  peak rss {report['peak_rss_mb']:.0f} MB "
+              f"(+{report['rss_growth_mb']:.0f} MB in scenario)", file=sys.stderr)
+
+    regressions = []
+    if args.save_baseline:
+        target = args.baseline
+    else:
+        target = args.output
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+            mismatch = config_mismatch(results, baseline)
+            if mismatch:
+                results["comparison"] = "skipped: workload differs from the baseline"
+                print(f"Not comparing with {args.baseline}, workload differs: " + "; ".join(mismatch),
+                      file=sys.stderr)
+            else:
+                regressions = compare(results, baseline, args.tolerance)
+                results["regressions"] = regressions
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    with open(target, "w") as f:
+        json.dump(results, f, indent=2)
+        f.write("\n")
+    print(f"Wrote {target}", file=sys.stderr)
+    for regression in regressions:
+        print(f"REGRESSION: {regression}", file=sys.stderr)
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# Cold-start benchmark: import the graph and compile it in fresh interpreters.
+#   python benchmarks/startup.py                  # compare with the saved baseline
+#   python benchmarks/startup.py --save-baseline  # record this machine's numbers
+# Fails (exit 1) when a module that should load lazily is imported at
+# startup, or when the median startup time regresses past the tolerance.
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE = os.path.join(ROOT, "benchmarks", "baselines", "startup.json")
+
+# Must not be imported just by building the graph.
+LAZY_MODULES = (
+    "IPython",
+    "openai",
+    "langchain_openai",
+    "numpy",
+    "src.experts.premarket",
+    "src.experts.intraday",
+    "src.experts.postmarket",
+    "src.experts.strategy",
+)
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import src.graph
+imported = time.perf_counter()
+src.graph.trading_pal()
+src.graph.atrading_pal()
+compiled = time.perf_counter()
+src.graph.trading_pal()
+cached = time.perf_counter()
+print(json.dumps({
+    "import_s": imported - started,
+    "compile_s": compiled - imported,
+    "cached_s": cached - compiled,
+    "modules": len(sys.modules),
+    "loaded": [m for m in %r if m in sys.modules],
+}))
+"""
+
+
+def probe() -> dict:
+    # no API key and no stdin: startup must neither need nor wait for either
+    env = {k: v for k, v in os.environ.items() if k != "OPENAI_API_KEY"}
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE % (LAZY_MODULES,)],
+        cwd=ROOT, env=env, stdin=subprocess.DEVNULL, capture_output=True, text=True, timeout=120,
+    )
+    if out.returncode != 0:
+        raise RuntimeError(out.stderr.strip().splitlines()[-1] if out.stderr else "probe failed")
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python benchmarks/startup.py")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--tolerance", type=float, default=0.5, help="allowed slowdown vs the baseline (0.5 = +50%%)")
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args()
+
+    runs = [probe() for _ in range(args.runs)]
+    total = [r["import_s"] + r["compile_s"] for r in runs]
+    report = {
+        "runs": args.runs,
+        "import_s_p50": statistics.median(r["import_s"] for r in runs),
+        "compile_s_p50": statistics.median(r["compile_s"] for r in runs),
+        "cached_s_p50": statistics.median(r["cached_s"] for r in runs),
+        "startup_s_p50": statistics.median(total),
+        "startup_s_max": max(total),
+        "modules": runs[-1]["modules"],
+        "eagerly_loaded": sorted({m for r in runs for m in r["loaded"]}),
+    }
+    failures = [f"{m} is imported at startup" for m in report["eagerly_loaded"]]
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        limit = baseline["startup_s_p50"] * (1 + args.tolerance)
+        report["baseline_startup_s_p50"] = baseline["startup_s_p50"]
+        report["change"] = report["startup_s_p50"] / baseline["startup_s_p50"] - 1
+        if report["startup_s_p50"] > limit:
+            failures.append(f"startup {report['startup_s_p50']:.3f}s exceeds baseline limit {limit:.3f}s")
+
+    print(json.dumps(report, indent=2))
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+from src.analytics.trades import TradeStats, analyze_trades, format_summary, trade_summary
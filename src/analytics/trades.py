@@ -0,0 +1,291 @@
+import os
+from itertools import islice
+
+import numpy as np
+
+# Column aliases accepted in trade files; one closed trade per row.
+COLUMNS = {
+    "symbol": ("symbol", "ticker"),
+    "side": ("side", "direction"),
+    "qty": ("qty", "quantity", "shares", "size"),
+    "entry_time": ("entry_time", "open_time", "entry_ts"),
+    "exit_time": ("exit_time", "close_time", "exit_ts"),
+    "entry_price": ("entry_price", "open_price", "buy_price"),
+    "exit_price": ("exit_price", "close_price", "sell_price"),
+    "fees": ("fees", "commission"),
+    "expected_entry_price": ("expected_entry_price", "arrival_entry_price", "signal_entry_price"),
+    "expected_exit_price": ("expected_exit_price", "arrival_exit_price", "signal_exit_price"),
+}
+REQUIRED = ("symbol", "side", "qty", "entry_time", "exit_time", "entry_price", "exit_price")
+SHORT_SIDES = ("short", "sell", "s", "sell_short")
+
+# Holding-time histogram bucket edges, in seconds.
+HOLD_EDGES = np.array([0, 60, 300, 900, 1800, 3600, 4 * 3600, 86400, 7 * 86400, np.inf])
+HOLD_LABELS = ("<1m", "1-5m", "5-15m", "15-30m", "30-60m", "1-4h", "4h-1d", "1d-1w", ">1w")
+
+
+def _floats(values) -> np.ndarray:
+    values = np.asarray(values)
+    if values.dtype.kind in "US":
+        values = np.where(np.char.strip(values.astype(str)) == "", "nan", values)
+    return values.astype(np.float64)
+
+
+def _to_seconds(values) -> np.ndarray:
+    values = np.asarray(values)
+    if values.dtype.kind in "iuf":
+        return values.astype(np.float64)
+    if values.dtype.kind == "M":
+        return values.astype("datetime64[s]").astype(np.float64)
+    try:
+        return values.astype(np.float64)
+    except ValueError:
+        return np.char.replace(values.astype(str), " ", "T").astype("datetime64[s]").astype(np.float64)
+
+
+def _is_number(text: str) -> bool:
+    try:
+        float(text)
+        return True
+    except ValueError:
+        return False
+
+
+def _fill_empty(lines: list) -> list:
+    # "nan" in every empty field, including the first and last column; the
+    # text is framed by newlines so both ends match a "\n," / ",\n" pattern.
+    # Runs of empty fields need the ",," pass twice (matches don't overlap).
+    text = "\n" + "".join(lines).replace("\r\n", "\n").replace("\r", "\n") + "\n"
+    text = text.replace(",,", ",nan,").replace(",,", ",nan,")
+    text = text.replace("\n,", "\nnan,").replace(",\n", ",nan\n")
+    return [row for row in text.split("\n") if row]
+
+
+def iter_csv_chunks(path: str, chunk_rows: int = 500_000):
+    # Plain comma-separated files (no quoted fields). Each chunk is parsed
+    # column-wise by numpy's C reader: one pass for numeric columns and one
+    # for text columns; empty numeric fields become NaN.
+    with open(path) as f:
+        header = [h.strip().lower() for h in f.readline().split(",")]
+        index = {}
+        for name, aliases in COLUMNS.items():
+            for alias in aliases:
+                if alias in header:
+                    index[name] = header.index(alias)
+                    break
+        missing = [c for c in REQUIRED if c not in index]
+        if missing:
+            raise ValueError(f"{path}: missing columns {missing}")
+
+        text_columns = ["symbol", "side"]
+        while lines := list(islice(f, chunk_rows)):
+            rows = _fill_empty(lines)
+            if not rows:
+                continue
+            if text_columns == ["symbol", "side"]:
+                # ISO timestamps are parsed as text, epoch seconds as numbers
+                first = rows[0].split(",")
+                text_columns += [c for c in ("entry_time", "exit_time") if not _is_number(first[index[c]])]
+            numeric_columns = [c for c in index if c not in text_columns]
+            numbers = np.loadtxt(rows, delimiter=",", dtype=np.float64, ndmin=2,
+                                 usecols=[index[c] for c in numeric_columns])
+            strings = np.loadtxt(rows, delimiter=",", dtype=str, ndmin=2,
+                                 usecols=[index[c] for c in text_columns])
+            chunk = {c: numbers[:, i] for i, c in enumerate(numeric_columns)}
+            chunk.update({c: strings[:, i] for i, c in enumerate(text_columns)})
+            yield chunk
+
+
+def iter_npy_chunks(path: str, chunk_rows: int = 500_000):
+    # structured array saved with np.save; memory-mapped so only the current
+    # slice is paged in
+    data = np.load(path, mmap_mode="r")
+    names = set(data.dtype.names or ())
+    missing = [c for c in REQUIRED if c not in names]
+    if missing:
+        raise ValueError(f"{path}: missing fields {missing}")
+    for start in range(0, len(data), chunk_rows):
+        chunk = data[start:start + chunk_rows]
+        yield {name: np.asarray(chunk[name]) for name in COLUMNS if name in names}
+
+
+class TradeStats:
+    """Streaming accumulator over trade chunks. Everything is a running sum,
+    a per-symbol bincount or a fixed histogram, so memory does not grow with
+    the number of trades. Chunks are expected in exit-time order across the
+    file for the drawdown; each chunk is sorted internally."""
+
+    def __init__(self):
+        self.symbols = {}
+        self._per_symbol = np.zeros((0, 6))  # trades, wins, pnl, gross_win, gross_loss, slippage
+        self.trades = 0
+        self.pnl = 0.0
+        self.wins = 0
+        self.gross_win = 0.0
+        self.gross_loss = 0.0
+        self.slippage = 0.0
+        self.slippage_trades = 0
+        self.hold_sum = 0.0
+        self.hold_hist = np.zeros(len(HOLD_LABELS), dtype=np.int64)
+        self._peak = 0.0
+        self.max_drawdown = 0.0
+
+    def _codes(self, symbols: np.ndarray) -> np.ndarray:
+        unique, inverse = np.unique(symbols.astype(str), return_inverse=True)
+        mapping = np.empty(len(unique), dtype=np.int64)
+        for i, symbol in enumerate(unique):
+            mapping[i] = self.symbols.setdefault(symbol, len(self.symbols))
+        if len(self.symbols) > len(self._per_symbol):
+            grown = np.zeros((len(self.symbols), self._per_symbol.shape[1]))
+            grown[:len(self._per_symbol)] = self._per_symbol
+            self._per_symbol = grown
+        return mapping[inverse.ravel()]
+
+    def update(self, chunk: dict):
+        n = len(chunk["symbol"])
+        if n == 0:
+            return
+        qty = _floats(chunk["qty"])
+        entry = _floats(chunk["entry_price"])
+        exit_ = _floats(chunk["exit_price"])
+        sides, side_codes = np.unique(chunk["side"], return_inverse=True)
+        is_short = np.array([str(v).strip().lower() in SHORT_SIDES for v in sides])
+        direction = np.where(is_short[side_codes.ravel()], -1.0, 1.0)
+        fees = np.nan_to_num(_floats(chunk["fees"])) if "fees" in chunk else 0.0
+        pnl = direction * (exit_ - entry) * qty - fees
+
+        slip = np.zeros(n)
+        has_slip = np.zeros(n, dtype=bool)
+        # positive slippage is a cost: filled worse than the expected price
+        if "expected_entry_price" in chunk:
+            expected = _floats(chunk["expected_entry_price"])
+            ok = ~np.isnan(expected)
+            slip[ok] += (direction * (entry - expected) * qty)[ok]
+            has_slip |= ok
+        if "expected_exit_price" in chunk:
+            expected = _floats(chunk["expected_exit_price"])
+            ok = ~np.isnan(expected)
+            slip[ok] += (direction * (expected - exit_) * qty)[ok]
+            has_slip |= ok
+
+        entry_t = _to_seconds(chunk["entry_time"])
+        exit_t = _to_seconds(chunk["exit_time"])
+        hold = np.maximum(exit_t - entry_t, 0.0)
+
+        win = pnl > 0
+        codes = self._codes(chunk["symbol"])
+        size = len(self.symbols)
+        self._per_symbol += np.stack([
+            np.bincount(codes, minlength=size),
+            np.bincount(codes, weights=win, minlength=size),
+            np.bincount(codes, weights=pnl, minlength=size),
+            np.bincount(codes, weights=np.where(win, pnl, 0.0), minlength=size),
+            np.bincount(codes, weights=np.where(win, 0.0, -pnl), minlength=size),
+            np.bincount(codes, weights=slip, minlength=size),
+        ], axis=1)
+
+        self.trades += n
+        self.wins += int(win.sum())
+        self.gross_win += float(pnl[win].sum())
+        self.gross_loss += float(-pnl[~win].sum())
+        self.slippage += float(slip.sum())
+        self.slippage_trades += int(has_slip.sum())
+        self.hold_sum += float(hold.sum())
+        self.hold_hist += np.histogram(hold, bins=HOLD_EDGES)[0]
+
+        if not (exit_t[1:] >= exit_t[:-1]).all():
+            pnl = pnl[np.argsort(exit_t, kind="stable")]
+        equity = self.pnl + np.cumsum(pnl)
+        peak = np.maximum(np.maximum.accumulate(equity), self._peak)
+        self.max_drawdown = max(self.max_drawdown, float((peak - equity).max()))
+        self._peak = float(peak[-1])
+        self.pnl = float(equity[-1])
+
+    def hold_percentile(self, q: float) -> str:
+        if not self.trades:
+            return "n/a"
+        idx = int(np.searchsorted(np.cumsum(self.hold_hist), q * self.trades))
+        return HOLD_LABELS[min(idx, len(HOLD_LABELS) - 1)]
+
+    def summary(self, top: int = 5) -> dict:
+        losses = self.trades - self.wins
+        per = self._per_symbol
+        order = np.argsort(per[:, 2]) if len(per) else np.array([], dtype=np.int64)
+        names = np.array(list(self.symbols), dtype=object)
+
+        def rows(idx):
+            return [
+                {
+                    "symbol": names[i],
+                    "trades": int(per[i, 0]),
+                    "pnl": round(float(per[i, 2]), 2),
+                    "win_rate": round(float(per[i, 1] / per[i, 0]), 3),
+                }
+                for i in idx
+            ]
+
+        return {
+            "trades": self.trades,
+            "symbols": len(self.symbols),
+            "net_pnl": round(self.pnl, 2),
+            "win_rate": round(self.wins / self.trades, 3) if self.trades else 0.0,
+            "avg_win": round(self.gross_win / self.wins, 2) if self.wins else 0.0,
+            "avg_loss": round(self.gross_loss / losses, 2) if losses else 0.0,
+            "expectancy": round(self.pnl / self.trades, 2) if self.trades else 0.0,
+            "profit_factor": round(self.gross_win / self.gross_loss, 2) if self.gross_loss else None,
+            "max_drawdown": round(self.max_drawdown, 2),
+            "slippage_cost": round(self.slippage, 2),
+            "slippage_per_trade": round(self.slippage / self.slippage_trades, 4) if self.slippage_trades else None,
+            "avg_hold_minutes": round(self.hold_sum / self.trades / 60, 1) if self.trades else 0.0,
+            "median_hold": self.hold_percentile(0.5),
+            "p90_hold": self.hold_percentile(0.9),
+            "hold_distribution": dict(zip(HOLD_LABELS, self.hold_hist.tolist())),
+            "best_symbols": rows(order[::-1][:top]),
+            "worst_symbols": rows(order[:top]),
+        }
+
+
+def analyze_trades(path: str, chunk_rows: int = 500_000) -> TradeStats:
+    chunks = iter_npy_chunks if path.endswith(".npy") else iter_csv_chunks
+    stats = TradeStats()
+    for chunk in chunks(path, chunk_rows):
+        stats.update(chunk)
+    return stats
+
+
+def format_summary(summary: dict) -> str:
+    # Fixed-size text for the postmarket prompt, independent of trade count.
+    lines = [
+        f"Trades: {summary['trades']} across {summary['symbols']} symbols",
+        f"Net P&L: {summary['net_pnl']} | Win rate: {summary['win_rate']:.1%} | "
+        f"Expectancy per trade: {summary['expectancy']}",
+        f"Avg win: {summary['avg_win']} | Avg loss: {summary['avg_loss']} | "
+        f"Profit factor: {summary['profit_factor']}",
+        f"Max drawdown: {summary['max_drawdown']}",
+        f"Slippage cost: {summary['slippage_cost']} (per trade: {summary['slippage_per_trade']})",
+        f"Holding time: avg {summary['avg_hold_minutes']} min, median {summary['median_hold']}, "
+        f"p90 {summary['p90_hold']}",
+        "Holding distribution: " + ", ".join(f"{k} {v}" for k, v in summary["hold_distribution"].items()),
+        "Best symbols: " + "; ".join(
+            f"{r['symbol']} {r['pnl']} ({r['trades']} trades, {r['win_rate']:.0%} win)" for r in summary["best_symbols"]
+        ),
+        "Worst symbols: " + "; ".join(
+            f"{r['symbol']} {r['pnl']} ({r['trades']} trades, {r['win_rate']:.0%} win)" for r in summary["worst_symbols"]
+        ),
+    ]
+    return "\n".join(lines)
+
+
+_cached = {}
+
+
+def trade_summary(path: str = None) -> str:
+    """Summary text for the trade file at `path` (default TRADINGPAL_TRADES_PATH),
+    recomputed only when the file changes. Returns None if no file is set."""
+    path = path or os.environ.get("TRADINGPAL_TRADES_PATH")
+    if not path or not os.path.exists(path):
+        return None
+    stamp = (os.path.getmtime(path), os.path.getsize(path))
+    if _cached.get(path, (None,))[0] != stamp:
+        _cached[path] = (stamp, format_summary(analyze_trades(path).summary()))
+    return _cached[path][1]
@@ -0,0 +1,4 @@
+from src.backtest.conditions import ConditionError, evaluate, parse_condition, parse_percent, parse_strategy_text, parse_timeframe
+from src.backtest.data import get_bars, load_bars, resample
+from src.backtest.engine import Strategy, backtest, compile_strategy, format_metrics, sweep
+from src.backtest.pine import generate_pine, render_pine
@@ -0,0 +1,283 @@
+import re
+from typing import NamedTuple
+
+import numpy as np
+
+from src.backtest.indicators import crosses_above, crosses_below, ema, rsi, sma
+
+
+class ConditionError(ValueError):
+    pass
+
+
+class Series(NamedTuple):
+    name: str  # close, open, high, low, volume, rsi, ema, sma
+    period: int = 0
+
+
+class Value(NamedTuple):
+    value: float
+
+
+class Compare(NamedTuple):
+    left: object
+    op: str  # >, <, >=, <=, cross_above, cross_below
+    right: object
+
+
+class BoolOp(NamedTuple):
+    op: str  # and, or
+    items: tuple
+
+
+DEFAULT_PERIODS = {"rsi": 14, "ema": 20, "sma": 20}
+
+_RELATIONS = [
+    (("crosses above", "crosses over", "crosses up through", "crosses back above", "rises above",
+      "breaks above", "moves above", "closes above"), "cross_above"),
+    (("crosses below", "crosses under", "crosses down through", "crosses back below", "falls below",
+      "drops below", "breaks below", "moves below", "closes below"), "cross_below"),
+    (("is greater than or equal to", "greater than or equal to", "is at least", ">="), ">="),
+    (("is less than or equal to", "less than or equal to", "is at most", "<="), "<="),
+    (("is greater than", "greater than", "is higher than", "higher than", "is above", "stays above",
+      "above", ">"), ">"),
+    (("is less than", "less than", "is lower than", "lower than", "is below", "stays below",
+      "below", "<"), "<"),
+]
+_RELATION_LOOKUP = {phrase: op for phrases, op in _RELATIONS for phrase in phrases}
+_RELATION_RE = re.compile(
+    "|".join(
+        (r"(?<![\w])" + re.escape(p) + r"(?![\w])") if p[0].isalpha() else re.escape(p)
+        for p in sorted(_RELATION_LOOKUP, key=len, reverse=True)
+    )
+)
+
+_PRICE_NAMES = {
+    "price": "close", "the price": "close", "close": "close", "closing price": "close",
+    "the close": "close", "open": "open", "high": "high", "low": "low", "volume": "volume",
+}
+_INDICATOR_NAMES = {
+    "rsi": "rsi", "ema": "ema", "exponential moving average": "ema",
+    "sma": "sma", "ma": "sma", "moving average": "sma", "simple moving average": "sma",
+}
+_INDICATOR_RE = re.compile(
+    r"^(?:the\s+)?(?:(\d+)[\s-]*(?:day|period|bar|hour|minute)?[\s-]*)?"
+    r"(rsi|ema|sma|ma|exponential moving average|simple moving average|moving average)"
+    r"(?:\s*\(?\s*(\d+)\s*\)?)?(?:[\s-]*(?:day|period|bar|hour|minute)s?)?(?:\s+line)?$"
+)
+_NUMBER_RE = re.compile(r"^-?\d+(?:\.\d+)?$")
+
+
+def parse_operand(text: str):
+    text = text.strip().strip(".").strip()
+    if _NUMBER_RE.match(text):
+        return Value(float(text))
+    if text in _PRICE_NAMES:
+        return Series(_PRICE_NAMES[text])
+    match = _INDICATOR_RE.match(text)
+    if match:
+        name = _INDICATOR_NAMES[match.group(2)]
+        period = int(match.group(1) or match.group(3) or DEFAULT_PERIODS[name])
+        return Series(name, period)
+    raise ConditionError(f"Unrecognized operand: {text!r}")
+
+
+def parse_clause(text: str) -> Compare:
+    match = _RELATION_RE.search(text)
+    if not match:
+        raise ConditionError(f"No comparison found in: {text!r}")
+    left = text[:match.start()].strip()
+    right = text[match.end():].strip()
+    if not left or not right:
+        raise ConditionError(f"Incomplete comparison: {text!r}")
+    return Compare(parse_operand(left), _RELATION_LOOKUP[match.group(0)], parse_operand(right))
+
+
+def parse_condition(text: str):
+    """Parses conditions such as "RSI crosses below 30 and price is above
+    200 EMA" into an AST of Compare/BoolOp nodes. "and" binds tighter than
+    "or"; parentheses are not supported. Raises ConditionError for anything
+    outside the grammar."""
+    text = " ".join(text.lower().replace(",", " ").split()).strip(".")
+    if not text:
+        raise ConditionError("Empty condition")
+    alternatives = []
+    for part in re.split(r"\s+or\s+", text):
+        clauses = tuple(parse_clause(c) for c in re.split(r"\s+and\s+", part))
+        alternatives.append(clauses[0] if len(clauses) == 1 else BoolOp("and", clauses))
+    return alternatives[0] if len(alternatives) == 1 else BoolOp("or", tuple(alternatives))
+
+
+def series_values(series: Series, bars: dict, cache: dict) -> np.ndarray:
+    if series not in cache:
+        close = bars["close"]
+        if series.name == "rsi":
+            cache[series] = rsi(close, series.period)
+        elif series.name == "ema":
+            cache[series] = ema(close, series.period)
+        elif series.name == "sma":
+            cache[series] = sma(close, series.period)
+        else:
+            cache[series] = np.asarray(bars[series.name], dtype=np.float64)
+    return cache[series]
+
+
+def evaluate(node, bars: dict, cache: dict) -> np.ndarray:
+    """Boolean signal per bar. `cache` holds indicator arrays and can be
+    shared across many conditions over the same bars."""
+    if isinstance(node, BoolOp):
+        parts = [evaluate(item, bars, cache) for item in node.items]
+        return np.logical_and.reduce(parts) if node.op == "and" else np.logical_or.reduce(parts)
+    left = _operand_values(node.left, bars, cache)
+    right = _operand_values(node.right, bars, cache)
+    with np.errstate(invalid="ignore"):
+        if node.op == "cross_above":
+            return crosses_above(left, right)
+        if node.op == "cross_below":
+            return crosses_below(left, right)
+        if node.op == ">":
+            return np.broadcast_to(left > right, bars["close"].shape)
+        if node.op == "<":
+            return np.broadcast_to(left < right, bars["close"].shape)
+        if node.op == ">=":
+            return np.broadcast_to(left >= right, bars["close"].shape)
+        return np.broadcast_to(left <= right, bars["close"].shape)
+
+
+def _operand_values(operand, bars, cache):
+    if isinstance(operand, Value):
+        return np.float64(operand.value)
+    return series_values(operand, bars, cache)
+
+
+_PERCENT_RE = re.compile(r"(-?\d+(?:\.\d+)?)\s*%")
+_TIMEFRAME_RE = re.compile(r"(\d+)\s*(m|min|minute|h|hr|hour|d|day|w|week)s?\b")
+_TIMEFRAME_SECONDS = {"m": 60, "min": 60, "minute": 60, "h": 3600, "hr": 3600, "hour": 3600,
+                      "d": 86400, "day": 86400, "w": 604800, "week": 604800}
+
+
+def parse_percent(text) -> float:
+    """"5%" -> 0.05; None when there is no percentage in the text."""
+    match = _PERCENT_RE.search(str(text or ""))
+    return float(match.group(1)) / 100.0 if match else None
+
+
+def parse_timeframe(text) -> int:
+    """"1h" / "15 minute" / "daily" -> bar length in seconds; None if unknown."""
+    text = str(text or "").lower().strip()
+    if text in ("daily", "1d", "d", "day"):
+        return 86400
+    if text in ("hourly",):
+        return 3600
+    if text in ("weekly",):
+        return 604800
+    match = _TIMEFRAME_RE.search(text)
+    if not match:
+        return None
+    return int(match.group(1)) * _TIMEFRAME_SECONDS[match.group(2)]
+
+
+_SENTENCE_RE = re.compile(r"\.(?!\d)|;|\n")
+_NUM = r"(\d+(?:\.\d+)?)\s*%"
+_ENTRY_LEAD = r"(?:buy|go long|enter(?: a)?(?: long)?(?: position)?|long)\s+(?:when|if|once|whenever)\s+"
+_EXIT_LEAD = r"(?:sell|exit|close(?: the)?(?: position| trade)?)\s+(?:when|if|once|whenever)\s+"
+_ARTICLE = r"(?:(?:set|use|using|with|place|add|and)\s+)?(?:an?\s+|the\s+)?"
+# Everything a sentence may contain besides entry / exit rules. Each pattern
+# must match a whole phrase; anything else in the text (trailing stops, day
+# or session filters, risk-based sizing, ...) makes the parse fail.
+_SETTINGS = {
+    "position_size": re.compile(
+        r"(?:(?:use|using|allocate|allocating|invest|investing|put|putting|with|size each trade at)\s+)?"
+        + _NUM + r"\s+of\s+(?:the\s+|my\s+)?(?:account\s+|total\s+)?(?:equity|capital|account|portfolio)"
+        r"(?:\s+(?:per|on each|for each|each)\s+(?:trade|position|entry))?"
+    ),
+    "stop_loss": re.compile(
+        _ARTICLE + r"(?:stop[- ]?loss(?:\s+(?:at|of|to))?\s+" + _NUM + r"|" + _NUM + r"\s+stop(?:[- ]?loss)?)"
+        r"(?:\s+(?:below|under|from)\s+(?:the\s+|my\s+)?entry(?:\s+price)?)?"
+    ),
+    "take_profit": re.compile(
+        _ARTICLE + r"(?:(?:take[- ]?profit|profit target|target)(?:\s+(?:at|of|to))?\s+" + _NUM
+        + r"|" + _NUM + r"\s+(?:take[- ]?profit|profit target|target))"
+        r"(?:\s+(?:above|over|from)\s+(?:the\s+|my\s+)?entry(?:\s+price)?)?"
+    ),
+    "timeframe": re.compile(
+        r"(?:(?:on|use|using|trade|trading|with)\s+)?(?:(?:on|in)\s+)?(?:the\s+|a\s+)?"
+        r"(?:(\d+)\s*-?\s*(m|min|minute|h|hr|hour|d|day|w|week)s?|(daily|hourly|weekly))"
+        r"\s+(?:chart|timeframe|bars?|candles?)"
+    ),
+    # a request to backtest the rules carries no rule of its own
+    None: re.compile(
+        r"(?:(?:please|can you|could you|and|then)\s+)*(?:backtest|back-test|test)\s+"
+        r"(?:it|this|that|the strategy|this strategy|the idea|these rules)(?:\s+for me)?(?:\s+please)?\??"
+    ),
+}
+_LEADS = {"entry_condition": re.compile(_ENTRY_LEAD), "exit_condition": re.compile(_EXIT_LEAD)}
+_JOINER_RE = re.compile(r"[\s,]*(?:(?:and|then|also|with|using)\s+)?")
+# where a rule's condition ends: before another rule or setting, optionally
+# joined by a comma or a conjunction
+_BOUNDARY_RE = re.compile(
+    r"[\s,]+(?:(?:and|then|also|with|using)\s+)?(?=" + "|".join(
+        [_ENTRY_LEAD, _EXIT_LEAD] + [p.pattern for p in _SETTINGS.values()]) + r")"
+)
+
+
+def _setting_value(field: str, match) -> str:
+    groups = [g for g in match.groups() if g]
+    if field == "timeframe":
+        return match.group(3) or f"{match.group(1)}{match.group(2)[0]}"
+    if field == "position_size":
+        return f"{groups[0]}% of account equity"
+    return f"{groups[0]}%"
+
+
+def _parse_sentence(sentence: str, spec: dict) -> bool:
+    # Consumes the sentence rule by rule and setting by setting; False as
+    # soon as something is left that the grammar doesn't cover, or a field
+    # is given twice.
+    pos = 0
+    while True:
+        pos = _JOINER_RE.match(sentence, pos).end()
+        if pos >= len(sentence):
+            return True
+        for field, lead in _LEADS.items():
+            match = lead.match(sentence, pos)
+            if match:
+                end = _BOUNDARY_RE.search(sentence, match.end())
+                condition = sentence[match.end():end.start() if end else len(sentence)]
+                try:
+                    parse_condition(condition)
+                except ConditionError:
+                    return False
+                value, pos = condition, end.start() if end else len(sentence)
+                break
+        else:
+            for field, pattern in _SETTINGS.items():
+                match = pattern.match(sentence, pos)
+                if match and (match.end() == len(sentence) or not sentence[match.end()].isalnum()):
+                    value, pos = (_setting_value(field, match) if field else None), match.end()
+                    break
+            else:
+                return False
+        if field is not None:
+            if field in spec:
+                return False
+            spec[field] = value
+
+
+def parse_strategy_text(text: str) -> dict:
+    """Pulls extract_strategy's schema straight out of plainly worded
+    strategies ("Buy when ... Sell when ... stop loss at 5% ..."), without a
+    model call. Every sentence has to be made up entirely of entry / exit
+    rules whose conditions parse_condition accepts and the settings the
+    schema has fields for; anything else (a day filter, a trailing stop,
+    risk-based sizing) returns None, as does text without an entry rule, so
+    the request goes to the model instead of losing the rule."""
+    text = " ".join(text.lower().split())
+    spec = {}
+    for sentence in _SENTENCE_RE.split(text):
+        sentence = sentence.strip(" ,!?")
+        if sentence and not _parse_sentence(sentence, spec):
+            return None
+    if "entry_condition" not in spec:
+        return None
+    return spec
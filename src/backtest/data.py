@@ -0,0 +1,124 @@
+import os
+import threading
+
+import numpy as np
+
+FIELDS = ("timestamp", "open", "high", "low", "close", "volume")
+ALIASES = {
+    "timestamp": ("timestamp", "time", "date", "datetime", "ts"),
+    "open": ("open", "o"),
+    "high": ("high", "h"),
+    "low": ("low", "l"),
+    "close": ("close", "c", "adj_close"),
+    "volume": ("volume", "vol", "v"),
+}
+
+
+def _seconds(values: np.ndarray) -> np.ndarray:
+    try:
+        return values.astype(np.float64)
+    except ValueError:
+        return np.char.replace(values.astype(str), " ", "T").astype("datetime64[s]").astype(np.float64)
+
+
+def _is_number(text: str) -> bool:
+    try:
+        float(text)
+        return True
+    except ValueError:
+        return False
+
+
+def load_csv(path: str) -> dict:
+    with open(path) as f:
+        header = [h.strip().lower() for h in f.readline().split(",")]
+        first = f.readline().split(",")
+    index = {}
+    for name, aliases in ALIASES.items():
+        index[name] = next((header.index(a) for a in aliases if a in header), None)
+    if index["close"] is None or index["timestamp"] is None:
+        raise ValueError(f"{path}: needs at least timestamp and close columns")
+
+    # one pass over the file with a record dtype: prices as floats, the
+    # timestamp as a float (epoch seconds) or as text (ISO)
+    fields = ["timestamp"] + [f for f in FIELDS[1:] if index[f] is not None]
+    numeric = len(first) > index["timestamp"] and _is_number(first[index["timestamp"]])
+    dtype = [("timestamp", np.float64 if numeric else "U64")] + [(f, np.float64) for f in fields[1:]]
+    data = np.loadtxt(path, delimiter=",", skiprows=1, dtype=dtype, ndmin=1,
+                      usecols=[index[f] for f in fields])
+    bars = {"timestamp": _seconds(data["timestamp"])}
+    bars.update({f: data[f] for f in fields[1:]})
+    for f in ("open", "high", "low"):
+        bars.setdefault(f, bars["close"])
+    bars.setdefault("volume", np.zeros_like(bars["close"]))
+    return bars
+
+
+def load_npy(path: str) -> dict:
+    # (n, 6) float array in FIELDS order, memory-mapped so years of minute
+    # bars don't have to fit in memory twice
+    data = np.load(path, mmap_mode="r")
+    if data.ndim != 2 or data.shape[1] < 5:
+        raise ValueError(f"{path}: expected an (n, 6) array of {', '.join(FIELDS)}")
+    bars = {f: data[:, i] for i, f in enumerate(FIELDS[:data.shape[1]])}
+    bars.setdefault("volume", np.zeros(len(data)))
+    return bars
+
+
+def load_bars(path: str) -> dict:
+    """OHLCV bars as a dict of equal-length float arrays, sorted by time.
+    Timestamps are epoch seconds (ISO strings are converted)."""
+    bars = load_npy(path) if path.endswith(".npy") else load_csv(path)
+    order = np.argsort(bars["timestamp"], kind="stable")
+    if np.any(order != np.arange(len(order))):
+        bars = {k: np.asarray(v)[order] for k, v in bars.items()}
+    return bars
+
+
+def resample(bars: dict, seconds: int) -> dict:
+    """Aggregates bars into `seconds`-long buckets (open of the first bar,
+    max high, min low, last close, summed volume)."""
+    if not len(bars["close"]):
+        return bars
+    ts = np.asarray(bars["timestamp"])
+    bucket = np.floor_divide(ts, seconds)
+    starts = np.flatnonzero(np.diff(bucket, prepend=bucket[0] - 1))
+    ends = np.append(starts[1:], len(ts)) - 1
+    return {
+        "timestamp": bucket[starts] * seconds,
+        "open": np.asarray(bars["open"])[starts],
+        "high": np.maximum.reduceat(np.asarray(bars["high"]), starts),
+        "low": np.minimum.reduceat(np.asarray(bars["low"]), starts),
+        "close": np.asarray(bars["close"])[ends],
+        "volume": np.add.reduceat(np.asarray(bars["volume"]), starts),
+    }
+
+
+def bar_seconds(bars: dict) -> float:
+    ts = bars["timestamp"]
+    return float(np.median(np.diff(ts[:1000]))) if len(ts) > 1 else 60.0
+
+
+_loaded = {}
+_loaded_lock = threading.Lock()
+
+
+def get_bars(path: str = None, timeframe: int = None) -> dict:
+    """Bars from `path` (or TRADINGPAL_OHLCV_PATH), resampled to `timeframe`
+    seconds when that is coarser than the file. Cached per file version."""
+    path = path or os.environ.get("TRADINGPAL_OHLCV_PATH")
+    if not path or not os.path.exists(path):
+        return None
+    stat = os.stat(path)
+    key = (path, stat.st_mtime_ns, stat.st_size)
+    # strategy nodes call this from worker threads; one of them loads a new
+    # file version while the others wait for it instead of loading it again
+    with _loaded_lock:
+        if key not in _loaded:
+            _loaded.clear()
+            _loaded[key] = {None: load_bars(path)}
+        versions = _loaded[key]
+        if timeframe and timeframe not in versions:
+            raw = versions[None]
+            versions[timeframe] = resample(raw, timeframe) if timeframe > bar_seconds(raw) else raw
+        return versions[timeframe or None]
@@ -0,0 +1,188 @@
+import itertools
+from typing import NamedTuple
+
+import numpy as np
+
+from src.backtest.conditions import ConditionError, evaluate, parse_condition, parse_percent, parse_timeframe
+
+SECONDS_PER_YEAR = 365.25 * 86400
+_SCAN = 256  # first window when scanning for a stop / take-profit hit
+
+
+class Strategy(NamedTuple):
+    entry: object
+    exit: object = None
+    position_size: float = 1.0
+    stop_loss: float = None
+    take_profit: float = None
+    timeframe: int = None
+
+
+def compile_strategy(spec: dict) -> Strategy:
+    """Turns extract_strategy's JSON into a Strategy. Only the entry
+    condition is required; unparseable optional fields fall back to their
+    defaults. Raises ConditionError when a condition is outside the grammar."""
+    if not spec.get("entry_condition"):
+        raise ConditionError("Strategy has no entry condition")
+    exit_text = spec.get("exit_condition")
+    return Strategy(
+        entry=parse_condition(spec["entry_condition"]),
+        exit=parse_condition(exit_text) if exit_text else None,
+        position_size=min(parse_percent(spec.get("position_size")) or 1.0, 1.0),
+        stop_loss=parse_percent(spec.get("stop_loss")),
+        take_profit=parse_percent(spec.get("take_profit")),
+        timeframe=parse_timeframe(spec.get("timeframe")),
+    )
+
+
+def _first(mask_source: np.ndarray, start: int, stop: int, test) -> int:
+    # index of the first bar in [start, stop) where test(slice) is true, or
+    # `stop`; scans in growing windows so a nearby hit stays cheap
+    window = _SCAN
+    while start < stop:
+        end = min(stop, start + window)
+        hits = np.flatnonzero(test(mask_source[start:end]))
+        if len(hits):
+            return start + int(hits[0])
+        start = end
+        window *= 4
+    return stop
+
+
+def simulate(bars: dict, strategy: Strategy, entry_signal: np.ndarray, exit_signal: np.ndarray = None,
+             fee: float = 0.0):
+    """Long-only fills: enter at the next bar's open after an entry signal,
+    leave at the next open after an exit signal, or intrabar at the stop /
+    take-profit price (stop first when both are touched in one bar). Returns
+    the per-bar equity curve (starting at 1.0) and per-trade arrays."""
+    open_, high, low, close = (np.asarray(bars[k], dtype=np.float64) for k in ("open", "high", "low", "close"))
+    n = len(close)
+    entries = np.flatnonzero(entry_signal[:-1])
+    # bar at whose open a signal exit happens
+    exits = np.flatnonzero(exit_signal[:-1]) + 1 if exit_signal is not None else np.empty(0, dtype=np.int64)
+
+    equity = np.empty(n)
+    size = strategy.position_size
+    cash = 1.0
+    free = 0
+    trades = []
+    while True:
+        i = np.searchsorted(entries, free)
+        if i >= len(entries):
+            break
+        j = int(entries[i]) + 1
+        price = open_[j]
+        if not price > 0:
+            free = j
+            continue
+        e = np.searchsorted(exits, j + 1)
+        limit = int(exits[e]) if e < len(exits) else n
+        stop = price * (1 - strategy.stop_loss) if strategy.stop_loss else None
+        target = price * (1 + strategy.take_profit) if strategy.take_profit else None
+        k_stop = _first(low, j, limit, lambda s: s <= stop) if stop else limit
+        k_target = _first(high, j, min(limit, k_stop + 1), lambda s: s >= target) if target else limit
+        k = min(limit, k_stop, k_target)
+        if k >= n:
+            k, exit_price = n - 1, close[n - 1]
+        elif k == limit:
+            exit_price = open_[k]
+        elif k == k_stop:
+            exit_price = min(open_[k], stop) if k > j else stop
+        else:
+            exit_price = max(open_[k], target) if k > j else target
+
+        equity[free:j] = cash
+        units = cash * size / price
+        rest = cash - units * price
+        equity[j:k] = rest + units * close[j:k]
+        ret = exit_price / price - 1 - 2 * fee
+        cash = rest + units * price * (1 + ret)
+        equity[k] = cash
+        trades.append((j, k, price, exit_price, ret))
+        free = k + 1 if k == n - 1 else k
+        if k == n - 1:
+            break
+    equity[free:] = cash
+    trades = np.array(trades, dtype=np.float64).reshape(-1, 5)
+    return equity, trades
+
+
+def metrics(bars: dict, equity: np.ndarray, trades: np.ndarray, size: float = 1.0) -> dict:
+    ts = np.asarray(bars["timestamp"], dtype=np.float64)
+    close = np.asarray(bars["close"], dtype=np.float64)
+    n = len(equity)
+    years = (ts[-1] - ts[0]) / SECONDS_PER_YEAR if n > 1 else 0.0
+    returns = np.diff(equity) / equity[:-1] if n > 1 else np.zeros(1)
+    std = returns.std()
+    per_year = (n - 1) / years if years > 0 else 0.0
+    peak = np.maximum.accumulate(equity)
+    pnl = trades[:, 4]
+    gains = pnl[pnl > 0].sum()
+    losses = -pnl[pnl < 0].sum()
+    held = (trades[:, 1] - trades[:, 0]).sum() if len(trades) else 0.0
+    return {
+        "bars": n,
+        "years": round(float(years), 2),
+        "total_return": float(equity[-1] - 1.0),
+        "cagr": float(equity[-1] ** (1 / years) - 1) if years > 0 and equity[-1] > 0 else None,
+        "sharpe": float(returns.mean() / std * np.sqrt(per_year)) if std > 0 and per_year else 0.0,
+        "max_drawdown": float((1 - equity / peak).max()),
+        "trades": len(trades),
+        "win_rate": float((pnl > 0).mean()) if len(pnl) else None,
+        "avg_trade": float(pnl.mean() * size) if len(pnl) else None,
+        "profit_factor": float(gains / losses) if losses > 0 else None,
+        "exposure": float(held / n) if n else 0.0,
+        "buy_and_hold": float(close[-1] / close[0] - 1) if n and close[0] > 0 else None,
+    }
+
+
+def backtest(bars: dict, strategy, cache: dict = None, fee: float = 0.0) -> dict:
+    """Runs a strategy (a Strategy or extract_strategy's dict) over bars
+    already at the strategy's timeframe. `cache` holds indicator arrays and
+    may be shared between runs over the same bars."""
+    if isinstance(strategy, dict):
+        strategy = compile_strategy(strategy)
+    if len(bars["close"]) < 2:
+        raise ValueError("Need at least two bars to backtest")
+    cache = {} if cache is None else cache
+    entry = evaluate(strategy.entry, bars, cache)
+    exit_ = evaluate(strategy.exit, bars, cache) if strategy.exit is not None else None
+    equity, trades = simulate(bars, strategy, entry, exit_, fee)
+    return metrics(bars, equity, trades, strategy.position_size)
+
+
+def sweep(bars: dict, spec: dict, grid: dict, fee: float = 0.0, sort_by: str = "sharpe") -> list:
+    """Backtests every combination in `grid` against one set of bars.
+
+    Keys of `grid` that are strategy fields replace that field
+    ({"stop_loss": ["3%", "5%"]}); any other key fills a placeholder in the
+    spec's text ({"level": [25, 30]} with "RSI crosses below {level}").
+    Indicators are computed once per distinct period and shared across all
+    variants. Returns [(params, metrics)] best first."""
+    keys = list(grid)
+    cache = {}
+    results = []
+    for values in itertools.product(*(grid[k] for k in keys)):
+        params = dict(zip(keys, values))
+        variant = {}
+        for field, text in spec.items():
+            text = params.get(field, text)
+            variant[field] = text.format(**params) if isinstance(text, str) and "{" in text else text
+        results.append((params, backtest(bars, variant, cache, fee)))
+    results.sort(key=lambda r: r[1].get(sort_by) if r[1].get(sort_by) is not None else -np.inf, reverse=True)
+    return results
+
+
+def format_metrics(result: dict) -> str:
+    def pct(value, digits=1):
+        return "n/a" if value is None else f"{value * 100:.{digits}f}%"
+
+    pf = result["profit_factor"]
+    return "\n".join([
+        f"Backtest over {result['bars']:,} bars ({result['years']} years):",
+        f"- Total return: {pct(result['total_return'])} (buy and hold: {pct(result['buy_and_hold'])})",
+        f"- CAGR: {pct(result['cagr'])}, Sharpe: {result['sharpe']:.2f}, max drawdown: {pct(result['max_drawdown'])}",
+        f"- Trades: {result['trades']}, win rate: {pct(result['win_rate'])}, "
+        f"avg trade: {pct(result['avg_trade'], 2)}, profit factor: {'n/a' if pf is None else f'{pf:.2f}'}",
+        f"- Time in market: {pct(result['exposure'])}",
+    ])
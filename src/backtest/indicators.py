@@ -0,0 +1,65 @@
+import numpy as np
+
+
+def _ema_alpha(x: np.ndarray, alpha: float) -> np.ndarray:
+    """Exponential smoothing y[t] = alpha*x[t] + (1-alpha)*y[t-1], seeded with
+    x[0]. Evaluated block-wise with closed-form weights so there is no Python
+    loop per bar; the block length keeps (1-alpha)**-k finite."""
+    x = np.asarray(x, dtype=np.float64)
+    out = np.empty_like(x)
+    if not len(x):
+        return out
+    decay = 1.0 - alpha
+    block = len(x) if decay == 0 else max(1, min(len(x), int(200.0 / -np.log(decay))))
+    k = np.arange(block, dtype=np.float64)
+    powers = decay ** k
+    inverse = 1.0 / powers
+    prev = x[0]
+    for start in range(0, len(x), block):
+        seg = x[start:start + block]
+        n = len(seg)
+        acc = np.cumsum(alpha * seg * inverse[:n])
+        out[start:start + n] = powers[:n] * (acc + decay * prev)
+        prev = out[start + n - 1]
+    return out
+
+
+def sma(x: np.ndarray, period: int) -> np.ndarray:
+    x = np.asarray(x, dtype=np.float64)
+    out = np.full_like(x, np.nan)
+    if len(x) >= period:
+        c = np.cumsum(np.insert(x, 0, 0.0))
+        out[period - 1:] = (c[period:] - c[:-period]) / period
+    return out
+
+
+def ema(x: np.ndarray, period: int) -> np.ndarray:
+    out = _ema_alpha(x, 2.0 / (period + 1))
+    out[:period - 1] = np.nan
+    return out
+
+
+def rsi(close: np.ndarray, period: int = 14) -> np.ndarray:
+    # Wilder's smoothing of gains and losses
+    delta = np.diff(np.asarray(close, dtype=np.float64), prepend=close[0])
+    gain = _ema_alpha(np.clip(delta, 0, None), 1.0 / period)
+    loss = _ema_alpha(np.clip(-delta, 0, None), 1.0 / period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = 100.0 - 100.0 / (1.0 + gain / loss)
+    out[loss == 0] = 100.0
+    out[:period] = np.nan
+    return out
+
+
+def crosses_above(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    a, b = np.broadcast_arrays(a, b)
+    out = np.zeros(a.shape, dtype=bool)
+    out[1:] = (a[1:] > b[1:]) & (a[:-1] <= b[:-1])
+    return out
+
+
+def crosses_below(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    a, b = np.broadcast_arrays(a, b)
+    out = np.zeros(a.shape, dtype=bool)
+    out[1:] = (a[1:] < b[1:]) & (a[:-1] >= b[:-1])
+    return out
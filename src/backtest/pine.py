@@ -0,0 +1,107 @@
+from functools import lru_cache
+
+from src.backtest.conditions import BoolOp, Compare, ConditionError, Series, Value
+from src.backtest.engine import Strategy, compile_strategy
+
+SPEC_FIELDS = ("entry_condition", "exit_condition", "position_size", "timeframe", "stop_loss", "take_profit")
+_CALLS = {"rsi": "ta.rsi", "ema": "ta.ema", "sma": "ta.sma"}
+_OPERATORS = {">": ">", "<": "<", ">=": ">=", "<=": "<="}
+_CROSSES = {"cross_above": "ta.crossover", "cross_below": "ta.crossunder"}
+
+
+def _name(series: Series) -> str:
+    return f"{series.name}{series.period}" if series.name in _CALLS else series.name
+
+
+def _operand(operand) -> str:
+    return f"{operand.value:g}" if isinstance(operand, Value) else _name(operand)
+
+
+def _expression(node) -> str:
+    # parse_condition only nests "and" inside "or", which matches Pine's
+    # precedence, so no parentheses are needed
+    if isinstance(node, BoolOp):
+        return f" {node.op} ".join(_expression(item) for item in node.items)
+    if node.op in _CROSSES:
+        return f"{_CROSSES[node.op]}({_operand(node.left)}, {_operand(node.right)})"
+    return f"{_operand(node.left)} {_OPERATORS[node.op]} {_operand(node.right)}"
+
+
+def _series(node, found: dict):
+    # indicator series used by a condition, in first-use order
+    if isinstance(node, BoolOp):
+        for item in node.items:
+            _series(item, found)
+    elif isinstance(node, Compare):
+        for operand in (node.left, node.right):
+            if isinstance(operand, Series) and operand.name in _CALLS:
+                found.setdefault(operand, None)
+
+
+def _pine_timeframe(seconds: int) -> str:
+    for unit, size in (("W", 604800), ("D", 86400)):
+        if seconds % size == 0:
+            return unit if seconds == size else f"{seconds // size}{unit}"
+    return str(seconds // 60)
+
+
+@lru_cache(maxsize=1024)
+def render_pine(strategy: Strategy) -> str:
+    """Pine Script v5 for a compiled strategy: long-only, entries and
+    exits filled on the next bar as in the backtest engine, with percent
+    stop / take-profit orders off the average entry price."""
+    found = {}
+    _series(strategy.entry, found)
+    if strategy.exit is not None:
+        _series(strategy.exit, found)
+
+    lines = ["//@version=5"]
+    if strategy.timeframe:
+        lines.append(f"// Intended chart timeframe: {_pine_timeframe(strategy.timeframe)}")
+    lines += [
+        'strategy("TradingPal Strategy", overlay=true, default_qty_type=strategy.percent_of_equity, '
+        f"default_qty_value={strategy.position_size * 100:g})",
+        "",
+    ]
+    lines += [f"{_name(s)} = {_CALLS[s.name]}(close, {s.period})" for s in found]
+    lines += [
+        "",
+        f"entryCondition = {_expression(strategy.entry)}",
+        f"exitCondition = {_expression(strategy.exit) if strategy.exit is not None else 'false'}",
+        "",
+        "if entryCondition and strategy.position_size == 0",
+        '    strategy.entry("Long", strategy.long)',
+        "if exitCondition",
+        '    strategy.close("Long")',
+    ]
+    if strategy.stop_loss or strategy.take_profit:
+        stop = f"strategy.position_avg_price * (1 - {strategy.stop_loss:g})" if strategy.stop_loss else "na"
+        limit = f"strategy.position_avg_price * (1 + {strategy.take_profit:g})" if strategy.take_profit else "na"
+        lines += [
+            "if strategy.position_size > 0",
+            f'    strategy.exit("Stop/Target", "Long", stop={stop}, limit={limit})',
+        ]
+    overlays = [s for s in found if s.name != "rsi"]
+    if overlays:
+        lines.append("")
+        lines += [f'plot({_name(s)}, title="{s.name.upper()} {s.period}")' for s in overlays]
+    return "\n".join(lines)
+
+
+def _normalize(spec: dict) -> tuple:
+    return tuple(" ".join(str(spec.get(field) or "").lower().split()) for field in SPEC_FIELDS)
+
+
+@lru_cache(maxsize=4096)
+def _pine_for(key: tuple) -> str:
+    return render_pine(compile_strategy(dict(zip(SPEC_FIELDS, key))))
+
+
+def generate_pine(spec: dict) -> str:
+    """Deterministic Pine Script for extract_strategy's schema, memoized by
+    the normalized spec (and by the compiled strategy, so differently worded
+    but identical rules share one script). Raises ConditionError when a
+    condition is outside the grammar."""
+    if not spec or "error" in spec:
+        raise ConditionError("No structured strategy")
+    return _pine_for(_normalize(spec))
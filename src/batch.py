@@ -0,0 +1,166 @@
+# Batch mode: run every query in a JSONL file through the graph.
+#   python -m src.batch queries.jsonl results.jsonl --workers 16 --rpm 500 --tpm 200000
+# Input lines look like {"id": "q1", "query": "..."} ("prompt" is accepted
+# too; a missing id falls back to the line number). Results are appended to
+# the output file as they finish. Re-running with the same output file skips
+# ids that already have a non-error result, so an interrupted run resumes
+# where it stopped and failed queries are tried again.
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+import uuid
+
+from langchain_core.messages import HumanMessage
+
+from src.experts import EXPERT_NAMES as EXPERTS
+from src.utils import load_env
+from src.utils.ratelimit import set_rate_limits
+
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+
+def is_retryable(error: Exception) -> bool:
+    if isinstance(error, (TimeoutError, ConnectionError, asyncio.TimeoutError)):
+        return True
+    if getattr(error, "status_code", None) in RETRYABLE_STATUS:
+        return True
+    return type(error).__name__ in {"APIConnectionError", "APITimeoutError", "RateLimitError"}
+
+
+def read_queries(path: str):
+    with open(path) as f:
+        for lineno, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            # one bad line is skipped rather than ending the whole run
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as e:
+                print(f"Skipping line {lineno}: invalid JSON ({e})")
+                continue
+            if not isinstance(row, dict):
+                print(f"Skipping line {lineno}: expected an object, got {type(row).__name__}")
+                continue
+            query = row.get("query") or row.get("prompt")
+            if not query:
+                print(f"Skipping line {lineno}: no query")
+                continue
+            yield str(row.get("id", lineno)), query
+
+
+def completed_ids(path: str) -> set:
+    # A crash can leave a half-written last line; cut it off so new results
+    # start on a fresh line, and treat everything before it as done.
+    if not os.path.exists(path):
+        return set()
+    with open(path, "rb+") as f:
+        data = f.read()
+        end = data.rfind(b"\n") + 1
+        if end < len(data):
+            f.truncate(end)
+    done = set()
+    for line in data[:end].splitlines():
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if row.get("status") != "error":
+            done.add(row["id"])
+    return done
+
+
+async def run_query(graph, run_id: str, query_id: str, query: str, retries: int, backoff: float) -> dict:
+    started = time.perf_counter()
+    for attempt in range(1, retries + 2):
+        # a fresh thread per attempt, so a half-finished attempt can't leak
+        # messages into the retry
+        thread_id = f"{run_id}-{query_id}-{attempt}"
+        config = {"configurable": {"thread_id": thread_id}}
+        try:
+            values = await graph.ainvoke({"messages": [HumanMessage(query)]}, config=config)
+            snapshot = await graph.aget_state(config)
+            interrupts = [i.value for task in snapshot.tasks for i in task.interrupts]
+            answers = {
+                m.name: m.content for m in values.get("messages", [])
+                if m.type == "ai" and m.name in EXPERTS
+            }
+            return {
+                "id": query_id,
+                "query": query,
+                "status": "clarification" if interrupts else "ok",
+                "answers": answers,
+                "clarification": interrupts[0] if interrupts else None,
+                "attempts": attempt,
+                "latency_s": round(time.perf_counter() - started, 3),
+            }
+        except Exception as e:
+            if attempt > retries or not is_retryable(e):
+                return {
+                    "id": query_id,
+                    "query": query,
+                    "status": "error",
+                    "error": f"{type(e).__name__}: {e}",
+                    "attempts": attempt,
+                    "latency_s": round(time.perf_counter() - started, 3),
+                }
+            # exponential backoff with full jitter
+            await asyncio.sleep(random.uniform(0, backoff * 2 ** (attempt - 1)))
+        finally:
+            await graph.checkpointer.adelete_thread(thread_id)
+
+
+async def run_batch(input_path: str, output_path: str, workers: int = 8, retries: int = 4,
+                    backoff: float = 1.0) -> dict:
+    from src.graph import atrading_pal  # after load_env(), see main()
+    from src.news import get_news_store
+
+    graph = atrading_pal()
+    get_news_store()  # background news ingest overlaps with queueing
+    done = completed_ids(output_path)
+    run_id = uuid.uuid4().hex[:8]
+    queue = asyncio.Queue(maxsize=workers * 2)
+    counts = {"skipped": len(done), "ok": 0, "clarification": 0, "error": 0}
+
+    with open(output_path, "a") as out:
+        async def worker():
+            while (item := await queue.get()) is not None:
+                result = await run_query(graph, run_id, *item, retries, backoff)
+                out.write(json.dumps(result) + "\n")
+                out.flush()
+                counts[result["status"]] += 1
+
+        tasks = [asyncio.create_task(worker()) for _ in range(workers)]
+        for query_id, query in read_queries(input_path):
+            if query_id not in done:
+                await queue.put((query_id, query))
+        for _ in tasks:
+            await queue.put(None)
+        await asyncio.gather(*tasks)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m src.batch")
+    parser.add_argument("input")
+    parser.add_argument("output")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--rpm", type=float, help="provider requests per minute")
+    parser.add_argument("--tpm", type=float, help="provider tokens per minute")
+    parser.add_argument("--retries", type=int, default=4)
+    parser.add_argument("--backoff", type=float, default=1.0, help="base backoff in seconds")
+    args = parser.parse_args()
+
+    load_env(prompt=False)
+    if args.rpm or args.tpm:
+        set_rate_limits(args.rpm, args.tpm)
+    started = time.perf_counter()
+    counts = asyncio.run(run_batch(args.input, args.output, args.workers, args.retries, args.backoff))
+    print(f"Finished in {time.perf_counter() - started:.1f}s: {counts}")
+
+
+if __name__ == "__main__":
+    main()
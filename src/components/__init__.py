@@ -1,3 +1,3 @@
-from src.components.chatbot import chatbot
+from src.components.chatbot import chatbot, achatbot
 from src.components.human_clarification import human_clarification
-from src.components.summary import summary
\ No newline at end of file
+from src.components.summary import summary, asummary
\ No newline at end of file
@@ -2,15 +2,19 @@ from langchain_core.messages import SystemMessage
 from langgraph.types import Command
 from src.structures.state import State
 from src.utils.helpers import get_llm
+from src.routing import get_router
+from src.telemetry import annotate
+from src.utils.context import build_context, current_question
+from src.experts.registry import EXPERT_AREAS, EXPERT_NAMES, routing_descriptions
 from langchain_core.messages import HumanMessage, AIMessage
 
-chatbot_instructions = """
-You are a routing assistant for a stock market chatbot. Your job is to analyze the user’s message and route it to one or more appropriate expert agents. Choose from the following five options:
+# The expert list comes from src/experts/registry.py, so adding an expert
+# there is enough for the router to offer it.
 
-- premarket: for questions about recent news or market trends.
-- intraday: for questions about active or ongoing trades.
-- postmarket: for reviewing trades or performance after the trading day.
-- strategy: for proposed or hypothetical trading strategies.
+chatbot_instructions = f"""
+You are a routing assistant for a stock market chatbot. Your job is to analyze the user’s message and route it to one or more appropriate expert agents. Choose from the following options:
+
+{routing_descriptions()}
 - human_clarification: for questions that are not finance-related or require additional clarification
 
 Instructions:
@@ -18,16 +22,12 @@ Instructions:
 - Respond with one or more space-separated agent names in a format like this: "premarket strategy".
 - Do not have duplicate names.
 - If you include human_clarification, it must be the only agent selected. 
-- If human_clarification is selected, include a follow-up question on the second line. If necessary, acknowledge what the user has said and gently remind the user that you're specifically designed as a trading assistant that can assist with premarket, intraday, postmarket, and strategy inquiries.
+- If human_clarification is selected, include a follow-up question on the second line. If necessary, acknowledge what the user has said and gently remind the user that you're specifically designed as a trading assistant that can assist with {EXPERT_AREAS} inquiries.
 """.strip()
 
-valid_experts = {"premarket", "intraday", "postmarket", "strategy"}
+valid_experts = set(EXPERT_NAMES)
 
-def chatbot(state: State):
-    print("---------Chatbot---------")
-    prompt = [SystemMessage(chatbot_instructions)] + state["messages"]
-    ans = get_llm().invoke(prompt).content
-    print(ans)
+def _route(ans: str) -> Command:
     if "human_clarification" in ans:
         return Command(
             update={"messages": [ans.splitlines()[1]]},
@@ -43,17 +43,43 @@ def chatbot(state: State):
                 valid_experts_selected.append(expert)
 
         if not valid_experts_selected:
-            print("No valid experts found, routing to human clarification.")
-            clarification_message = "Could you please clarify your request? I can assist with premarket, intraday, postmarket, and strategy inquiries."
+            annotate(invalid_route=ans.strip())
+            clarification_message = f"Could you please clarify your request? I can assist with {EXPERT_AREAS} inquiries."
             return Command(
                 update={"messages": [clarification_message]},
                 goto="human_clarification"  # Route to human clarification
             )
 
-        print(f"Routing to experts: {valid_experts_selected}")
-
         return Command(
             goto=valid_experts_selected
         )
 
+def _fast_route(state: State):
+    # Obvious routing questions are answered by the local classifier; only
+    # ambiguous or off-topic input pays for the LLM round-trip.
+    question = current_question(state)
+    if not question:
+        return None
+    selected = get_router().route(question)
+    if selected:
+        annotate(router="fast")
+        return Command(goto=selected)
+    return None
+
+def chatbot(state: State):
+    fast = _fast_route(state)
+    if fast is not None:
+        return fast
+    prompt = build_context(state, chatbot_instructions)
+    ans = get_llm("chatbot").invoke(prompt).content
+    annotate(router="llm")
+    return _route(ans)
 
+async def achatbot(state: State):
+    fast = _fast_route(state)
+    if fast is not None:
+        return fast
+    prompt = build_context(state, chatbot_instructions)
+    ans = (await get_llm("chatbot").ainvoke(prompt)).content
+    annotate(router="llm")
+    return _route(ans)
@@ -1,14 +1,13 @@
 from langgraph.types import Command, interrupt
 from src.structures.state import State
-from src.utils.helpers import get_llm
+from src.experts.registry import EXPERT_AREAS
+from src.telemetry import annotate
 from langchain_core.messages import HumanMessage, AIMessage
 
 
 def human_clarification(state: State, config):
-    print("---------Human Clarification---------")
-
     # default
-    clarification_message = "Could you please clarify your request? I can assist with premarket, intraday, postmarket, and strategy inquiries."
+    clarification_message = f"Could you please clarify your request? I can assist with {EXPERT_AREAS} inquiries."
 
     # add custom configs somehow later
 
@@ -17,14 +16,13 @@ def human_clarification(state: State, config):
     user_input = user_input.strip()
 
     # If user provides clarification, add it to the messages
+    annotate(clarified=bool(user_input))
     if user_input:
-        print(f"User provided clarification: {user_input}")
         return Command(
             update={"messages": state["messages"] + [HumanMessage(content=user_input)]},
             goto="chatbot"  # Route back to the chatbot to process gating logic
         )
     else:
-        print("No clarification input received. Reusing existing messages.")
         return Command(
             update={"messages": state["messages"]},
             goto="chatbot"  # Route back to the chatbot even if no input is provided
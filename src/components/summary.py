@@ -1,4 +1,46 @@
+from langchain_core.messages import RemoveMessage, SystemMessage, HumanMessage
 from src.structures.state import State
+from src.utils.helpers import get_llm
+from src.utils.context import window_start
+
+summary_instructions = """
+You maintain a running summary of a conversation between a trader and a trading assistant.
+Update the existing summary with the new lines of conversation. Keep tickers, numbers, positions,
+strategies and open questions; drop pleasantries. Reply with the updated summary only, in at most 200 words.
+""".strip()
+
+
+def _fold(state: State):
+    # Only the turns that fell out of build_context's window (by turn count or
+    # token budget) are summarized, and they are removed from state
+    # afterwards, so each message is folded once and none is dropped unseen.
+    old = state["messages"][:window_start(state)]
+    if not old:
+        return None, []
+    transcript = "\n".join(f"{m.type}: {m.content}" for m in old)
+    prompt = [
+        SystemMessage(summary_instructions),
+        HumanMessage(f"Existing summary:\n{state.get('summary') or '(none)'}\n\nNew lines:\n{transcript}"),
+    ]
+    return prompt, old
+
+
+def _update(content: str, old: list):
+    return {
+        "summary": content.strip(),
+        "messages": [RemoveMessage(id=m.id) for m in old],
+    }
+
+
 def summary(state: State):
-    print("---------Summary---------")
-    return
\ No newline at end of file
+    prompt, old = _fold(state)
+    if prompt is None:
+        return
+    return _update(get_llm("summary").invoke(prompt).content, old)
+
+
+async def asummary(state: State):
+    prompt, old = _fold(state)
+    if prompt is None:
+        return
+    return _update((await get_llm("summary").ainvoke(prompt)).content, old)
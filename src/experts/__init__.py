@@ -1,4 +1,10 @@
-from src.experts.premarket import premarket
-from src.experts.intraday import intraday
-from src.experts.postmarket import postmarket
-from src.experts.strategy import strategy
+from src.experts.registry import EXPERTS, EXPERT_NAMES, async_expert_node, expert_node, load_entry
+
+
+def __getattr__(name):
+    # `from src.experts import premarket` still works; the expert's module is
+    # loaded on first access rather than when the package is imported
+    for expert in EXPERTS:
+        if name in (expert.entry, expert.async_entry):
+            return load_entry(expert.name, name == expert.async_entry)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,5 +1,35 @@
+import re
 from src.utils.helpers import get_llm
 from src.structures.state import State
+from src.utils.context import build_context, current_question
+from src.market import format_snapshots, get_market_engine
+
+SNAPSHOT_SYMBOLS = 10
+
+
+def _market_context(state: State) -> str:
+    # Live indicator snapshot for the tickers named in the question, or the
+    # most active symbols; None when no tick source is configured.
+    engine = get_market_engine()
+    if engine is None or not engine.symbols:
+        return None
+    mentioned = re.findall(r"\$?\b([A-Z][A-Z0-9.]{0,9})\b", current_question(state))
+    symbols = [s for s in dict.fromkeys(mentioned) if s in engine.slots][:SNAPSHOT_SYMBOLS]
+    snapshots = [engine.snapshot(s) for s in symbols or engine.most_active(SNAPSHOT_SYMBOLS)]
+    return (
+        "Live market snapshot from the tick stream (ema_fast/ema_slow are 12/26-tick EMAs, rsi is 14-tick, "
+        "volatility is the stdev of the last 100 tick returns, imbalance is (bid size - ask size) / total "
+        "at the top of book):\n" + format_snapshots(snapshots)
+    )
+
+
 def intraday(state: State):
-    print("---------Intraday---------")
-    return {"messages": [get_llm().invoke(state["messages"])]}
\ No newline at end of file
+    response = get_llm("intraday").invoke(build_context(state, _market_context(state)))
+    response.name = "intraday"
+    return {"messages": [response]}
+
+
+async def aintraday(state: State):
+    response = await get_llm("intraday").ainvoke(build_context(state, _market_context(state)))
+    response.name = "intraday"
+    return {"messages": [response]}
@@ -1,11 +1,32 @@
-from langchain_core.prompts import ChatPromptTemplate
+import asyncio
+
+from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from src.structures.state import State
 from src.utils.helpers import get_llm
+from src.utils.context import build_context
+from src.analytics import trade_summary
+
 
-print("Reached postmarket")
+SAMPLE_TRADES = '''
+    User's Trade History:
+    - Buy: 100 shares of AAPL at $150, sell at $160
+    - Buy: 50 shares of MSFT at $200, sell at $190
+    - ...
+    '''
 
 
-def postmarket(state: State):
+def _performance_data() -> str:
+    # fixed-size stats computed from TRADINGPAL_TRADES_PATH when it is set; a
+    # file that can't be read or parsed falls back to the sample rather than
+    # failing the whole turn
+    try:
+        return trade_summary() or SAMPLE_TRADES
+    except (ValueError, OSError) as e:
+        print(f"Trade file unusable, using sample trades: {e}")
+        return SAMPLE_TRADES
+
+
+def _prompt(state: State, performance_data: str):
     system_template = '''Instruction: You are an expert in analyzing post-market trading data. Your job is to review the performance of individual trades, 
     identify patterns in the execution, and suggest potential refinements.
     Format your response as follows:
@@ -18,17 +39,22 @@ def postmarket(state: State):
     Question: Based on the user's trade data, what are your suggestions for improving their trading strategy?'''
 
     prompt_template = ChatPromptTemplate.from_messages(
-        [("system", system_template), ("user", user_template)]
+        [("system", system_template), MessagesPlaceholder("history"), ("user", user_template)]
     )
 
-    performance_data = '''
-    User's Trade History:
-    - Buy: 100 shares of AAPL at $150, sell at $160
-    - Buy: 50 shares of MSFT at $200, sell at $190
-    - ...
-    '''
+    return prompt_template.invoke({"history": build_context(state), "performance_data": performance_data})
 
-    prompt = prompt_template.invoke({"performance_data": performance_data})
 
-    response = get_llm().invoke(prompt)
-    print(response.content)
\ No newline at end of file
+def postmarket(state: State):
+    response = get_llm("postmarket").invoke(_prompt(state, _performance_data()))
+    response.name = "postmarket"
+    return {"messages": [response]}
+
+
+async def apostmarket(state: State):
+    # the first scan of a large trade file takes seconds; keep it off the
+    # event loop so concurrent experts and batch workers keep running
+    performance_data = await asyncio.to_thread(_performance_data)
+    response = await get_llm("postmarket").ainvoke(_prompt(state, performance_data))
+    response.name = "postmarket"
+    return {"messages": [response]}
\ No newline at end of file
@@ -0,0 +1,60 @@
+import sys
+from functools import lru_cache
+from importlib import import_module
+from typing import NamedTuple
+
+
+class Expert(NamedTuple):
+    name: str
+    description: str  # shown to the routing model
+    module: str
+    entry: str  # sync node function in `module`
+    async_entry: str  # coroutine twin
+
+
+# Each expert module is imported the first time the expert is routed to, so
+# importing the graph doesn't pull in numpy, the news index, tick feeds, etc.
+EXPERTS = (
+    Expert("premarket", "for questions about recent news or market trends.",
+           "src.experts.premarket", "premarket", "apremarket"),
+    Expert("intraday", "for questions about active or ongoing trades.",
+           "src.experts.intraday", "intraday", "aintraday"),
+    Expert("postmarket", "for reviewing trades or performance after the trading day.",
+           "src.experts.postmarket", "postmarket", "apostmarket"),
+    Expert("strategy", "for proposed or hypothetical trading strategies.",
+           "src.experts.strategy", "strategy", "astrategy"),
+)
+EXPERT_NAMES = tuple(expert.name for expert in EXPERTS)
+# "premarket, intraday, postmarket, and strategy", for user-facing text
+EXPERT_AREAS = ", ".join(EXPERT_NAMES[:-1]) + f", and {EXPERT_NAMES[-1]}"
+_BY_NAME = {expert.name: expert for expert in EXPERTS}
+
+
+@lru_cache(maxsize=None)
+def load_entry(name: str, use_async: bool = False):
+    expert = _BY_NAME[name]
+    module = import_module(expert.module)
+    # importing src.experts.premarket binds the package attribute
+    # `premarket` to the module; point it back at the node functions
+    package = sys.modules["src.experts"]
+    for attr in (expert.entry, expert.async_entry):
+        setattr(package, attr, getattr(module, attr))
+    return getattr(module, expert.async_entry if use_async else expert.entry)
+
+
+def expert_node(name: str):
+    def node(state):
+        return load_entry(name)(state)
+    node.__name__ = name
+    return node
+
+
+def async_expert_node(name: str):
+    async def node(state):
+        return await load_entry(name, True)(state)
+    node.__name__ = name
+    return node
+
+
+def routing_descriptions() -> str:
+    return "\n".join(f"- {expert.name}: {expert.description}" for expert in EXPERTS)
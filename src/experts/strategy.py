@@ -1,7 +1,15 @@
 from src.utils.helpers import get_llm
 from src.structures.state import State
+from src.utils.context import current_question
+from src.telemetry import annotate
+from src.backtest import (
+    ConditionError, backtest, format_metrics, generate_pine, get_bars, parse_strategy_text, parse_timeframe,
+)
+import asyncio
 import json
+import re
 from langchain_core.messages import AIMessage
+from langgraph.constants import TAG_NOSTREAM
 
 system_prompt = """
 You are StrategyExpert, an AI trained to extract structured trading plans from natural language inputs.
@@ -16,6 +24,10 @@ Output only a JSON object in the following format:
   "stop_loss": "...",
   "take_profit": "..."
 }
+
+If the strategy has rules these fields can't express (for example day or time filters, trailing stops,
+risk-based position sizing or scaling in and out), don't drop them: list them in an additional
+"unsupported" field.
 """
 
 few_shot_examples = [
@@ -36,39 +48,143 @@ few_shot_examples = [
     }
 ]
 
-def extract_strategy(nl_input: str) -> dict:
-    llm = get_llm()
-
-    response = llm.invoke([
+def _extract_prompt(nl_input: str) -> list:
+    return [
         {"role": "system", "content": system_prompt},
         *few_shot_examples,
         {"role": "user", "content": nl_input}
-    ])
-
-    message = response.content
-    print("Raw structured output:\n", message)
+    ]
 
+def _parse_strategy(message: str) -> dict:
     try:
-        return json.loads(message)
+        # tolerate a ```json fence or a sentence around the object
+        return json.loads(message[message.find("{"):message.rfind("}") + 1])
     except json.JSONDecodeError:
-        print("Structured parsing failed.")
+        annotate(strategy_parse_failed=True)
         return {"error": "Failed to parse strategy into structured format."}
 
-def generate_pine_direct(nl_input: str) -> str:
-    prompt = [
+def _nostream(quiet: bool = True) -> dict:
+    # Model calls whose output isn't the node's answer as-is (the JSON spec,
+    # or a script that gets a backtest report appended) are kept out of the
+    # "messages" stream; the node's returned message reaches the CLI through
+    # "updates" instead.
+    return {"tags": [TAG_NOSTREAM]} if quiet else None
+
+def extract_strategy(nl_input: str) -> dict:
+    llm = get_llm("strategy")
+    response = llm.invoke(_extract_prompt(nl_input), _nostream())
+    return _parse_strategy(response.content)
+
+_BACKTEST_QUESTION = re.compile(
+    r"backtest|back-test|have (done|performed|worked)|perform(ed)? (historically|in the past)|historical performance",
+    re.IGNORECASE,
+)
+
+def _wants_backtest(question: str) -> bool:
+    return bool(_BACKTEST_QUESTION.search(question))
+
+# The strategy schema, render_pine and the backtester are long-only, so a
+# short-side strategy is written by the model directly rather than silently
+# rendered as a long one. "short EMA" / "short-term" don't count.
+_SHORT_SIDE = re.compile(
+    r"\b(?:go(?:ing)?|went|be|get) short\b|\bsell(?:ing)? short\b|\bshort(?:ing|ed)\b|\bshorts?\b(?= (?:when|if|once|on|at|after|the|it|a|an|position|positions|entry|side)\b)|\bcover(?:s|ing)?\b",
+    re.IGNORECASE,
+)
+
+_LONG_ONLY_NOTE = "(Backtest not run: the local backtester only simulates long positions.)"
+
+def _is_short(question: str) -> bool:
+    return bool(_SHORT_SIDE.search(question))
+
+def _backtest_report(spec: dict) -> str:
+    # Runs the structured strategy over TRADINGPAL_OHLCV_PATH; None when
+    # there is no data or the conditions are outside the backtest grammar,
+    # a short note when the strategy has rules the backtester can't model.
+    if "error" in spec:
+        return None
+    unsupported = spec.get("unsupported")
+    if unsupported:
+        # a backtest without those rules would be of a different strategy
+        if not isinstance(unsupported, str):
+            unsupported = "; ".join(map(str, unsupported))
+        annotate(backtest_skipped=f"unsupported rules: {unsupported}")
+        return f"(Backtest not run: the local backtester can't simulate {unsupported}.)"
+    try:
+        bars = get_bars(timeframe=parse_timeframe(spec.get("timeframe")))
+        if bars is None:
+            return None
+        return format_metrics(backtest(bars, spec))
+    except (ConditionError, ValueError) as e:
+        annotate(backtest_skipped=str(e))
+        return None
+
+def _pine_prompt(nl_input: str) -> list:
+    return [
         {"role": "system", "content": "Convert the following trading strategy into Pine Script. Output only the Pine Script code."},
         {"role": "user", "content": nl_input}
     ]
-    llm = get_llm()
-    response = llm.invoke(prompt)
+
+def generate_pine_direct(nl_input: str, stream: bool = True) -> str:
+    llm = get_llm("strategy")
+    response = llm.invoke(_pine_prompt(nl_input), _nostream(not stream))
     return response.content.strip()
 
+def _local_pine(spec: dict) -> str:
+    # rules the schema can't hold would be silently dropped by the renderer
+    if spec and spec.get("unsupported"):
+        return None
+    try:
+        return generate_pine(spec)
+    except ConditionError:
+        return None
+
+def _answer(question: str):
+    # The node's logic, shared by strategy and astrategy: yields
+    # (prompt, stream) for each model call, is sent back the reply text, and
+    # returns the answer.
+    wants_backtest = _wants_backtest(question)
+    if _is_short(question):
+        annotate(strategy_side="short")
+        pine_script = (yield _pine_prompt(question), not wants_backtest).strip()
+        if wants_backtest:
+            pine_script = f"{pine_script}\n\n{_LONG_ONLY_NOTE}"
+        return pine_script
+    # Plainly worded strategies compile locally; the model is used to
+    # structure the rest, and writes the script itself only as a last resort.
+    spec = parse_strategy_text(question)
+    pine_script = _local_pine(spec)
+    if pine_script is None:
+        spec = _parse_strategy((yield _extract_prompt(question), False))
+        pine_script = _local_pine(spec)
+        if pine_script is None:
+            pine_script = (yield _pine_prompt(question), not wants_backtest).strip()
+    if wants_backtest:
+        report = _backtest_report(spec)
+        if report:
+            pine_script = f"{pine_script}\n\n{report}"
+    return pine_script
+
+def _advance(steps, reply: str = None):
+    # (prompt, stream) for the next model call, or (None, answer) once done
+    try:
+        return steps.send(reply)
+    except StopIteration as done:
+        return None, done.value
+
 def strategy(state: State):
-    print("---------Strategy---------")
-    user_message = next((msg.content for msg in state["messages"] if msg.type == "human"), "")
-    pine_script = generate_pine_direct(user_message)
-    print("Pine Script Output:\n", pine_script)
+    steps = _answer(current_question(state))
+    prompt, result = _advance(steps)
+    while prompt is not None:
+        reply = get_llm("strategy").invoke(prompt, _nostream(not result)).content
+        prompt, result = _advance(steps, reply)
+    return {"messages": [AIMessage(content=result, name="strategy")]}
 
-    return {
-        "messages": state["messages"] + [AIMessage(content=pine_script)]
-    }
+async def astrategy(state: State):
+    # the local work between model calls (parsing, Pine rendering, the
+    # backtest over years of bars) runs off the event loop
+    steps = _answer(current_question(state))
+    prompt, result = await asyncio.to_thread(_advance, steps)
+    while prompt is not None:
+        reply = (await get_llm("strategy").ainvoke(prompt, _nostream(not result))).content
+        prompt, result = await asyncio.to_thread(_advance, steps, reply)
+    return {"messages": [AIMessage(content=result, name="strategy")]}
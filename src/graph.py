@@ -1,46 +1,54 @@
+from functools import lru_cache
 from langgraph.graph import StateGraph, START, END
-from langgraph.checkpoint.memory import MemorySaver
 from langchain_core.messages import HumanMessage
-from IPython.display import Image, display
-from src.experts import premarket, intraday, postmarket, strategy
-from src.components import chatbot, human_clarification, summary
+from src.experts import EXPERT_NAMES, async_expert_node, expert_node
+from src.experts.registry import routing_descriptions
+from src.components import chatbot, achatbot, human_clarification, summary, asummary
 from src.structures.state import State
 from src.utils.helpers import get_llm
+from src.utils.checkpointer import get_checkpointer
+from src.routing import get_router
+from src.telemetry import traced_node
 
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import PromptTemplate
 from langgraph.types import interrupt
 
 classification_template = PromptTemplate.from_template(
-    """You are an expert question classifier for a financial trading assistant. Classify the user's message into exactly one of the following categories: premarket, intraday, postmarket, strategy. 
-    
-    <PreMarket:Analyzes overnight news, economic releases, and global market trends.>
-    <IntraDay: Focuses on real-time technical analysis, order book dynamics, and short-term predictions.>
-    <PostMarket: Reviews trade performance, identifies patterns in execution, and suggests refinements.>
-    <Strategy: Translates natural language trading ideas/plans into structured formats or code snippets.>
-    
-    User message: {input}
-    Classification:
-    """
+    "You are an expert question classifier for a financial trading assistant. Classify the user's message "
+    f"into exactly one of the following categories: {', '.join(EXPERT_NAMES)}.\n\n"
+    + routing_descriptions().replace("{", "{{").replace("}", "}}")
+    + "\n\nUser message: {input}\nClassification:\n"
 )
 
-llm=get_llm()
 
-classification_chain = classification_template | llm | StrOutputParser()
+# Built on first use, so importing this module doesn't construct a client.
+@lru_cache(maxsize=None)
+def classification_chain():
+    return classification_template | get_llm("router") | StrOutputParser()
+
+def _fast_classify(user_input: str):
+    # these routers pick exactly one category
+    selected = get_router().route(user_input, max_experts=1)
+    return selected[0] if selected else None
 
 def route_to_agent(user_input: str) -> str:
-    response = classification_chain.invoke({"input": user_input}).strip().lower()
+    fast = _fast_classify(user_input)
+    if fast:
+        return fast
+    response = classification_chain().invoke({"input": user_input}).strip().lower()
     print("Router LLM classified input as:", response)
-    valid = {"premarket", "intraday", "postmarket", "strategy"}
-    return response if response in valid else "chatbot"
+    return response if response in EXPERT_NAMES else "chatbot"
 
 def gating_mechanism(state: State):
     print("Reached gating")
     last_input = state["messages"][-1].content
-    response = classification_chain.invoke({"input": last_input}).strip()
-    valid = {"premarket", "intraday", "postmarket", "strategy"}
+    fast = _fast_classify(last_input)
+    if fast:
+        return [fast]
+    response = classification_chain().invoke({"input": last_input}).strip()
 
-    if response.lower() in valid:
+    if response.lower() in EXPERT_NAMES:
         return [response.lower()]
     else:
         # Interrupt to ask user directly using LangGraph-native interrupt function
@@ -49,46 +57,51 @@ def gating_mechanism(state: State):
         return {"messages": state["messages"] + [HumanMessage(content=clarification)]}
 
 
-def trading_pal():
+def _build_graph(nodes: dict, checkpointer=None):
     graph_builder = StateGraph(State)
+    # each node becomes a span when telemetry is on (TRADINGPAL_TELEMETRY=1)
+    nodes = {name: traced_node(name, fn) for name, fn in {**nodes, "human_clarification": human_clarification}.items()}
 
-    graph_builder.add_node("chatbot", chatbot)
-    graph_builder.add_node("human_clarification", human_clarification)
-    graph_builder.add_node("premarket", premarket)
-    graph_builder.add_node("intraday", intraday)
-    graph_builder.add_node("postmarket", postmarket)
-    graph_builder.add_node("strategy", strategy)
+    graph_builder.add_node("chatbot", nodes["chatbot"])
+    graph_builder.add_node("human_clarification", nodes["human_clarification"])
+    for name in EXPERT_NAMES:
+        graph_builder.add_node(name, nodes[name])
 
     graph_builder.add_edge(START, "chatbot")
     graph_builder.add_edge("human_clarification", "chatbot")
     # graph_builder.add_conditional_edges("chatbot", lambda state: [route_to_agent(state["messages"][-1].content)], ["human_clarification", "premarket", "intraday", "postmarket", "strategy"])
 
-    graph_builder.add_conditional_edges(
-        "chatbot",
-        lambda state: ["human_clarification"] if "human_clarification" in state["messages"][-1].content else ["premarket", "intraday", "postmarket", "strategy"],
-        [
-            "chatbot",
-            "human_clarification",
-            "premarket",
-            "intraday",
-            "postmarket",
-            "strategy"
-        ]
-    )
+    # chatbot routes itself with Command(goto=[...]), so only the selected
+    # experts run, in parallel within a single step. A static fan-out edge
+    # here would also schedule every expert on every turn.
     # graph_builder.add_conditional_edges("chatbot", gating_mechanism, [
     #     "chatbot", "premarket", "intraday", "postmarket", "strategy"
     # ])
-    graph_builder.add_node("summary", summary)
-    graph_builder.add_edge("premarket", "summary")
-    graph_builder.add_edge("intraday", "summary")
-    graph_builder.add_edge("postmarket", "summary")
-    graph_builder.add_edge("strategy", "summary")
+    graph_builder.add_node("summary", nodes["summary"])
+    for name in EXPERT_NAMES:
+        graph_builder.add_edge(name, "summary")
     graph_builder.add_edge("summary", END)
 
-    checkpointer = MemorySaver()
-    return graph_builder.compile(checkpointer=checkpointer)
+    # "memory" (default), "sqlite" or a saver instance; see src/utils/checkpointer.py
+    return graph_builder.compile(checkpointer=get_checkpointer(checkpointer))
+
+# Compiled once per process and checkpointer; expert modules are imported
+# the first time the router sends a question their way.
+@lru_cache(maxsize=None)
+def trading_pal(checkpointer=None):
+    nodes = {name: expert_node(name) for name in EXPERT_NAMES}
+    return _build_graph({"chatbot": chatbot, "summary": summary, **nodes}, checkpointer)
+
+@lru_cache(maxsize=None)
+def atrading_pal(checkpointer=None):
+    # Same graph with coroutine nodes; use with graph.ainvoke / graph.astream.
+    # Experts selected together are awaited concurrently, so a fan-out turn
+    # costs roughly the slowest expert rather than the sum of all of them.
+    nodes = {name: async_expert_node(name) for name in EXPERT_NAMES}
+    return _build_graph({"chatbot": achatbot, "summary": asummary, **nodes}, checkpointer)
 
 if "__main__" == __name__:
+    from IPython.display import Image, display
     print("Point 4")
     graph = trading_pal()
     try:
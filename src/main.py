@@ -1,24 +1,76 @@
-import os
-import getpass
-from dotenv import load_dotenv
+import sys
+import asyncio
 
-from langchain_core.messages import HumanMessage
+from langchain_core.messages import AIMessageChunk, HumanMessage
 from langgraph.types import Command
 
-from graph import trading_pal
-load_dotenv()
-if not os.environ.get("OPENAI_API_KEY"):
-    os.environ["OPENAI_API_KEY"] = getpass.getpass("Enter your OpenAI API key: ")
+from src.utils import load_env
+# .env is loaded before the graph is imported so settings read at import
+# time (e.g. TRADINGPAL_CONTEXT_TOKENS) see it
+load_env()
+from graph import trading_pal, atrading_pal
+from src.experts import EXPERT_NAMES as EXPERTS
+from src.news import get_news_store
+
+class StreamPrinter:
+    # Prints expert tokens as they arrive, labelled by expert. Parallel experts
+    # interleave; a new label is printed whenever the speaking expert changes.
+    # Answers that produced no tokens (e.g. cache hits) are printed whole from
+    # the node's state update.
+    def __init__(self):
+        self.current = None
+        self.streamed = set()
+
+    def handle(self, mode, chunk):
+        if mode == "messages":
+            message, metadata = chunk
+            node = metadata.get("langgraph_node")
+            # whole messages are re-emitted once a node returns; only print
+            # token chunks here and leave unstreamed answers to "updates"
+            if node not in EXPERTS or not isinstance(message, AIMessageChunk) or not message.content:
+                return
+            if node != self.current:
+                print(f"\n[{node}] ", end="", flush=True)
+                self.current = node
+            print(message.content, end="", flush=True)
+            self.streamed.add(node)
+        elif mode == "updates":
+            for node, update in chunk.items():
+                if node == "__interrupt__":
+                    print(f"\n[clarification] {update[0].value}")
+                elif node in EXPERTS and node not in self.streamed and update:
+                    for message in update.get("messages", []):
+                        print(f"\n[{node}] {message.content}")
+                        self.current = None
 
 def main():
     graph = trading_pal()
+    get_news_store()  # starts indexing TRADINGPAL_NEWS_PATH while the user types
+
+    thread_config = {"configurable": {"thread_id": "paldemo"}}
+
+    user_input = input("What can TradingPal help you with today? ")
+    print("\n--- LangGraph Response ---")
+    printer = StreamPrinter()
+    for mode, chunk in graph.stream({"messages": [HumanMessage(user_input)]}, config=thread_config, stream_mode=["messages", "updates"]):
+        printer.handle(mode, chunk)
+    print()
+
+async def amain():
+    graph = atrading_pal()
+    get_news_store()
 
     thread_config = {"configurable": {"thread_id": "paldemo"}}
 
     user_input = input("What can TradingPal help you with today? ")
     print("\n--- LangGraph Response ---")
-    for event in graph.stream({"messages": [HumanMessage(user_input)]}, config=thread_config, stream_mode="values"):
-        print(event['messages'][-1])
+    printer = StreamPrinter()
+    async for mode, chunk in graph.astream({"messages": [HumanMessage(user_input)]}, config=thread_config, stream_mode=["messages", "updates"]):
+        printer.handle(mode, chunk)
+    print()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if "--async" in sys.argv:
+        asyncio.run(amain())
+    else:
+        main()
\ No newline at end of file
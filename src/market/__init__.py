@@ -0,0 +1,2 @@
+from src.market.engine import IndicatorEngine, format_snapshots
+from src.market.feed import TickFeed, apply_lines, feed_file, get_market_engine
@@ -0,0 +1,219 @@
+import numpy as np
+
+INDICATOR_FIELDS = ("last", "ema_fast", "ema_slow", "rsi", "vwap", "volatility", "imbalance", "spread")
+_COLUMNS = ("last", "ts", "trades", "ema_fast", "ema_slow", "avg_gain", "avg_loss", "day", "pv", "volume",
+            "ret_sum", "ret_sq", "filled", "head", "bid", "ask", "bid_size", "ask_size")
+
+
+class IndicatorEngine:
+    """Per-symbol streaming indicators with O(1) work per tick.
+
+    State lives in preallocated float64 columns indexed by a symbol's slot,
+    plus a (capacity, window) ring buffer of recent log returns for rolling
+    volatility. Ticks are applied in batches: a stable sort groups each
+    symbol's ticks into one run, and every recurrence folds a whole run at
+    once with segmented sums, so the cost of a batch doesn't depend on how
+    its ticks are spread over symbols and there is no Python-level work per
+    tick. Capacity doubles when more than `capacity` symbols show up.
+
+    Updates are meant to come from a single feeder thread; snapshots may be
+    read from any thread and can be one batch stale across fields."""
+
+    def __init__(self, capacity: int = 4096, fast: int = 12, slow: int = 26, rsi_period: int = 14,
+                 window: int = 100):
+        self.fast_alpha = 2.0 / (fast + 1)
+        self.slow_alpha = 2.0 / (slow + 1)
+        self.rsi_period = rsi_period
+        self.rsi_alpha = 1.0 / rsi_period
+        self.window = window
+        self.slots = {}
+        self.symbols = []
+        self.capacity = 0
+        self.ticks = 0
+        self.state = np.zeros((len(_COLUMNS), 0))
+        self.returns = np.zeros((0, window))
+        self._grow(capacity)
+
+    def _grow(self, capacity: int):
+        state = np.zeros((len(_COLUMNS), capacity))
+        state[:, :self.capacity] = self.state
+        returns = np.zeros((capacity, self.window))
+        returns[:self.capacity] = self.returns
+        self.state, self.returns, self.capacity = state, returns, capacity
+        for i, name in enumerate(_COLUMNS):
+            setattr(self, name, state[i])
+
+    def slot_ids(self, symbols) -> np.ndarray:
+        """Slots for an array of symbols; new symbols get a slot on first sight."""
+        unique, inverse = np.unique(np.asarray(symbols), return_inverse=True)
+        ids = np.empty(len(unique), dtype=np.int64)
+        for i, symbol in enumerate(unique.tolist()):
+            s = self.slots.get(symbol)
+            if s is None:
+                s = len(self.symbols)
+                if s >= self.capacity:
+                    self._grow(self.capacity * 2)
+                self.slots[symbol] = s
+                self.symbols.append(symbol)
+            ids[i] = s
+        return ids[inverse.reshape(-1)]
+
+    def update_trades(self, slots: np.ndarray, ts: np.ndarray, price: np.ndarray, size: np.ndarray):
+        self.ticks += len(slots)
+        if not len(slots):
+            return
+        # one contiguous run per symbol, ticks in arrival order within it
+        order = np.argsort(slots, kind="stable")
+        slots = slots[order]
+        ts = np.asarray(ts, dtype=np.float64)[order]
+        price = np.asarray(price, dtype=np.float64)[order]
+        size = np.asarray(size, dtype=np.float64)[order]
+        starts = np.flatnonzero(np.diff(slots, prepend=-1))
+        ends = np.append(starts[1:], len(slots)) - 1
+        counts = ends - starts + 1
+        run = np.repeat(np.arange(len(starts)), counts)
+        position = np.arange(len(slots))
+        s = slots[starts]
+
+        n = self.trades[s]
+        first = n == 0
+        self.trades[s] = n + counts
+        self.ts[s] = ts[ends]
+
+        # VWAP resets whenever the UTC day differs from the previous tick's,
+        # so only the ticks from a run's last reset onwards count
+        day = ts // 86400
+        prev_day = np.empty_like(day)
+        prev_day[1:] = day[:-1]
+        prev_day[starts] = self.day[s]
+        last_reset = np.maximum.accumulate(np.where(day != prev_day, position, -1))[ends]
+        reset = last_reset >= starts
+        counted = position >= np.where(reset, last_reset, starts)[run]
+        self.pv[s] = np.where(reset, 0.0, self.pv[s]) + self._run_sum(run, price * size, counted, len(s))
+        self.volume[s] = np.where(reset, 0.0, self.volume[s]) + self._run_sum(run, size, counted, len(s))
+        self.day[s] = day[ends]
+
+        prev = np.empty_like(price)
+        prev[1:] = price[:-1]
+        prev[starts] = np.where(first, price[starts], self.last[s])
+        self.last[s] = price[ends]
+
+        # exponential smoothing keeps only its latest value, so a run of k
+        # ticks folds to decay**k * y0 + sum(alpha * decay**(k-1-j) * x[j]);
+        # every weight is at most 1, so long runs can't overflow
+        age = counts[run] - 1 - (position - starts[run])
+
+        def smooth(alpha, x, y0):
+            decay = 1.0 - alpha
+            return decay ** counts * y0 + np.bincount(run, alpha * decay ** age * x, len(s))
+
+        self.ema_fast[s] = smooth(self.fast_alpha, price, np.where(first, price[starts], self.ema_fast[s]))
+        self.ema_slow[s] = smooth(self.slow_alpha, price, np.where(first, price[starts], self.ema_slow[s]))
+        change = price - prev
+        self.avg_gain[s] = smooth(self.rsi_alpha, np.maximum(change, 0.0), self.avg_gain[s])
+        self.avg_loss[s] = smooth(self.rsi_alpha, np.maximum(-change, 0.0), self.avg_loss[s])
+
+        # log returns into the ring buffer; of a run longer than the window
+        # only its last `window` returns are written
+        ok = (prev > 0) & (price > 0)
+        ok[starts] &= ~first
+        if not ok.any():
+            return
+        w = self.window
+        r = np.log(price[ok] / prev[ok])
+        owner = run[ok]
+        m = np.bincount(owner, minlength=len(s))
+        q = np.arange(len(r)) - (np.cumsum(m) - m)[owner]
+        head = self.head[s].astype(np.int64)
+        keep = q >= m[owner] - w
+        owner, r = owner[keep], r[keep]
+        rows, cols = s[owner], (head[owner] + q[keep]) % w
+        # cells not yet filled hold 0, so the overwritten values can be
+        # subtracted from the running sums unconditionally
+        old = self.returns[rows, cols]
+        self.ret_sum[s] += np.bincount(owner, r - old, len(s))
+        self.ret_sq[s] += np.bincount(owner, r * r - old * old, len(s))
+        self.returns[rows, cols] = r
+        touched = m > 0
+        t = s[touched]
+        lapped = head[touched] + m[touched] >= w
+        self.head[t] = (head[touched] + m[touched]) % w
+        self.filled[t] = np.minimum(self.filled[t] + m[touched], w)
+        if lapped.any():
+            # once per lap, re-sum the window so rounding can't drift
+            lap = t[lapped]
+            self.ret_sum[lap] = self.returns[lap].sum(axis=1)
+            self.ret_sq[lap] = np.square(self.returns[lap]).sum(axis=1)
+
+    @staticmethod
+    def _run_sum(run, values, mask, runs):
+        return np.bincount(run[mask], values[mask], runs)
+
+    def update_quotes(self, slots, ts, bid, bid_size, ask, ask_size):
+        self.ticks += len(slots)
+        # only the latest quote per symbol matters
+        _, last = np.unique(slots[::-1], return_index=True)
+        last = len(slots) - 1 - last
+        s = slots[last]
+        self.ts[s] = np.maximum(self.ts[s], ts[last])
+        self.bid[s] = bid[last]
+        self.ask[s] = ask[last]
+        self.bid_size[s] = bid_size[last]
+        self.ask_size[s] = ask_size[last]
+
+    def on_trade(self, symbol: str, ts: float, price: float, size: float):
+        self.update_trades(self.slot_ids([symbol]), np.array([ts]), np.array([price]), np.array([size]))
+
+    def on_quote(self, symbol: str, ts: float, bid: float, bid_size: float, ask: float, ask_size: float):
+        self.update_quotes(self.slot_ids([symbol]), np.array([ts]), np.array([bid]), np.array([bid_size]),
+                           np.array([ask]), np.array([ask_size]))
+
+    def snapshot(self, symbol: str) -> dict:
+        s = self.slots.get(symbol)
+        if s is None:
+            return None
+        n = int(self.trades[s])
+        filled = self.filled[s]
+        depth = self.bid_size[s] + self.ask_size[s]
+        gain, loss = self.avg_gain[s], self.avg_loss[s]
+        volatility = None
+        if filled >= 2:
+            mean = self.ret_sum[s] / filled
+            volatility = float(np.sqrt(max(self.ret_sq[s] / filled - mean * mean, 0.0) * filled / (filled - 1)))
+        return {
+            "symbol": symbol,
+            "ts": float(self.ts[s]),
+            "trades": n,
+            "last": float(self.last[s]) if n else None,
+            "ema_fast": float(self.ema_fast[s]) if n else None,
+            "ema_slow": float(self.ema_slow[s]) if n else None,
+            "rsi": float(100.0 if loss == 0 else 100.0 - 100.0 / (1.0 + gain / loss)) if n > self.rsi_period else None,
+            "vwap": float(self.pv[s] / self.volume[s]) if self.volume[s] > 0 else None,
+            "volatility": volatility,  # stdev of tick log returns over the window
+            "imbalance": float((self.bid_size[s] - self.ask_size[s]) / depth) if depth > 0 else None,
+            "spread": float(self.ask[s] - self.bid[s]) if self.bid[s] > 0 and self.ask[s] > 0 else None,
+        }
+
+    def most_active(self, limit: int = 10) -> list:
+        order = np.argsort(-self.trades[:len(self.symbols)], kind="stable")[:limit]
+        return [self.symbols[s] for s in order]
+
+
+def format_snapshots(snapshots: list) -> str:
+    lines = []
+    for snap in snapshots:
+        parts = [snap["symbol"]]
+        for field in INDICATOR_FIELDS:
+            value = snap.get(field)
+            if value is None:
+                continue
+            if field == "imbalance":
+                parts.append(f"imbalance={value:+.2f}")
+            elif field == "volatility":
+                parts.append(f"volatility={value * 100:.3f}%")
+            elif field == "rsi":
+                parts.append(f"rsi={value:.1f}")
+            else:
+                parts.append(f"{field}={value:.4g}")
+        lines.append(" ".join(parts))
+    return "\n".join(lines)
@@ -0,0 +1,183 @@
+import os
+import socket
+import threading
+import time
+
+import numpy as np
+
+from src.market.engine import IndicatorEngine
+
+# One event per line, comma separated, timestamps in epoch seconds:
+#   trade: ts,symbol,T,price,size
+#   quote: ts,symbol,Q,bid,bid_size,ask,ask_size
+# Anything else (blank lines, comments, a header) is ignored.
+
+_TRADE_COLUMNS = (0, 3, 4)
+_QUOTE_COLUMNS = (0, 3, 4, 5, 6)
+
+
+def _well_formed(lines: list, columns: int) -> list:
+    good = []
+    for line in lines:
+        fields = line.split(",")
+        if len(fields) < columns or not fields[1]:
+            continue
+        try:
+            [float(f) for f in fields[:1] + fields[3:columns]]
+        except ValueError:
+            continue
+        good.append(line)
+    return good
+
+
+def _parse(lines: list, columns: tuple):
+    # numpy's C reader does the per-line work; a batch with a malformed
+    # line is filtered line by line and parsed again
+    try:
+        values = np.loadtxt(lines, delimiter=",", usecols=columns, ndmin=2)
+    except ValueError:
+        good = _well_formed(lines, columns[-1] + 1)
+        print(f"Skipped {len(lines) - len(good)} malformed tick lines")
+        if not good:
+            return None, None
+        lines = good
+        values = np.loadtxt(lines, delimiter=",", usecols=columns, ndmin=2)
+    symbols = np.loadtxt(lines, delimiter=",", usecols=1, dtype=str, ndmin=1)
+    return symbols, values
+
+
+def apply_lines(engine: IndicatorEngine, lines: list) -> int:
+    """Parses a batch of tick lines and applies it to the engine; returns
+    the number of ticks applied."""
+    applied = 0
+    trades = [line for line in lines if ",T," in line]
+    if trades:
+        symbols, v = _parse(trades, _TRADE_COLUMNS)
+        if symbols is not None:
+            engine.update_trades(engine.slot_ids(symbols), v[:, 0], v[:, 1], v[:, 2])
+            applied += len(symbols)
+    quotes = [line for line in lines if ",Q," in line]
+    if quotes:
+        symbols, v = _parse(quotes, _QUOTE_COLUMNS)
+        if symbols is not None:
+            engine.update_quotes(engine.slot_ids(symbols), v[:, 0], v[:, 1], v[:, 2], v[:, 3], v[:, 4])
+            applied += len(symbols)
+    return applied
+
+
+def _last_timestamp(lines: list) -> float:
+    for line in reversed(lines):
+        try:
+            return float(line.split(",", 1)[0])
+        except ValueError:
+            continue
+    return None
+
+
+def feed_file(engine: IndicatorEngine, f, speed: float = 0.0, stop: threading.Event = None) -> int:
+    """Replays an open tick file in batches. With speed > 0 each batch is
+    held back until its last tick is due at that multiple of the recorded
+    pace (1.0 is real time); otherwise it goes as fast as possible."""
+    hint = 1 << 20 if speed <= 0 else 1 << 13
+    applied = 0
+    start_ts = start_wall = None
+    while not (stop is not None and stop.is_set()):
+        lines = f.readlines(hint)
+        if not lines:
+            break
+        if speed > 0:
+            ts = _last_timestamp(lines)
+            if ts is not None:
+                if start_ts is None:
+                    start_ts, start_wall = ts, time.monotonic()
+                ahead = (ts - start_ts) / speed - (time.monotonic() - start_wall)
+                if ahead > 0:
+                    time.sleep(ahead)
+        applied += apply_lines(engine, lines)
+    return applied
+
+
+class TickFeed:
+    """Feeds an engine from a tick file (replayed once) or a tcp://host:port
+    line stream (reconnecting) on a background daemon thread."""
+
+    def __init__(self, engine: IndicatorEngine, source: str, speed: float = 0.0):
+        self.engine = engine
+        self.source = source
+        self.speed = speed
+        self.applied = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.run, name="tradingpal-ticks", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def join(self, timeout: float = None):
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def run(self):
+        if self.source.startswith("tcp://"):
+            self._run_socket()
+        else:
+            with open(self.source) as f:
+                self.applied += feed_file(self.engine, f, self.speed, self._stop)
+
+    def _run_socket(self):
+        host, _, port = self.source[len("tcp://"):].rpartition(":")
+        backoff = 1.0
+        while not self._stop.is_set():
+            try:
+                with socket.create_connection((host, int(port)), timeout=10) as conn:
+                    conn.settimeout(1.0)
+                    backoff = 1.0
+                    self._read_socket(conn)
+            except OSError as e:
+                print(f"Tick stream {self.source} unavailable: {e}")
+            self._stop.wait(backoff)
+            backoff = min(backoff * 2, 30.0)
+
+    def _read_socket(self, conn):
+        # whatever has arrived is applied as one batch; a partial last line
+        # waits for the next read
+        pending = b""
+        while not self._stop.is_set():
+            try:
+                data = conn.recv(1 << 20)
+            except socket.timeout:
+                continue
+            if not data:
+                return
+            pending += data
+            cut = pending.rfind(b"\n") + 1
+            if cut:
+                lines = pending[:cut].decode().splitlines()
+                pending = pending[cut:]
+                self.applied += apply_lines(self.engine, lines)
+
+
+_engine = None
+_feed = None
+_engine_lock = threading.Lock()
+
+
+def get_market_engine():
+    """Process-wide engine fed from TRADINGPAL_TICKS_PATH (a tick file or
+    tcp://host:port), started on first use. Replay pace comes from
+    TRADINGPAL_TICKS_SPEED (0, the default, replays as fast as possible).
+    Returns None when no tick source is configured."""
+    global _engine, _feed
+    source = os.environ.get("TRADINGPAL_TICKS_PATH")
+    if not source or (not source.startswith("tcp://") and not os.path.exists(source)):
+        return None
+    with _engine_lock:
+        if _engine is None:
+            _engine = IndicatorEngine(int(os.environ.get("TRADINGPAL_TICKS_SYMBOLS", "4096")))
+            _feed = TickFeed(_engine, source, float(os.environ.get("TRADINGPAL_TICKS_SPEED", "0"))).start()
+    return _engine
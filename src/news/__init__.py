@@ -0,0 +1 @@
+from src.news.store import NewsStore, get_news_store
@@ -0,0 +1,72 @@
+import re
+
+import numpy as np
+
+_PRIME = (1 << 61) - 1
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+class MinHashDeduper:
+    """Near-duplicate detection with MinHash signatures over word shingles
+    and LSH banding, so each new document is compared only against the few
+    documents that share a band bucket."""
+
+    def __init__(self, num_perm: int = 64, bands: int = 16, shingle: int = 5, threshold: float = 0.8, seed: int = 1):
+        assert num_perm % bands == 0
+        rng = np.random.default_rng(seed)
+        # x < 2**32 and a < 2**31 keep a * x + b inside uint64
+        self.a = rng.integers(1, 1 << 31, num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, _PRIME, num_perm, dtype=np.uint64)
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle = shingle
+        self.threshold = threshold
+        self.buckets = [{} for _ in range(bands)]
+        self.signatures = []
+
+    def signature(self, text: str) -> np.ndarray:
+        words = _WORD_RE.findall(text.lower())
+        # str hashes are salted per process, which is fine for an in-memory index
+        word_hashes = np.fromiter(map(hash, words), dtype=np.int64, count=len(words)).view(np.uint64)
+        word_hashes &= np.uint64(0xFFFFFFFF)
+        if len(word_hashes) < self.shingle:
+            word_hashes = np.pad(word_hashes, (0, self.shingle - len(word_hashes)))
+        # rolling combination of word hashes gives every shingle's hash in one
+        # vectorized pass, kept to 32 bits
+        n = len(word_hashes) - self.shingle + 1
+        hashes = np.zeros(n, dtype=np.uint64)
+        for j in range(self.shingle):
+            hashes = (hashes * np.uint64(1000003) + word_hashes[j:j + n]) & np.uint64(0xFFFFFFFF)
+        hashes = np.unique(hashes)
+        # (a * x + b) mod p for every permutation at once
+        return ((hashes[:, None] * self.a + self.b) % np.uint64(_PRIME)).min(axis=0)
+
+    def is_duplicate(self, text: str) -> bool:
+        """Returns True for a near-duplicate of something already added,
+        otherwise records the text and returns False."""
+        sig = self.signature(text)
+        keys = [sig[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+        candidates = set()
+        for band, key in zip(self.buckets, keys):
+            candidates.update(band.get(key, ()))
+        for doc_id in candidates:
+            if (self.signatures[doc_id] == sig).mean() >= self.threshold:
+                return True
+        doc_id = len(self.signatures)
+        self.signatures.append(sig)
+        for band, key in zip(self.buckets, keys):
+            band.setdefault(key, []).append(doc_id)
+        return False
+
+    def remove(self, doc_id: int):
+        """Forgets a document recorded by is_duplicate (ids count from 0 in
+        the order documents were accepted)."""
+        sig = self.signatures[doc_id]
+        if sig is None:
+            return
+        for i, band in enumerate(self.buckets):
+            key = sig[i * self.rows:(i + 1) * self.rows].tobytes()
+            band[key].remove(doc_id)
+            if not band[key]:
+                del band[key]
+        self.signatures[doc_id] = None
@@ -0,0 +1,107 @@
+import math
+import re
+from array import array
+from collections import Counter
+
+import numpy as np
+
+_WORD_RE = re.compile(r"[a-z0-9]+(?:[.'][a-z0-9]+)*")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have he how in is it its of on or that the this to "
+    "was were what when which who will with would you your i me my we our they their".split()
+)
+
+
+def terms(text: str) -> list:
+    return [t for t in _WORD_RE.findall(text.lower()) if t not in STOPWORDS]
+
+
+class BM25Index:
+    """Inverted index updated one chunk at a time. Document frequencies and
+    the average length are live counters, so scores stay correct as chunks
+    are added without rebuilding anything.
+
+    Postings are compact typed arrays that search() scores as numpy views,
+    so a query costs a few vector operations per term instead of a Python
+    loop over every posting. Not thread-safe: appending while a search holds
+    views raises BufferError, so callers serialize add() and search()
+    (NewsStore does)."""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings = {}  # term -> (chunk ids, term frequencies)
+        self.lengths = array("d")
+        self.chunks = []  # None once removed; chunk ids are never reused
+        self.total_length = 0
+        self.live = 0
+
+    def __len__(self):
+        return self.live
+
+    def add(self, text: str, meta: dict = None) -> int:
+        chunk_id = len(self.chunks)
+        counts = Counter(terms(text))
+        for term, tf in counts.items():
+            posting = self.postings.get(term)
+            if posting is None:
+                posting = self.postings[term] = (array("i"), array("d"))
+            posting[0].append(chunk_id)
+            posting[1].append(tf)
+        length = sum(counts.values())
+        self.lengths.append(length)
+        self.total_length += length
+        self.live += 1
+        self.chunks.append((text, meta or {}))
+        return chunk_id
+
+    def remove(self, chunk_ids):
+        """Drops chunks from the postings, document frequencies and average
+        length; each affected posting list is filtered once per call."""
+        removed = np.array(sorted(i for i in set(chunk_ids) if self.chunks[i] is not None), dtype=np.int32)
+        affected = set()
+        for chunk_id in removed:
+            affected.update(terms(self.chunks[chunk_id][0]))
+            self.total_length -= self.lengths[chunk_id]
+            self.lengths[chunk_id] = 0
+            self.chunks[chunk_id] = None
+        self.live -= len(removed)
+        for term in affected:
+            ids, tf = self.postings[term]
+            keep = ~np.isin(np.frombuffer(ids, np.int32), removed)
+            if not keep.any():
+                del self.postings[term]
+            elif not keep.all():
+                self.postings[term] = (array("i", np.frombuffer(ids, np.int32)[keep].tobytes()),
+                                       array("d", np.frombuffer(tf)[keep].tobytes()))
+
+    def search(self, query: str, k: int = 5) -> list:
+        n = len(self.chunks)
+        if not self.live:
+            return []
+        # per-chunk length normalization shared by every term
+        norm = self.k1 * (1 - self.b + self.b * np.frombuffer(self.lengths) / (self.total_length / self.live))
+        ids, weights = [], []
+        for term in set(terms(query)):
+            posting = self.postings.get(term)
+            if posting is None:
+                continue
+            chunk_ids = np.frombuffer(posting[0], np.int32)
+            tf = np.frombuffer(posting[1])
+            idf = math.log(1 + (self.live - len(chunk_ids) + 0.5) / (len(chunk_ids) + 0.5))
+            ids.append(chunk_ids)
+            weights.append(idf * (self.k1 + 1) * tf / (tf + norm[chunk_ids]))
+        if not ids:
+            return []
+        if len(ids) == 1:
+            # a term's chunk ids are unique, so its weights are the scores
+            candidates, scores = ids[0], weights[0]
+        else:
+            totals = np.bincount(np.concatenate(ids), np.concatenate(weights), minlength=n)
+            candidates = np.flatnonzero(totals)
+            scores = totals[candidates]
+        if len(scores) > k:
+            top = np.argpartition(scores, len(scores) - k)[-k:]
+            candidates, scores = candidates[top], scores[top]
+        order = np.lexsort((candidates, -scores))  # best first, ties by chunk id
+        return [(float(scores[i]), *self.chunks[candidates[i]]) for i in order]
@@ -0,0 +1,57 @@
+import json
+import os
+import re
+
+NEWS_EXTENSIONS = (".txt", ".md", ".jsonl")
+_WORD_RE = re.compile(r"\S+")
+
+
+def read_file(path: str):
+    """Yields (title, text) pairs. Text and markdown files are one article
+    each with the first line as title; JSONL files hold one article per line
+    with "title" and "body"/"text" fields."""
+    if path.endswith(".jsonl"):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                row = json.loads(line)
+                text = row.get("body") or row.get("text") or ""
+                if text:
+                    yield row.get("title") or text[:80], text
+        return
+    with open(path, encoding="utf-8") as f:
+        text = f.read().strip()
+    if text:
+        yield text.splitlines()[0][:200], text
+
+
+def iter_files(path: str):
+    if os.path.isfile(path):
+        yield path
+        return
+    for root, _, files in os.walk(path):
+        for name in sorted(files):
+            if name.endswith(NEWS_EXTENSIONS):
+                yield os.path.join(root, name)
+
+
+def chunk_text(text: str, max_words: int = 180, overlap: int = 30) -> list:
+    # paragraph-aligned chunks of at most `max_words`; long paragraphs are
+    # split with a small overlap so a sentence on the boundary is not lost
+    chunks, current = [], []
+    for paragraph in re.split(r"\n\s*\n|\n(?=\s{4,})", text):
+        words = _WORD_RE.findall(paragraph)
+        if not words:
+            continue
+        if current and len(current) + len(words) > max_words:
+            chunks.append(" ".join(current))
+            current = []
+        while len(words) > max_words:
+            chunks.append(" ".join(words[:max_words]))
+            words = words[max_words - overlap:]
+        current.extend(words)
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
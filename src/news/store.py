@@ -0,0 +1,119 @@
+import os
+import threading
+import time
+
+from src.news.dedup import MinHashDeduper
+from src.news.index import BM25Index
+from src.news.ingest import chunk_text, iter_files, read_file
+from src.utils.context import count_text_tokens
+
+
+class NewsStore:
+    """Ingests news files into a deduplicated, chunked BM25 index and
+    returns the chunks most relevant to a question within a token budget."""
+
+    def __init__(self, max_words: int = 180):
+        self.max_words = max_words
+        self.index = BM25Index()
+        self.deduper = MinHashDeduper()
+        self._seen_files = {}
+        self._sources = {}  # source -> [(dedup doc id, chunk ids)] of its documents
+        self._lock = threading.Lock()
+        self.stats = {"documents": 0, "duplicates": 0, "chunks": 0}
+        self.ready = threading.Event()  # set after the first full ingest pass
+
+    def add_document(self, title: str, text: str, source: str = None) -> bool:
+        with self._lock:
+            if self.deduper.is_duplicate(text):
+                self.stats["duplicates"] += 1
+                return False
+            chunk_ids = [self.index.add(chunk, {"title": title, "source": source})
+                         for chunk in chunk_text(text, self.max_words)]
+            self._sources.setdefault(source, []).append((len(self.deduper.signatures) - 1, chunk_ids))
+            self.stats["chunks"] += len(chunk_ids)
+            self.stats["documents"] += 1
+            return True
+
+    def remove_source(self, source: str) -> int:
+        # drops every chunk added from `source`, and its documents from the
+        # deduper so a corrected version isn't rejected as a near-duplicate
+        with self._lock:
+            documents = self._sources.pop(source, [])
+            chunk_ids = [i for _, ids in documents for i in ids]
+            self.index.remove(chunk_ids)
+            for doc_id, _ in documents:
+                self.deduper.remove(doc_id)
+            self.stats["documents"] -= len(documents)
+            self.stats["chunks"] -= len(chunk_ids)
+            return len(documents)
+
+    def ingest_path(self, path: str) -> int:
+        # files already ingested are skipped unless their mtime/size changed;
+        # a changed file replaces its old chunks and a deleted one drops them
+        added = 0
+        current = set()
+        for file_path in iter_files(path):
+            current.add(file_path)
+            stat = os.stat(file_path)
+            stamp = (stat.st_mtime, stat.st_size)
+            if self._seen_files.get(file_path) == stamp:
+                continue
+            if file_path in self._seen_files:
+                self.remove_source(file_path)
+            self._seen_files[file_path] = stamp
+            for title, text in read_file(file_path):
+                added += self.add_document(title, text, file_path)
+        for file_path in set(self._seen_files) - current:
+            del self._seen_files[file_path]
+            self.remove_source(file_path)
+        return added
+
+    def search(self, query: str, k: int = 5) -> list:
+        # the index is appended to by the ingest thread; a search only waits
+        # for the document being added, not for the whole pass
+        with self._lock:
+            return self.index.search(query, k)
+
+    def context(self, query: str, max_tokens: int = 1500, k: int = 20) -> str:
+        parts, used = [], 0
+        for _, text, meta in self.search(query, k):
+            part = f"[{meta.get('title')}]\n{text}"
+            tokens = count_text_tokens(part)
+            if used + tokens > max_tokens:
+                continue
+            parts.append(part)
+            used += tokens
+        return "\n\n".join(parts)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def _refresh_loop(store: NewsStore, path: str, refresh: float):
+    while True:
+        try:
+            store.ingest_path(path)
+        except (OSError, ValueError) as e:
+            print(f"News ingest from {path} failed: {e}")
+        store.ready.set()
+        time.sleep(refresh)
+
+
+def get_news_store():
+    """Process-wide store over TRADINGPAL_NEWS_PATH (file or directory).
+    Files are ingested on a background thread, rescanned for changes every
+    TRADINGPAL_NEWS_REFRESH seconds, so callers never wait on ingestion:
+    until the first pass finishes, searches see what is indexed so far.
+    Returns None when no news path is configured."""
+    global _store
+    path = os.environ.get("TRADINGPAL_NEWS_PATH")
+    if not path or not os.path.exists(path):
+        return None
+    with _store_lock:
+        if _store is None:
+            _store = NewsStore()
+            refresh = max(1.0, float(os.environ.get("TRADINGPAL_NEWS_REFRESH", "60")))
+            threading.Thread(target=_refresh_loop, args=(_store, path, refresh), name="news-ingest",
+                             daemon=True).start()
+    return _store
@@ -0,0 +1 @@
+from src.routing.classifier import FastRouter, RouterModel, get_router
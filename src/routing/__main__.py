@@ -0,0 +1,49 @@
+# Offline training / evaluation for the local router.
+#   python -m src.routing train examples.jsonl --out router.json
+#   python -m src.routing eval examples.jsonl --model router.json --threshold 0.8
+# Each JSONL line is {"text": "...", "labels": ["premarket", ...]}; use the
+# label "other" for input that should go to the LLM router.
+import argparse
+import json
+import random
+
+from src.routing.classifier import FastRouter, RouterModel, evaluate
+from src.routing.data import SEED_EXAMPLES
+
+
+def load_examples(path):
+    if not path:
+        return list(SEED_EXAMPLES)
+    with open(path) as f:
+        return [(row["text"], row["labels"]) for row in map(json.loads, filter(str.strip, f))]
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m src.routing")
+    parser.add_argument("command", choices=["train", "eval"])
+    parser.add_argument("data", nargs="?", help="JSONL examples (defaults to the seed set)")
+    parser.add_argument("--out", default="router.json")
+    parser.add_argument("--model", help="trained model for eval; otherwise a held-out split is used")
+    parser.add_argument("--threshold", type=float, default=0.8)
+    parser.add_argument("--holdout", type=float, default=0.2)
+    args = parser.parse_args()
+
+    examples = load_examples(args.data)
+    if args.command == "train":
+        model = RouterModel.train(examples)
+        model.save(args.out)
+        print(f"Trained on {len(examples)} examples -> {args.out}")
+        print(evaluate(FastRouter(model, args.threshold), examples))
+        return
+
+    if args.model:
+        model, test = RouterModel.load(args.model), examples
+    else:
+        random.Random(0).shuffle(examples)
+        split = int(len(examples) * (1 - args.holdout))
+        model, test = RouterModel.train(examples[:split]), examples[split:]
+    print(evaluate(FastRouter(model, args.threshold), test))
+
+
+if __name__ == "__main__":
+    main()
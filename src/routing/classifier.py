@@ -0,0 +1,163 @@
+import json
+import math
+import os
+import random
+import re
+import threading
+from collections import Counter
+
+from src.experts.registry import EXPERT_NAMES
+from src.routing.data import SEED_EXAMPLES
+from src.telemetry import register_stats
+
+# experts come from src/experts/registry.py; one added there without seed
+# examples is simply never picked locally and goes to the LLM router
+EXPERTS = EXPERT_NAMES
+LABELS = EXPERTS + ("other",)
+
+_TOKEN_RE = re.compile(r"[a-z0-9%&$]+")
+
+
+def tokenize(text: str) -> list:
+    words = _TOKEN_RE.findall(text.lower())
+    # unigrams plus bigrams so phrases like "stop loss" and "my trades" count
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+class RouterModel:
+    """TF-IDF features with one-vs-rest logistic regression, pure Python so it
+    adds no dependency and scores a message in microseconds."""
+
+    def __init__(self, idf=None, weights=None, bias=None):
+        self.idf = idf or {}
+        self.weights = weights or {label: {} for label in LABELS}
+        self.bias = bias or {label: 0.0 for label in LABELS}
+
+    def features(self, text: str) -> dict:
+        counts = Counter(t for t in tokenize(text) if t in self.idf)
+        vec = {t: (1.0 + math.log(c)) * self.idf[t] for t, c in counts.items()}
+        norm = math.sqrt(sum(v * v for v in vec.values()))
+        if norm:
+            vec = {t: v / norm for t, v in vec.items()}
+        return vec
+
+    def predict_proba(self, text: str) -> tuple:
+        vec = self.features(text)
+        probs = {}
+        for label in LABELS:
+            w = self.weights[label]
+            z = self.bias[label] + sum(w.get(t, 0.0) * v for t, v in vec.items())
+            probs[label] = 1.0 / (1.0 + math.exp(-max(-30.0, min(30.0, z))))
+        return probs, bool(vec)
+
+    @classmethod
+    def train(cls, examples, epochs=60, lr=0.5, l2=1e-4, seed=0):
+        docs = [(tokenize(text), set(labels)) for text, labels in examples]
+        df = Counter(t for tokens, _ in docs for t in set(tokens))
+        n = len(docs)
+        idf = {t: math.log((1 + n) / (1 + c)) + 1.0 for t, c in df.items()}
+        model = cls(idf=idf)
+
+        rows = [(model.features(text), set(labels)) for text, labels in examples]
+        rng = random.Random(seed)
+        for _ in range(epochs):
+            rng.shuffle(rows)
+            for vec, labels in rows:
+                for label in LABELS:
+                    w = model.weights[label]
+                    z = model.bias[label] + sum(w.get(t, 0.0) * v for t, v in vec.items())
+                    p = 1.0 / (1.0 + math.exp(-max(-30.0, min(30.0, z))))
+                    g = p - (1.0 if label in labels else 0.0)
+                    model.bias[label] -= lr * g
+                    for t, v in vec.items():
+                        w[t] = w.get(t, 0.0) * (1.0 - lr * l2) - lr * g * v
+        return model
+
+    def save(self, path: str):
+        with open(path, "w") as f:
+            json.dump({"idf": self.idf, "weights": self.weights, "bias": self.bias}, f)
+
+    @classmethod
+    def load(cls, path: str):
+        with open(path) as f:
+            data = json.load(f)
+        # a model saved before an expert was registered never predicts it
+        weights = {label: data["weights"].get(label, {}) for label in LABELS}
+        bias = {label: data["bias"].get(label, -30.0) for label in LABELS}
+        return cls(idf=data["idf"], weights=weights, bias=bias)
+
+
+class FastRouter:
+    """Picks experts locally when the model is confident; returns None so the
+    caller falls back to the LLM router for ambiguous or off-topic input."""
+
+    def __init__(self, model: RouterModel, threshold: float = 0.8):
+        self.model = model
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.fallbacks = 0
+
+    def classify(self, text: str):
+        probs, known = self.model.predict_proba(text)
+        selected = [e for e in EXPERTS if probs[e] >= 0.5]
+        # confidence is the weakest per-label decision, so one borderline
+        # expert is enough to defer to the LLM
+        confidence = min(max(p, 1.0 - p) for p in probs.values())
+        if not known or probs["other"] >= 0.5 or not selected:
+            confidence = 0.0
+        return selected, confidence
+
+    def route(self, text: str, max_experts: int = None):
+        selected, confidence = self.classify(text)
+        hit = confidence >= self.threshold
+        if max_experts is not None and len(selected) > max_experts:
+            hit = False
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.fallbacks += 1
+        return selected if hit else None
+
+    def stats(self) -> dict:
+        total = self.hits + self.fallbacks
+        return {
+            "hits": self.hits,
+            "fallbacks": self.fallbacks,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+def evaluate(router: FastRouter, examples) -> dict:
+    confident = correct = 0
+    for text, labels in examples:
+        selected, confidence = router.classify(text)
+        expected = sorted(l for l in labels if l in EXPERTS)
+        if confidence >= router.threshold:
+            confident += 1
+            correct += sorted(selected) == expected
+    n = len(examples)
+    return {
+        "examples": n,
+        "coverage": confident / n if n else 0.0,
+        "accuracy_when_confident": correct / confident if confident else 0.0,
+    }
+
+
+_router = None
+_router_lock = threading.Lock()
+
+
+def get_router() -> FastRouter:
+    global _router
+    if _router is None:
+        with _router_lock:
+            if _router is None:
+                path = os.environ.get("TRADINGPAL_ROUTER_MODEL")
+                model = RouterModel.load(path) if path else RouterModel.train(SEED_EXAMPLES)
+                threshold = float(os.environ.get("TRADINGPAL_ROUTER_THRESHOLD", "0.8"))
+                _router = FastRouter(model, threshold)
+                # hit / fallback counts, for tuning TRADINGPAL_ROUTER_THRESHOLD
+                register_stats("router", _router.stats)
+    return _router
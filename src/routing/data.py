@@ -0,0 +1,76 @@
+# Seed routing examples used when no trained model file is configured.
+# Each entry is (text, labels); "other" marks off-topic or unclear input that
+# should go to the LLM router so it can phrase a clarification question.
+SEED_EXAMPLES = [
+    # premarket
+    ("What happened in the markets overnight?", ["premarket"]),
+    ("Any news that will move the market at the open tomorrow?", ["premarket"]),
+    ("Summarize the latest Fed news and what it means for stocks", ["premarket"]),
+    ("How did futures react to the CPI release this morning?", ["premarket"]),
+    ("What are the key levels for SPY before the open?", ["premarket"]),
+    ("Give me a premarket briefing", ["premarket"]),
+    ("Which stocks are gapping up premarket on earnings news?", ["premarket"]),
+    ("What is the market outlook for the next trading day?", ["premarket"]),
+    ("How are Asian and European markets trading today?", ["premarket"]),
+    ("What economic releases are scheduled this week and how will they affect the market trend?", ["premarket"]),
+    ("Did the tariff headlines hurt the market recently?", ["premarket"]),
+    ("Recent market trends for tech stocks", ["premarket"]),
+    # intraday
+    ("I'm long 200 shares of TSLA right now, should I hold?", ["intraday"]),
+    ("My NVDA position is down 3% since I entered an hour ago, what should I do?", ["intraday"]),
+    ("Should I move my stop on the AAPL trade I'm currently in?", ["intraday"]),
+    ("The order book on AMD looks heavy on the ask, is it going lower?", ["intraday"]),
+    ("I just got filled on a short in QQQ, where should I take profit?", ["intraday"]),
+    ("Price is breaking VWAP on my open trade, add or cut?", ["intraday"]),
+    ("Real-time read on MSFT momentum right now", ["intraday"]),
+    ("Is this intraday breakout in SPY holding?", ["intraday"]),
+    ("I'm in a live scalp on ES futures, is momentum fading?", ["intraday"]),
+    ("Should I scale out of my active position before lunch?", ["intraday"]),
+    ("Current RSI on my open META trade is 78, trim now?", ["intraday"]),
+    ("My ongoing trade in AMZN keeps chopping around the entry", ["intraday"]),
+    # postmarket
+    ("Review my trades from today", ["postmarket"]),
+    ("Here is my trade history, what patterns do you see?", ["postmarket"]),
+    ("Why did I lose money today?", ["postmarket"]),
+    ("Analyze my performance after the close", ["postmarket"]),
+    ("What mistakes did I make in my executions this week?", ["postmarket"]),
+    ("Look at my win rate and tell me what to improve", ["postmarket"]),
+    ("I closed all my positions, how did I do overall?", ["postmarket"]),
+    ("Post-market review of my AAPL and MSFT trades", ["postmarket"]),
+    ("My P&L was negative again, review my trading journal", ["postmarket"]),
+    ("Which of my trades today had the worst slippage?", ["postmarket"]),
+    ("End of day recap of my fills", ["postmarket"]),
+    ("Grade my trading performance yesterday", ["postmarket"]),
+    # strategy
+    ("Buy when RSI crosses below 30 and sell when it crosses above 70", ["strategy"]),
+    ("I have a strategy where I buy when price decreases", ["strategy"]),
+    ("Write Pine Script for a moving average crossover", ["strategy"]),
+    ("Turn this idea into code: go long when the 50 EMA crosses above the 200 EMA", ["strategy"]),
+    ("What if I bought every dip below the 20 SMA with a 2% stop loss?", ["strategy"]),
+    ("Backtest a strategy that shorts when MACD turns negative", ["strategy"]),
+    ("Hypothetically, a breakout strategy with 10% position size and 15% take profit", ["strategy"]),
+    ("Convert my trading plan into a structured format", ["strategy"]),
+    ("Entry on RSI below 25, exit on RSI above 60, 1h chart", ["strategy"]),
+    ("Would a mean reversion strategy on SPY work?", ["strategy"]),
+    ("Design a trading strategy using Bollinger Bands", ["strategy"]),
+    ("How would this have done: buy when price closes above the 200 EMA", ["strategy"]),
+    # multi-expert
+    ("Given today's news, what strategy should I use tomorrow?", ["premarket", "strategy"]),
+    ("Based on overnight news, build me a gap-and-go strategy", ["premarket", "strategy"]),
+    ("Review my trades today and suggest a better entry strategy", ["postmarket", "strategy"]),
+    ("Recap my fills and write a rule-based strategy to fix my exits", ["postmarket", "strategy"]),
+    ("What is the news on NVDA and should I hold my open position?", ["premarket", "intraday"]),
+    # off-topic / unclear
+    ("How are you today?", ["other"]),
+    ("What's the weather like in Chicago?", ["other"]),
+    ("Tell me a joke", ["other"]),
+    ("Can you help me with my homework?", ["other"]),
+    ("hello", ["other"]),
+    ("What should I cook for dinner?", ["other"]),
+    ("Who won the game last night?", ["other"]),
+    ("asdf", ["other"]),
+    ("Write me a poem about the ocean", ["other"]),
+    ("I need help", ["other"]),
+    ("What is the capital of France?", ["other"]),
+    ("Translate this sentence into Spanish", ["other"]),
+]
@@ -1,5 +1,7 @@
 from typing import Annotated
-from typing_extensions import TypedDict
+from typing_extensions import NotRequired, TypedDict
 from langgraph.graph.message import add_messages
 class State(TypedDict):
-    messages: Annotated[list, add_messages]
\ No newline at end of file
+    messages: Annotated[list, add_messages]
+    # rolling summary of turns that have been dropped from `messages`
+    summary: NotRequired[str]
@@ -0,0 +1,4 @@
+from src.telemetry.sinks import JsonlSink, RingBuffer
+from src.telemetry.tracer import (
+    annotate, get_tracer, metrics_text, register_stats, set_telemetry, stats, summary, traced_node,
+)
@@ -0,0 +1,34 @@
+# Offline /metrics-style dump of a span log written with TRADINGPAL_TELEMETRY_PATH.
+#   python -m src.telemetry spans.jsonl              # Prometheus text
+#   python -m src.telemetry spans.jsonl --summary    # JSON percentiles and totals
+#   python -m src.telemetry spans.jsonl --thread paldemo
+import argparse
+import json
+
+from src.telemetry.sinks import RingBuffer
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m src.telemetry")
+    parser.add_argument("path")
+    parser.add_argument("--summary", action="store_true")
+    parser.add_argument("--thread", help="print the spans of one thread_id")
+    parser.add_argument("--capacity", type=int, default=100000, help="spans kept for percentiles")
+    args = parser.parse_args()
+
+    ring = RingBuffer(args.capacity)
+    with open(args.path) as f:
+        for line in f:
+            if line.strip():
+                ring.emit(json.loads(line))
+    if args.thread:
+        for span in ring.recent(args.thread, limit=None):
+            print(json.dumps(span))
+    elif args.summary:
+        print(json.dumps(ring.summary(), indent=2))
+    else:
+        print(ring.metrics_text(), end="")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # GET /metrics  -> Prometheus text
+    # GET /summary  -> JSON percentiles, LLM totals, routing counts and
+    #                  registered component stats (fast router, cache)
+    # GET /spans?thread_id=...&limit=100 -> JSON list of recent spans
+    def do_GET(self):
+        from src.telemetry.tracer import get_tracer, metrics_text, summary
+
+        tracer = get_tracer()
+        ring = tracer.ring if tracer is not None else None
+        url = urlparse(self.path)
+        if ring is None or url.path not in ("/metrics", "/summary", "/spans"):
+            self.send_error(404)
+            return
+        if url.path == "/metrics":
+            body, kind = metrics_text(), "text/plain; version=0.0.4"
+        elif url.path == "/summary":
+            body, kind = json.dumps(summary()), "application/json"
+        else:
+            query = parse_qs(url.query)
+            spans = ring.recent(query.get("thread_id", [None])[0], int(query.get("limit", ["100"])[0]))
+            body, kind = json.dumps(spans, default=str), "application/json"
+        data = body.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", kind)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_metrics(port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((host, port), _Handler)
+    threading.Thread(target=server.serve_forever, name="telemetry-http", daemon=True).start()
+    return server
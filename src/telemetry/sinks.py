@@ -0,0 +1,157 @@
+import atexit
+import json
+import threading
+from bisect import bisect_left
+from collections import deque
+
+# Upper bounds, in seconds, of the latency histogram buckets.
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, float("inf"))
+
+
+class Histogram:
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(BUCKETS, value)] += 1
+        self.count += 1
+        self.sum += value
+
+
+def _quantile(values: list, q: float) -> float:
+    return values[min(len(values) - 1, int(q * len(values)))] if values else None
+
+
+class RingBuffer:
+    """Keeps the most recent `capacity` spans, plus running totals that cover
+    every span seen: latency histograms and status counts per (kind, name),
+    LLM tokens, cost, queue time and cache hits per node, and routing
+    decisions per (node, target)."""
+
+    def __init__(self, capacity: int = 10000):
+        self.spans = deque(maxlen=capacity)
+        self.latency = {}
+        self.statuses = {}
+        self.llm = {}
+        self.routes = {}
+        self._lock = threading.Lock()
+
+    def emit(self, span: dict):
+        key = (span["kind"], span["name"])
+        with self._lock:
+            self.spans.append(span)
+            if key not in self.latency:
+                self.latency[key] = Histogram()
+            self.latency[key].observe(span["duration_s"])
+            status = (*key, span["status"])
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+            if span["kind"] == "llm":
+                totals = self.llm.setdefault(span["name"], dict.fromkeys(
+                    ("calls", "cache_hits", "queue_s", "input_tokens", "output_tokens", "cost_usd"), 0))
+                totals["calls"] += 1
+                totals["cache_hits"] += span.get("cache_hit", False)
+                for field in ("queue_s", "input_tokens", "output_tokens", "cost_usd"):
+                    totals[field] += span.get(field) or 0
+            for target in span.get("goto", ()):
+                route = (span["name"], target)
+                self.routes[route] = self.routes.get(route, 0) + 1
+
+    def recent(self, thread_id: str = None, limit: int = 100) -> list:
+        with self._lock:
+            spans = list(self.spans)
+        if thread_id is not None:
+            spans = [s for s in spans if s.get("thread_id") == thread_id]
+        return spans[-limit:] if limit else spans
+
+    def summary(self) -> dict:
+        # percentiles are exact over the spans still in the buffer
+        durations = {}
+        for span in self.recent(limit=None):
+            durations.setdefault(f"{span['kind']}:{span['name']}", []).append(span["duration_s"])
+        with self._lock:
+            llm = {name: dict(totals) for name, totals in self.llm.items()}
+            routes = {f"{source}->{target}": count for (source, target), count in sorted(self.routes.items())}
+        latency = {}
+        for name, values in sorted(durations.items()):
+            values.sort()
+            latency[name] = {"count": len(values), "p50_s": _quantile(values, 0.5),
+                             "p95_s": _quantile(values, 0.95), "p99_s": _quantile(values, 0.99)}
+        return {"latency": latency, "llm": llm, "routes": routes}
+
+    def metrics_text(self) -> str:
+        # Prometheus text exposition format
+        lines = ["# TYPE tradingpal_span_seconds histogram"]
+        with self._lock:
+            for (kind, name), hist in sorted(self.latency.items()):
+                labels = f'kind="{kind}",name="{name}"'
+                cumulative = 0
+                for bound, count in zip(BUCKETS, hist.counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                    lines.append(f'tradingpal_span_seconds_bucket{{{labels},le="{le}"}} {cumulative}')
+                lines.append(f"tradingpal_span_seconds_sum{{{labels}}} {hist.sum:.6f}")
+                lines.append(f"tradingpal_span_seconds_count{{{labels}}} {hist.count}")
+            lines.append("# TYPE tradingpal_spans_total counter")
+            for (kind, name, status), count in sorted(self.statuses.items()):
+                lines.append(f'tradingpal_spans_total{{kind="{kind}",name="{name}",status="{status}"}} {count}')
+            for field, metric in (("calls", "llm_calls_total"), ("cache_hits", "llm_cache_hits_total"),
+                                  ("queue_s", "llm_queue_seconds_total"), ("cost_usd", "llm_cost_usd_total")):
+                lines.append(f"# TYPE tradingpal_{metric} counter")
+                for name, totals in sorted(self.llm.items()):
+                    lines.append(f'tradingpal_{metric}{{node="{name}"}} {totals[field]:g}')
+            lines.append("# TYPE tradingpal_llm_tokens_total counter")
+            for name, totals in sorted(self.llm.items()):
+                for kind in ("input", "output"):
+                    lines.append(f'tradingpal_llm_tokens_total{{node="{name}",type="{kind}"}} {totals[kind + "_tokens"]}')
+            lines.append("# TYPE tradingpal_routes_total counter")
+            for (source, target), count in sorted(self.routes.items()):
+                lines.append(f'tradingpal_routes_total{{node="{source}",target="{target}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+
+class JsonlSink:
+    """Appends spans to a JSONL file from a background thread. emit() only
+    queues the span; the writer wakes every `interval` seconds, or sooner
+    once `batch` spans are waiting, and whatever is left is written at exit."""
+
+    def __init__(self, path: str, interval: float = 1.0, batch: int = 512):
+        self.path = path
+        self.interval = interval
+        self.batch = batch
+        self._pending = deque()
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="telemetry-jsonl", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def emit(self, span: dict):
+        self._pending.append(span)
+        if len(self._pending) >= self.batch:
+            self._wake.set()
+
+    def flush(self):
+        lines = []
+        while self._pending:
+            lines.append(json.dumps(self._pending.popleft(), default=str))
+        if lines:
+            with open(self.path, "a") as f:
+                f.write("\n".join(lines) + "\n")
+
+    def close(self):
+        if not self._closed:
+            self._closed = True
+            self._wake.set()
+            self._thread.join(timeout=5)
+            self.flush()
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except OSError as e:
+                print(f"Telemetry write to {self.path} failed: {e}")
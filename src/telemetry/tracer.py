@@ -0,0 +1,210 @@
+import inspect
+import itertools
+import os
+import time
+from contextvars import ContextVar
+
+from langgraph.errors import GraphBubbleUp
+
+from src.telemetry.sinks import JsonlSink, RingBuffer
+
+# USD per million (input, output) tokens; models not listed get no cost
+PRICES = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1": (2.00, 8.00),
+}
+
+# span of the graph node currently running in this task / thread
+_current = ContextVar("tradingpal_span", default=None)
+_ids = itertools.count(1)
+
+
+def estimate_cost(model: str, input_tokens: int, output_tokens: int) -> float:
+    price = PRICES.get(model)
+    if price is None:
+        return None
+    return (input_tokens * price[0] + output_tokens * price[1]) / 1e6
+
+
+class Tracer:
+    """Turns node runs and LLM calls into span dicts and hands them to the
+    sinks. Every span has kind ("node" or "llm"), name, thread_id, span_id,
+    parent_id, ts (epoch start), duration_s and status ("ok", "error" or
+    "interrupted")."""
+
+    def __init__(self, sinks: list):
+        self.sinks = list(sinks)
+        self.prefix = f"{os.getpid():x}"
+
+    @property
+    def ring(self) -> RingBuffer:
+        return next((s for s in self.sinks if isinstance(s, RingBuffer)), None)
+
+    def start(self, kind: str, name: str, thread_id: str = None, parent: dict = None) -> dict:
+        return {
+            "kind": kind,
+            "name": name,
+            "thread_id": thread_id if thread_id is not None else (parent or {}).get("thread_id"),
+            "span_id": f"{self.prefix}-{next(_ids)}",
+            "parent_id": parent["span_id"] if parent else None,
+            "ts": time.time(),
+            "status": "ok",
+            "_started": time.perf_counter(),
+        }
+
+    def finish(self, span: dict, error: BaseException = None):
+        span["duration_s"] = time.perf_counter() - span.pop("_started")
+        if error is not None:
+            # interrupt() and Command(graph=PARENT) unwind as GraphBubbleUp
+            bubbled = isinstance(error, GraphBubbleUp)
+            span["status"] = "interrupted" if bubbled else "error"
+            if not bubbled:
+                span["error"] = f"{type(error).__name__}: {error}"
+        for sink in self.sinks:
+            sink.emit(span)
+
+    def llm(self, node: str, model: str, started: float, queued: float, response=None,
+            cache_hit: bool = False, error: BaseException = None):
+        """Records one get_llm() call. `started` and `queued` are perf_counter
+        readings from before the cache lookup and after the rate limiter."""
+        span = self.start("llm", node or "default", parent=_current.get())
+        span["ts"] -= span["_started"] - started
+        span["_started"] = started
+        span["model"] = model
+        span["cache_hit"] = cache_hit
+        span["queue_s"] = max(0.0, queued - started) if queued else 0.0
+        usage = getattr(response, "usage_metadata", None) or {}
+        if usage and not cache_hit:
+            span["input_tokens"] = usage.get("input_tokens", 0)
+            span["output_tokens"] = usage.get("output_tokens", 0)
+            span["cost_usd"] = estimate_cost(model, span["input_tokens"], span["output_tokens"])
+        self.finish(span, error)
+
+
+def annotate(**fields):
+    """Adds fields (e.g. router="fast") to the span of the running node; a
+    no-op when telemetry is off."""
+    span = _current.get()
+    if span is not None:
+        span.update(fields)
+
+
+def _goto(result) -> list:
+    goto = getattr(result, "goto", None)
+    if not goto:
+        return None
+    return [g if isinstance(g, str) else getattr(g, "node", str(g)) for g in ([goto] if isinstance(goto, str) else goto)]
+
+
+def traced_node(name: str, fn):
+    """Wraps a graph node so each run becomes a span tied to the run's
+    thread_id, with the node's Command(goto=...) recorded as its routing
+    decision. Returns `fn` itself when telemetry is off, so an untraced graph
+    pays nothing; the choice is made when the graph is compiled."""
+    tracer = get_tracer()
+    if tracer is None:
+        return fn
+    wants_config = "config" in inspect.signature(fn).parameters
+
+    def begin(config):
+        thread_id = ((config or {}).get("configurable") or {}).get("thread_id")
+        span = tracer.start("node", name, thread_id, _current.get())
+        return span, _current.set(span)
+
+    def end(span, token, result=None, error=None):
+        _current.reset(token)
+        goto = _goto(result)
+        if goto:
+            span["goto"] = goto
+        tracer.finish(span, error)
+
+    if inspect.iscoroutinefunction(fn):
+        async def node(state, config):
+            span, token = begin(config)
+            try:
+                result = await (fn(state, config) if wants_config else fn(state))
+            except BaseException as e:
+                end(span, token, error=e)
+                raise
+            end(span, token, result)
+            return result
+    else:
+        def node(state, config):
+            span, token = begin(config)
+            try:
+                result = fn(state, config) if wants_config else fn(state)
+            except BaseException as e:
+                end(span, token, error=e)
+                raise
+            end(span, token, result)
+            return result
+    node.__name__ = name
+    return node
+
+
+_tracer = None
+_configured = False
+
+
+def set_telemetry(enabled: bool = True, path: str = None, capacity: int = 10000, port: int = None):
+    """Turns tracing on (or off) for the process: spans go to an in-memory
+    ring buffer and, with `path`, to a JSONL file; `port` serves /metrics.
+    Graphs compiled earlier keep the setting they were built with."""
+    global _tracer, _configured
+    _tracer = None
+    if enabled or path:
+        sinks = [RingBuffer(capacity)]
+        if path:
+            sinks.append(JsonlSink(path))
+        _tracer = Tracer(sinks)
+        if port:
+            from src.telemetry.server import serve_metrics
+            serve_metrics(port)
+    _configured = True
+    return _tracer
+
+
+def get_tracer():
+    # process-wide; off unless TRADINGPAL_TELEMETRY=1 or
+    # TRADINGPAL_TELEMETRY_PATH is set
+    if not _configured:
+        set_telemetry(
+            os.environ.get("TRADINGPAL_TELEMETRY", "0") not in ("", "0", "false"),
+            os.environ.get("TRADINGPAL_TELEMETRY_PATH") or None,
+            int(os.environ.get("TRADINGPAL_TELEMETRY_SPANS", "10000")),
+            int(os.environ.get("TRADINGPAL_METRICS_PORT", "0")) or None,
+        )
+    return _tracer
+
+
+_stats = {}
+
+
+def register_stats(name: str, fn):
+    """Publishes a component's counters alongside the spans: fn() returns a
+    dict of numbers, served as tradingpal_<name>_<key> gauges in /metrics
+    and under `name` in /summary. Registering a name again replaces it."""
+    _stats[name] = fn
+
+
+def stats() -> dict:
+    return {name: fn() for name, fn in sorted(_stats.items())}
+
+
+def summary() -> dict:
+    tracer = get_tracer()
+    return {**tracer.ring.summary(), **stats()} if tracer is not None else {}
+
+
+def metrics_text() -> str:
+    tracer = get_tracer()
+    if tracer is None:
+        return ""
+    lines = []
+    for name, values in stats().items():
+        for key, value in values.items():
+            lines.append(f"# TYPE tradingpal_{name}_{key} gauge")
+            lines.append(f"tradingpal_{name}_{key} {value:g}")
+    return tracer.ring.metrics_text() + "".join(line + "\n" for line in lines)
@@ -1,9 +1,14 @@
 import getpass
 import os
+import sys
 from dotenv import load_dotenv
 
-dotenv_path = os.path.join(os.getcwd(), '.env')
-load_dotenv(dotenv_path)
 
-if not os.environ.get("OPENAI_API_KEY"):
-  os.environ["OPENAI_API_KEY"] = getpass.getpass("Enter API key for OpenAI: ")
\ No newline at end of file
+def load_env(prompt: bool = True):
+    # Called by the entry points (src/main.py, src/batch.py) rather than on
+    # import, so importing the graph never reads files or blocks on input.
+    dotenv_path = os.path.join(os.getcwd(), '.env')
+    load_dotenv(dotenv_path)
+
+    if prompt and not os.environ.get("OPENAI_API_KEY") and sys.stdin.isatty():
+        os.environ["OPENAI_API_KEY"] = getpass.getpass("Enter API key for OpenAI: ")
@@ -0,0 +1,256 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, convert_to_messages
+from langchain_core.prompt_values import PromptValue
+from langchain_core.runnables import Runnable
+
+from src.telemetry.tracer import get_tracer
+from src.utils.context import count_text_tokens
+from src.utils.ratelimit import get_rate_limiter
+
+# Seconds a cached answer stays valid, per graph node. Intraday answers go
+# stale within a minute; a compiled strategy is good for a day.
+DEFAULT_TTLS = {
+    "chatbot": 300,
+    "router": 300,
+    "premarket": 900,
+    "intraday": 30,
+    "postmarket": 3600,
+    "strategy": 86400,
+    "summary": 3600,
+}
+DEFAULT_TTL = 300
+
+
+def _normalize(text) -> str:
+    if isinstance(text, str):
+        return " ".join(text.split())
+    return json.dumps(text, sort_keys=True)
+
+
+def _to_messages(input) -> list:
+    if isinstance(input, PromptValue):
+        return input.to_messages()
+    if isinstance(input, str):
+        return [HumanMessage(input)]
+    return convert_to_messages(input)
+
+
+def make_key(input, params: dict) -> str:
+    messages = [(m.type, _normalize(m.content)) for m in _to_messages(input)]
+    payload = json.dumps({"params": params, "messages": messages}, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ResponseCache:
+    """Two-tier cache: an in-memory LRU in front of an optional SQLite file."""
+
+    def __init__(self, max_entries: int = 2048, max_bytes: int = 32 * 1024 * 1024,
+                 db_path: str = None, max_db_entries: int = 100_000):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_db_entries = max_db_entries
+        self._mem = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0, "disk_evictions": 0, "expired": 0}
+
+        self._db = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL NOT NULL, created REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS llm_cache_created ON llm_cache(created)")
+            self._db.execute("DELETE FROM llm_cache WHERE expires < ?", (time.time(),))
+            self._db.commit()
+            self._db_rows = self._db.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+
+    def get(self, key: str):
+        now = time.time()
+        with self._lock:
+            entry = self._mem.get(key)
+            if entry is not None:
+                expires, value = entry
+                if expires >= now:
+                    self._mem.move_to_end(key)
+                    self.stats["hits"] += 1
+                    return value
+                self._drop(key)
+                self.stats["expired"] += 1
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, expires FROM llm_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and row[1] >= now:
+                    self.stats["disk_hits"] += 1
+                    self._store(key, row[0], row[1])
+                    return row[0]
+
+            self.stats["misses"] += 1
+            return None
+
+    def put(self, key: str, value: str, ttl: float):
+        now = time.time()
+        expires = now + ttl
+        with self._lock:
+            self._store(key, value, expires)
+            if self._db is not None:
+                exists = self._db.execute("SELECT 1 FROM llm_cache WHERE key = ?", (key,)).fetchone()
+                self._db.execute(
+                    "INSERT OR REPLACE INTO llm_cache (key, value, expires, created) VALUES (?, ?, ?, ?)",
+                    (key, value, expires, now),
+                )
+                self._db_rows += exists is None
+                if self._db_rows > self.max_db_entries:
+                    excess = self._db_rows - self.max_db_entries
+                    self._db.execute(
+                        "DELETE FROM llm_cache WHERE key IN "
+                        "(SELECT key FROM llm_cache ORDER BY created LIMIT ?)", (excess,)
+                    )
+                    self.stats["disk_evictions"] += excess
+                    self._db_rows = self.max_db_entries
+                self._db.commit()
+
+    def clear(self):
+        with self._lock:
+            self._mem.clear()
+            self._bytes = 0
+            if self._db is not None:
+                self._db.execute("DELETE FROM llm_cache")
+                self._db.commit()
+                self._db_rows = 0
+
+    def info(self) -> dict:
+        lookups = self.stats["hits"] + self.stats["disk_hits"] + self.stats["misses"]
+        hits = self.stats["hits"] + self.stats["disk_hits"]
+        return {
+            **self.stats,
+            "entries": len(self._mem),
+            "bytes": self._bytes,
+            "hit_rate": hits / lookups if lookups else 0.0,
+        }
+
+    # callers hold self._lock
+    def _store(self, key, value, expires):
+        if key in self._mem:
+            self._drop(key)
+        self._mem[key] = (expires, value)
+        self._bytes += len(value)
+        while self._mem and (len(self._mem) > self.max_entries or self._bytes > self.max_bytes):
+            oldest = next(iter(self._mem))
+            self._drop(oldest)
+            self.stats["evictions"] += 1
+
+    def _drop(self, key):
+        _, value = self._mem.pop(key)
+        self._bytes -= len(value)
+
+
+# completion tokens reserved against the TPM budget before a call; the real
+# usage is settled afterwards
+COMPLETION_ESTIMATE = 512
+
+
+class CachedChatModel(Runnable):
+    """Wraps the shared chat model and answers byte-identical prompts from the
+    cache (`cache=None` disables caching). Misses wait for the process-wide
+    rate limiter, then go to the model with the caller's config, so callbacks
+    and streaming still work. Each call is recorded as an "llm" span when
+    telemetry is on (see src/telemetry)."""
+
+    def __init__(self, llm, cache: ResponseCache = None, node: str = None, ttl: float = None):
+        self.llm = llm
+        self.cache = cache
+        self.node = node
+        self.ttl = ttl if ttl is not None else DEFAULT_TTLS.get(node, DEFAULT_TTL)
+        self.params = {
+            "model": getattr(llm, "model_name", None) or getattr(llm, "model", None),
+            "temperature": getattr(llm, "temperature", None),
+        }
+
+    def _hit(self, content: str) -> AIMessage:
+        return AIMessage(content=content, response_metadata={"cache_hit": True})
+
+    def _lookup(self, input, kwargs):
+        if self.cache is None:
+            return None, None
+        key = make_key(input, {**self.params, **kwargs})
+        return key, self.cache.get(key)
+
+    def _estimate(self, input) -> int:
+        text = "\n".join(_normalize(m.content) for m in _to_messages(input))
+        return count_text_tokens(text) + COMPLETION_ESTIMATE
+
+    def _store(self, key, response, limiter, estimate):
+        if limiter is not None:
+            usage = getattr(response, "usage_metadata", None) or {}
+            limiter.settle(estimate, usage.get("total_tokens", 0))
+        if key is not None and isinstance(response.content, str) and response.content:
+            self.cache.put(key, response.content, self.ttl)
+
+    def _trace(self, started, queued=None, response=None, cache_hit=False, error=None):
+        tracer = get_tracer()
+        if tracer is not None:
+            tracer.llm(self.node, self.params["model"], started, queued, response, cache_hit, error)
+
+    def invoke(self, input, config=None, **kwargs) -> BaseMessage:
+        started = time.perf_counter()
+        key, content = self._lookup(input, kwargs)
+        if content is not None:
+            response = self._hit(content)
+            self._trace(started, response=response, cache_hit=True)
+            return response
+        limiter = get_rate_limiter()
+        estimate = 0
+        if limiter is not None:
+            estimate = self._estimate(input)
+            limiter.acquire(estimate)
+        queued = time.perf_counter()
+        try:
+            response = self.llm.invoke(input, config, **kwargs)
+        except Exception as e:
+            self._trace(started, queued, error=e)
+            raise
+        self._store(key, response, limiter, estimate)
+        self._trace(started, queued, response)
+        return response
+
+    async def ainvoke(self, input, config=None, **kwargs) -> BaseMessage:
+        started = time.perf_counter()
+        key, content = self._lookup(input, kwargs)
+        if content is not None:
+            response = self._hit(content)
+            self._trace(started, response=response, cache_hit=True)
+            return response
+        limiter = get_rate_limiter()
+        estimate = 0
+        if limiter is not None:
+            estimate = self._estimate(input)
+            await limiter.aacquire(estimate)
+        queued = time.perf_counter()
+        try:
+            response = await self.llm.ainvoke(input, config, **kwargs)
+        except Exception as e:
+            self._trace(started, queued, error=e)
+            raise
+        self._store(key, response, limiter, estimate)
+        self._trace(started, queued, response)
+        return response
+
+def cache_from_env() -> ResponseCache:
+    return ResponseCache(
+        max_entries=int(os.environ.get("TRADINGPAL_CACHE_ENTRIES", "2048")),
+        max_bytes=int(os.environ.get("TRADINGPAL_CACHE_BYTES", str(32 * 1024 * 1024))),
+        db_path=os.environ.get("TRADINGPAL_CACHE_DB") or None,
+        max_db_entries=int(os.environ.get("TRADINGPAL_CACHE_DB_ENTRIES", "100000")),
+    )
@@ -0,0 +1,365 @@
+import asyncio
+import os
+import random
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+from langgraph.checkpoint.memory import MemorySaver
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    parent_checkpoint_id TEXT,
+    type TEXT,
+    checkpoint BLOB,
+    metadata_type TEXT,
+    metadata BLOB,
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+);
+CREATE TABLE IF NOT EXISTS writes (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    channel TEXT NOT NULL,
+    type TEXT,
+    value BLOB,
+    task_path TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+);
+CREATE TABLE IF NOT EXISTS threads (
+    thread_id TEXT PRIMARY KEY,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS threads_last_access ON threads(last_access);
+"""
+
+
+class SqliteCheckpointer(BaseCheckpointSaver):
+    """File-backed checkpointer with bounded growth.
+
+    - keeps at most `max_checkpoints` per thread/namespace (older ones and
+      their pending writes are dropped on every put),
+    - evicts threads idle for longer than `idle_ttl` seconds,
+    - compacts in a background thread every `compact_interval` seconds,
+    - holds only the latest checkpoint of up to `max_cached_threads` threads
+      (and at most `max_cached_bytes` of serialized data) in memory, plus a
+      SQLite page cache of `cache_kib` KiB.
+    """
+
+    def __init__(self, path: str, *, max_checkpoints: int = 20, idle_ttl: float = 7 * 24 * 3600,
+                 compact_interval: float = 300, max_cached_threads: int = 256,
+                 max_cached_bytes: int = 64 * 1024 * 1024, cache_kib: int = 8 * 1024, serde=None):
+        super().__init__(serde=serde)
+        self.path = path
+        self.max_checkpoints = max(2, max_checkpoints)
+        self.idle_ttl = idle_ttl
+        self.max_cached_threads = max_cached_threads
+        self.max_cached_bytes = max_cached_bytes
+        self._latest_bytes = 0
+        self._lock = threading.RLock()
+        self._latest = OrderedDict()
+
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(f"PRAGMA cache_size=-{int(cache_kib)}")
+        self.conn.executescript(_SCHEMA)
+        self.conn.commit()
+
+        self._stop = threading.Event()
+        self._compactor = None
+        if compact_interval:
+            self._compactor = threading.Thread(
+                target=self._compact_loop, args=(compact_interval,), name="checkpoint-compactor", daemon=True
+            )
+            self._compactor.start()
+
+    # -- reads ---------------------------------------------------------------
+
+    def get_tuple(self, config) -> CheckpointTuple | None:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = get_checkpoint_id(config)
+        with self._lock:
+            if not checkpoint_id:
+                # cache raw rows, not tuples, so callers never share mutable state
+                cached = self._latest.get((thread_id, checkpoint_ns))
+                if cached is not None:
+                    self._latest.move_to_end((thread_id, checkpoint_ns))
+                    return self._to_tuple(thread_id, checkpoint_ns, cached[0], cached[1])
+                row = self.conn.execute(
+                    "SELECT checkpoint_id, parent_checkpoint_id, type, checkpoint, metadata_type, metadata "
+                    "FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? "
+                    "ORDER BY checkpoint_id DESC LIMIT 1",
+                    (thread_id, checkpoint_ns),
+                ).fetchone()
+            else:
+                row = self.conn.execute(
+                    "SELECT checkpoint_id, parent_checkpoint_id, type, checkpoint, metadata_type, metadata "
+                    "FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                    (thread_id, checkpoint_ns, checkpoint_id),
+                ).fetchone()
+            if row is None:
+                return None
+            writes = self._writes(thread_id, checkpoint_ns, row[0])
+            if not checkpoint_id:
+                self._remember(thread_id, checkpoint_ns, (row, writes))
+            return self._to_tuple(thread_id, checkpoint_ns, row, writes)
+
+    def list(self, config, *, filter=None, before=None, limit=None):
+        query = (
+            "SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, type, checkpoint, "
+            "metadata_type, metadata FROM checkpoints"
+        )
+        where, params = [], []
+        if config is not None:
+            where.append("thread_id = ?")
+            params.append(config["configurable"]["thread_id"])
+            if "checkpoint_ns" in config["configurable"]:
+                where.append("checkpoint_ns = ?")
+                params.append(config["configurable"]["checkpoint_ns"])
+            if get_checkpoint_id(config):
+                where.append("checkpoint_id = ?")
+                params.append(get_checkpoint_id(config))
+        if before is not None and get_checkpoint_id(before):
+            where.append("checkpoint_id < ?")
+            params.append(get_checkpoint_id(before))
+        if where:
+            query += " WHERE " + " AND ".join(where)
+        query += " ORDER BY checkpoint_id DESC"
+
+        with self._lock:
+            rows = self.conn.execute(query, params).fetchall()
+            results = []
+            for thread_id, checkpoint_ns, *row in rows:
+                item = self._to_tuple(thread_id, checkpoint_ns, row, self._writes(thread_id, checkpoint_ns, row[0]))
+                if filter and not all(item.metadata.get(k) == v for k, v in filter.items()):
+                    continue
+                results.append(item)
+                if limit is not None and len(results) >= limit:
+                    break
+        yield from results
+
+    # -- writes --------------------------------------------------------------
+
+    def put(self, config, checkpoint: Checkpoint, metadata: CheckpointMetadata,
+            new_versions: ChannelVersions):
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        parent_id = config["configurable"].get("checkpoint_id")
+        type_, blob = self.serde.dumps_typed(checkpoint)
+        meta_type, meta_blob = self.serde.dumps_typed(get_checkpoint_metadata(config, metadata))
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (thread_id, checkpoint_ns, checkpoint["id"], parent_id, type_, blob, meta_type, meta_blob),
+            )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO threads VALUES (?, ?)", (thread_id, time.time())
+            )
+            self._trim(thread_id, checkpoint_ns)
+            self.conn.commit()
+            self._forget((thread_id, checkpoint_ns))
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def put_writes(self, config, writes, task_id: str, task_path: str = "") -> None:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        with self._lock:
+            for idx, (channel, value) in enumerate(writes):
+                idx = WRITES_IDX_MAP.get(channel, idx)
+                type_, blob = self.serde.dumps_typed(value)
+                # regular writes are idempotent; special channels (errors,
+                # interrupts) replace the previous value
+                verb = "INSERT OR REPLACE" if idx < 0 else "INSERT OR IGNORE"
+                self.conn.execute(
+                    f"{verb} INTO writes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (thread_id, checkpoint_ns, checkpoint_id, task_id, idx, channel, type_, blob, task_path),
+                )
+            self.conn.commit()
+            self._forget((thread_id, checkpoint_ns))
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self._lock:
+            self._delete_threads([thread_id])
+            self.conn.commit()
+
+    def get_next_version(self, current, channel) -> str:
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        return f"{current_v + 1:032}.{random.random():016}"
+
+    # -- async ---------------------------------------------------------------
+
+    async def aget_tuple(self, config) -> CheckpointTuple | None:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(self, config, *, filter=None, before=None, limit=None):
+        items = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for item in items:
+            yield item
+
+    async def aput(self, config, checkpoint, metadata, new_versions):
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(self, config, writes, task_id: str, task_path: str = "") -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+    # -- maintenance ---------------------------------------------------------
+
+    def compact(self) -> dict:
+        """Evict idle threads, re-apply retention everywhere and reclaim space."""
+        with self._lock:
+            cutoff = time.time() - self.idle_ttl
+            idle = [r[0] for r in self.conn.execute(
+                "SELECT thread_id FROM threads WHERE last_access < ?", (cutoff,)
+            )]
+            self._delete_threads(idle)
+            for thread_id, checkpoint_ns in self.conn.execute(
+                "SELECT DISTINCT thread_id, checkpoint_ns FROM checkpoints"
+            ).fetchall():
+                self._trim(thread_id, checkpoint_ns)
+            self.conn.commit()
+            self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return {"evicted_threads": len(idle)}
+
+    def close(self):
+        self._stop.set()
+        if self._compactor is not None:
+            self._compactor.join()
+        with self._lock:
+            self.conn.close()
+
+    def _compact_loop(self, interval: float):
+        while not self._stop.wait(interval):
+            try:
+                self.compact()
+            except sqlite3.Error as e:
+                print(f"Checkpoint compaction failed: {e}")
+
+    # callers hold self._lock
+    def _trim(self, thread_id, checkpoint_ns):
+        row = self.conn.execute(
+            "SELECT checkpoint_id FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? "
+            "ORDER BY checkpoint_id DESC LIMIT 1 OFFSET ?",
+            (thread_id, checkpoint_ns, self.max_checkpoints - 1),
+        ).fetchone()
+        if row is None:
+            return
+        for table in ("checkpoints", "writes"):
+            self.conn.execute(
+                f"DELETE FROM {table} WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id < ?",
+                (thread_id, checkpoint_ns, row[0]),
+            )
+
+    def _delete_threads(self, thread_ids):
+        for thread_id in thread_ids:
+            for table in ("checkpoints", "writes", "threads"):
+                self.conn.execute(f"DELETE FROM {table} WHERE thread_id = ?", (thread_id,))
+            for key in [k for k in self._latest if k[0] == thread_id]:
+                self._forget(key)
+
+    def _remember(self, thread_id, checkpoint_ns, rows):
+        row, writes = rows
+        size = len(row[3] or b"") + sum(len(w[3] or b"") for w in writes)
+        self._forget((thread_id, checkpoint_ns))
+        self._latest[(thread_id, checkpoint_ns)] = (row, writes, size)
+        self._latest_bytes += size
+        while self._latest and (len(self._latest) > self.max_cached_threads
+                                or self._latest_bytes > self.max_cached_bytes):
+            self._forget(next(iter(self._latest)))
+
+    def _forget(self, key):
+        cached = self._latest.pop(key, None)
+        if cached is not None:
+            self._latest_bytes -= cached[2]
+
+    def _writes(self, thread_id, checkpoint_ns, checkpoint_id):
+        return self.conn.execute(
+            "SELECT task_id, channel, type, value FROM writes "
+            "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ? ORDER BY task_id, idx",
+            (thread_id, checkpoint_ns, checkpoint_id),
+        ).fetchall()
+
+    def _to_tuple(self, thread_id, checkpoint_ns, row, writes) -> CheckpointTuple:
+        checkpoint_id, parent_id, type_, blob, meta_type, meta_blob = row
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": checkpoint_id,
+                }
+            },
+            checkpoint=self.serde.loads_typed((type_, blob)),
+            metadata=self.serde.loads_typed((meta_type, meta_blob)),
+            parent_config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": parent_id,
+                }
+            } if parent_id else None,
+            pending_writes=[
+                (task_id, channel, self.serde.loads_typed((t, v)))
+                for task_id, channel, t, v in writes
+            ],
+        )
+
+
+@lru_cache(maxsize=None)
+def _sqlite_checkpointer(path: str) -> SqliteCheckpointer:
+    return SqliteCheckpointer(
+        path,
+        max_checkpoints=int(os.environ.get("TRADINGPAL_CHECKPOINT_RETAIN", "20")),
+        idle_ttl=float(os.environ.get("TRADINGPAL_CHECKPOINT_IDLE_TTL", str(7 * 24 * 3600))),
+        max_cached_threads=int(os.environ.get("TRADINGPAL_CHECKPOINT_CACHED_THREADS", "256")),
+        max_cached_bytes=int(os.environ.get("TRADINGPAL_CHECKPOINT_CACHED_BYTES", str(64 * 1024 * 1024))),
+    )
+
+
+def get_checkpointer(kind=None):
+    """Returns a checkpointer for trading_pal(): an instance is passed through,
+    "memory" gives a MemorySaver and "sqlite" the shared file-backed saver at
+    TRADINGPAL_CHECKPOINT_DB. Defaults to TRADINGPAL_CHECKPOINTER or "memory"."""
+    if isinstance(kind, BaseCheckpointSaver):
+        return kind
+    kind = kind or os.environ.get("TRADINGPAL_CHECKPOINTER", "memory")
+    if kind == "memory":
+        return MemorySaver()
+    if kind == "sqlite":
+        return _sqlite_checkpointer(os.environ.get("TRADINGPAL_CHECKPOINT_DB", "tradingpal_checkpoints.db"))
+    raise ValueError(f"Unknown checkpointer: {kind}")
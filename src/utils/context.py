@@ -0,0 +1,106 @@
+import os
+from collections import OrderedDict
+from functools import lru_cache
+
+from langchain_core.messages import SystemMessage
+
+# Budget for the conversation part of a prompt (summary + recent turns), on
+# top of whatever fixed instructions a node adds.
+DEFAULT_MAX_TOKENS = int(os.environ.get("TRADINGPAL_CONTEXT_TOKENS", "3000"))
+# Number of most recent turns (a human message and the replies to it) that
+# are kept verbatim; older turns are folded into the rolling summary.
+DEFAULT_MAX_TURNS = int(os.environ.get("TRADINGPAL_CONTEXT_TURNS", "6"))
+
+_MESSAGE_OVERHEAD = 4  # role and separators, as counted by OpenAI chat models
+_token_cache = OrderedDict()
+_TOKEN_CACHE_SIZE = 50_000
+
+
+@lru_cache(maxsize=None)
+def _encoder():
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("o200k_base")
+    except Exception:
+        # tiktoken missing, or its encoding can't be fetched (offline hosts);
+        # fall back to the length estimate rather than failing the node
+        return None
+
+
+def count_text_tokens(text: str) -> int:
+    encoder = _encoder()
+    if encoder is None:
+        return len(text) // 4 + 1
+    return len(encoder.encode(text, disallowed_special=()))
+
+
+def count_tokens(message) -> int:
+    content = message.content if isinstance(message.content, str) else str(message.content)
+    # messages in state carry stable ids, so each one is tokenized only once
+    key = (message.id, len(content), hash(content))
+    tokens = _token_cache.get(key)
+    if tokens is None:
+        tokens = count_text_tokens(content) + _MESSAGE_OVERHEAD
+        _token_cache[key] = tokens
+        if len(_token_cache) > _TOKEN_CACHE_SIZE:
+            _token_cache.popitem(last=False)
+    return tokens
+
+
+def split_turns(messages: list) -> list:
+    turns = []
+    for message in messages:
+        if message.type == "human" or not turns:
+            turns.append([])
+        turns[-1].append(message)
+    return turns
+
+
+def current_question(state) -> str:
+    return next((m.content for m in reversed(state["messages"]) if m.type == "human"), "")
+
+
+def summary_message(state):
+    summary = state.get("summary")
+    if not summary:
+        return None
+    return SystemMessage(f"Summary of the earlier conversation:\n{summary}")
+
+
+def window_start(state, max_tokens: int = None, max_turns: int = None) -> int:
+    """Index of the first message build_context() keeps verbatim: as many of
+    the last `max_turns` turns as fit in `max_tokens` next to the summary.
+    Everything before it belongs in the rolling summary."""
+    max_tokens = DEFAULT_MAX_TOKENS if max_tokens is None else max_tokens
+    max_turns = DEFAULT_MAX_TURNS if max_turns is None else max_turns
+    summary = summary_message(state)
+    if summary is not None:
+        max_tokens -= count_text_tokens(summary.content) + _MESSAGE_OVERHEAD
+
+    messages = state["messages"]
+    # walk back a whole turn at a time so the window never opens mid-turn
+    start = len(messages)
+    used = 0
+    turns = 0
+    for i in range(len(messages) - 1, -1, -1):
+        used += count_tokens(messages[i])
+        if messages[i].type != "human":
+            continue
+        if used > max_tokens and turns > 0:
+            break
+        start = i
+        turns += 1
+        if turns >= max_turns:
+            break
+    return start
+
+
+def build_context(state, instructions: str = None, max_tokens: int = None, max_turns: int = None) -> list:
+    """Prompt view of the conversation: optional instructions, the rolling
+    summary, then the turns from window_start(). The latest human message is
+    always included."""
+    head = [SystemMessage(instructions)] if instructions else []
+    summary = summary_message(state)
+    if summary is not None:
+        head.append(summary)
+    return head + state["messages"][window_start(state, max_tokens, max_turns):]
@@ -1,3 +1,44 @@
+import os
+from functools import lru_cache
 from langchain.chat_models import init_chat_model
-def get_llm():
-    return init_chat_model("gpt-4o-mini", model_provider="openai")
\ No newline at end of file
+from src.utils.cache import CachedChatModel, cache_from_env
+from src.telemetry import register_stats
+
+
+_client = None
+
+
+# One client per process: every node shares the same underlying HTTP
+# connection pool (sync and async) instead of building a new client per call.
+def get_client():
+    global _client
+    if _client is None:
+        _client = init_chat_model("gpt-4o-mini", model_provider="openai")
+    return _client
+
+
+def set_client(client):
+    """Swaps the chat model behind every get_llm() wrapper, e.g. for the
+    offline fake in benchmarks/fake_llm.py. None restores the default."""
+    global _client
+    _client = client
+    get_llm.cache_clear()
+
+
+@lru_cache(maxsize=None)
+def get_cache():
+    cache = cache_from_env()
+    # hits, misses, evictions and size in /metrics and /summary
+    register_stats("cache", cache.info)
+    return cache
+
+
+# `node` selects the cache TTL (see src/utils/cache.DEFAULT_TTLS); override one
+# with e.g. TRADINGPAL_CACHE_TTL_INTRADAY=10, or disable with TRADINGPAL_CACHE=0.
+# Provider calls also go through the RPM/TPM limiter in src/utils/ratelimit.py.
+@lru_cache(maxsize=None)
+def get_llm(node: str = None):
+    if os.environ.get("TRADINGPAL_CACHE", "1") == "0":
+        return CachedChatModel(get_client(), None, node=node)
+    ttl = os.environ.get(f"TRADINGPAL_CACHE_TTL_{(node or '').upper()}")
+    return CachedChatModel(get_client(), get_cache(), node=node, ttl=float(ttl) if ttl else None)
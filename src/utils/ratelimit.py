@@ -0,0 +1,86 @@
+import asyncio
+import os
+import threading
+import time
+
+
+class TokenBucket:
+    """Refills `per_minute` units evenly over a minute, holding at most one
+    minute's worth. The balance may go negative when usage is reconciled
+    after a call, which delays later callers instead of overshooting."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _take(self, amount: float) -> float:
+        # returns 0 once `amount` is taken, otherwise seconds to wait first
+        amount = min(amount, self.capacity)
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= amount:
+                self.tokens -= amount
+                return 0.0
+            return (amount - self.tokens) / self.rate
+
+    def adjust(self, amount: float):
+        with self._lock:
+            self.tokens -= amount
+
+    def acquire(self, amount: float = 1):
+        while (wait := self._take(amount)) > 0:
+            time.sleep(wait)
+
+    async def aacquire(self, amount: float = 1):
+        while (wait := self._take(amount)) > 0:
+            await asyncio.sleep(wait)
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute budgets for the provider.
+    Callers reserve an estimate up front and settle the actual usage after."""
+
+    def __init__(self, rpm: float = None, tpm: float = None):
+        self.requests = TokenBucket(rpm) if rpm else None
+        self.tokens = TokenBucket(tpm) if tpm else None
+
+    def acquire(self, tokens: int):
+        if self.requests:
+            self.requests.acquire(1)
+        if self.tokens:
+            self.tokens.acquire(tokens)
+
+    async def aacquire(self, tokens: int):
+        if self.requests:
+            await self.requests.aacquire(1)
+        if self.tokens:
+            await self.tokens.aacquire(tokens)
+
+    def settle(self, estimated: int, actual: int):
+        if self.tokens and actual:
+            self.tokens.adjust(actual - estimated)
+
+
+_limiter = None
+_configured = False
+
+
+def set_rate_limits(rpm: float = None, tpm: float = None):
+    global _limiter, _configured
+    _limiter = RateLimiter(rpm, tpm) if (rpm or tpm) else None
+    _configured = True
+
+
+def get_rate_limiter():
+    # process-wide; defaults to TRADINGPAL_RPM / TRADINGPAL_TPM, off when unset
+    if not _configured:
+        set_rate_limits(
+            float(os.environ.get("TRADINGPAL_RPM", "0")) or None,
+            float(os.environ.get("TRADINGPAL_TPM", "0")) or None,
+        )
+    return _limiter
@@ -0,0 +1,48 @@
+# Trade-file parsing and the summary it feeds the postmarket expert.
+#   python -m pytest tests
+import pytest
+
+from src.analytics import analyze_trades
+
+ROWS = [
+    "fees,symbol,side,qty,entry_time,exit_time,entry_price,exit_price,expected_exit_price",
+    ",AAPL,buy,10,0,600,100,101,",
+    "1,MSFT,sell,5,0,7200,200,190,191",
+    ",NVDA,buy,1,0,60,50,49,",
+]
+
+
+@pytest.mark.parametrize("newline,tail", [("\n", "\n"), ("\r\n", "\r\n"), ("\n", "")])
+def test_empty_first_and_last_fields_with_any_line_ending(tmp_path, newline, tail):
+    path = tmp_path / "trades.csv"
+    path.write_bytes((newline.join(ROWS) + tail).encode())
+    summary = analyze_trades(str(path)).summary()
+    assert summary["trades"] == 3
+    # AAPL +10, MSFT short +50 less a 1.00 fee, NVDA -1
+    assert summary["net_pnl"] == 58.0
+    # only MSFT has an expected exit: covered at 190 against 191, i.e. 1.00 better on 5 shares
+    assert summary["slippage_cost"] == -5.0
+    assert summary["slippage_per_trade"] == -5.0
+
+
+def test_iso_timestamps_and_chunking(tmp_path):
+    path = tmp_path / "trades.csv"
+    path.write_text(
+        "symbol,side,qty,entry_time,exit_time,entry_price,exit_price\n"
+        "AAPL,buy,10,2025-01-02 09:30:00,2025-01-02 09:45:00,100,99\n"
+        "AAPL,buy,10,2025-01-02 10:00:00,2025-01-02 12:00:00,99,103\n"
+        "MSFT,buy,1,2025-01-02 10:00:00,2025-01-03 10:00:00,400,390\n"
+    )
+    summary = analyze_trades(str(path), chunk_rows=2).summary()
+    assert summary["net_pnl"] == 20.0
+    assert summary["max_drawdown"] == 10.0
+    assert summary["hold_distribution"]["15-30m"] == 1
+    assert summary["hold_distribution"]["1-4h"] == 1
+    assert summary["hold_distribution"]["1d-1w"] == 1
+
+
+def test_missing_columns(tmp_path):
+    path = tmp_path / "trades.csv"
+    path.write_text("symbol,qty\nAAPL,1\n")
+    with pytest.raises(ValueError, match="missing columns"):
+        analyze_trades(str(path))
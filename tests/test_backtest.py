@@ -0,0 +1,106 @@
+# Checks the vectorized fill logic in src/backtest/engine.simulate against a
+# straightforward bar-by-bar loop over the same rules.
+#   python -m pytest tests
+import itertools
+
+import numpy as np
+import pytest
+
+from src.backtest.engine import Strategy, simulate
+
+
+def reference(bars: dict, entry: np.ndarray, exit: np.ndarray, size: float, stop_loss: float, take_profit: float):
+    """Long-only, one position at a time: fill at the next open after an
+    entry signal; leave at the next open after an exit signal raised on or
+    after the fill bar, or intrabar at the stop / target (stop first, gaps
+    fill at the open); close out at the last close."""
+    open_, high, low, close = (bars[k] for k in ("open", "high", "low", "close"))
+    n = len(close)
+    trades, cash = [], 1.0
+    position = None  # (fill bar, fill price, stop, target)
+    pending = False
+    for t in range(n):
+        if position is None and pending:
+            pending = False
+            if open_[t] > 0:
+                price = open_[t]
+                position = (t, price, price * (1 - stop_loss) if stop_loss else None,
+                            price * (1 + take_profit) if take_profit else None)
+        if position is not None:
+            j, price, stop, target = position
+            exit_price = None
+            if t > j and exit is not None and exit[t - 1]:
+                exit_price = open_[t]
+            elif stop is not None and low[t] <= stop:
+                exit_price = min(open_[t], stop) if t > j else stop
+            elif target is not None and high[t] >= target:
+                exit_price = max(open_[t], target) if t > j else target
+            elif t == n - 1:
+                exit_price = close[t]
+            if exit_price is not None:
+                ret = exit_price / price - 1
+                trades.append((j, t, price, exit_price, ret))
+                cash *= 1 + size * ret
+                position = None
+        if position is None and t < n - 1 and entry[t]:
+            pending = True
+    return np.array(trades, dtype=np.float64).reshape(-1, 5), cash
+
+
+def random_bars(rng, n: int) -> dict:
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    open_ = np.concatenate([[100.0], close[:-1]]) * np.exp(rng.normal(0, 0.004, n))  # overnight gaps
+    high = np.maximum(open_, close) * np.exp(np.abs(rng.normal(0, 0.006, n)))
+    low = np.minimum(open_, close) * np.exp(-np.abs(rng.normal(0, 0.006, n)))
+    return {"timestamp": np.arange(n) * 3600.0, "open": open_, "high": high, "low": low, "close": close}
+
+
+@pytest.mark.parametrize("seed,stop_loss,take_profit,with_exit", [
+    (seed, stop_loss, take_profit, with_exit)
+    for seed, (stop_loss, take_profit), with_exit in itertools.product(
+        range(4), [(None, None), (0.01, None), (None, 0.015), (0.01, 0.015), (0.003, 0.003)], [True, False])
+])
+def test_fills_match_per_bar_reference(seed, stop_loss, take_profit, with_exit):
+    rng = np.random.default_rng(seed)
+    bars = random_bars(rng, 2000)
+    entry = rng.random(2000) < 0.05
+    exit = rng.random(2000) < 0.05 if with_exit else None
+    strategy = Strategy(None, None, 0.5, stop_loss, take_profit)
+
+    equity, trades = simulate(bars, strategy, entry, exit)
+    expected, cash = reference(bars, entry, exit, 0.5, stop_loss, take_profit)
+
+    assert len(trades) == len(expected) > 0
+    np.testing.assert_array_equal(trades[:, :2], expected[:, :2])
+    np.testing.assert_allclose(trades[:, 2:], expected[:, 2:], rtol=1e-12)
+    assert equity[-1] == pytest.approx(cash, rel=1e-12)
+
+
+def test_entry_signal_on_last_bar_never_fills():
+    bars = random_bars(np.random.default_rng(0), 50)
+    entry = np.zeros(50, dtype=bool)
+    entry[-1] = True
+    equity, trades = simulate(bars, Strategy(None), entry)
+    assert len(trades) == 0
+    assert (equity == 1.0).all()
+
+
+def test_iso_and_epoch_csv_load_the_same_bars(tmp_path):
+    from src.backtest.data import load_bars
+
+    bars = random_bars(np.random.default_rng(1), 30)
+    stamps = 1.7e9 + bars["timestamp"]
+    iso = np.datetime_as_string(stamps.astype("datetime64[s]"))
+    epoch_path, iso_path = tmp_path / "epoch.csv", tmp_path / "iso.csv"
+    epoch_path.write_text("timestamp,open,high,low,close\n" + "".join(
+        f"{t:.0f},{o:.17g},{h:.17g},{l:.17g},{c:.17g}\n"
+        for t, o, h, l, c in zip(stamps, bars["open"], bars["high"], bars["low"], bars["close"])))
+    # reordered columns, an alias and ISO dates, newest first
+    iso_path.write_text("close,date,open,low,high\n" + "".join(
+        f"{c:.17g},{d},{o:.17g},{l:.17g},{h:.17g}\n"
+        for c, d, o, l, h in list(zip(bars["close"], iso, bars["open"], bars["low"], bars["high"]))[::-1]))
+
+    epoch, dated = load_bars(str(epoch_path)), load_bars(str(iso_path))
+    for field in ("timestamp", "open", "high", "low", "close", "volume"):
+        np.testing.assert_array_equal(epoch[field], dated[field])
+    np.testing.assert_array_equal(epoch["close"], bars["close"])
@@ -0,0 +1,29 @@
+# Batch input parsing: bad rows are reported and skipped, not fatal.
+#   python -m pytest tests
+from src.batch import completed_ids, read_queries
+
+
+def test_read_queries_skips_bad_lines(tmp_path, capsys):
+    path = tmp_path / "queries.jsonl"
+    path.write_text(
+        '{"id": "a", "query": "What moved futures overnight?"}\n'
+        '{"id": "b", "query": "unterminated\n'
+        "\n"
+        '["not", "an", "object"]\n'
+        '"just a string"\n'
+        '{"id": "c"}\n'
+        '{"prompt": "Review my trades"}\n'
+    )
+    assert list(read_queries(str(path))) == [("a", "What moved futures overnight?"), ("7", "Review my trades")]
+    out = capsys.readouterr().out
+    assert "line 2: invalid JSON" in out
+    assert "line 4: expected an object, got list" in out
+    assert "line 5: expected an object, got str" in out
+    assert "line 6: no query" in out
+
+
+def test_completed_ids_drops_half_written_line(tmp_path):
+    path = tmp_path / "results.jsonl"
+    path.write_text('{"id": "a", "status": "ok"}\n{"id": "b", "status": "error"}\n{"id": "c", "sta')
+    assert completed_ids(str(path)) == {"a"}
+    assert path.read_text().endswith('"error"}\n')
@@ -0,0 +1,77 @@
+# Response cache: TTL expiry, LRU eviction and the TRADINGPAL_CACHE=0 switch.
+#   python -m pytest tests
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+
+from src.utils import cache as cache_module
+from src.utils import helpers
+from src.utils.cache import CachedChatModel, ResponseCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def fake_model(*replies):
+    return GenericFakeChatModel(messages=iter([AIMessage(r) for r in replies]))
+
+
+def test_entry_expires_after_ttl(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_module.time, "time", clock)
+    cache = ResponseCache()
+    cache.put("k", "answer", ttl=30)
+    clock.now += 29
+    assert cache.get("k") == "answer"
+    clock.now += 2
+    assert cache.get("k") is None
+    assert cache.info()["expired"] == 1
+    assert cache.info()["entries"] == 0
+
+
+def test_expired_entry_in_sqlite_tier_is_a_miss(monkeypatch, tmp_path):
+    clock = Clock()
+    monkeypatch.setattr(cache_module.time, "time", clock)
+    cache = ResponseCache(db_path=str(tmp_path / "cache.db"))
+    cache.put("k", "answer", ttl=30)
+    cache._mem.clear()
+    assert cache.get("k") == "answer"
+    assert cache.info()["disk_hits"] == 1
+    cache._mem.clear()
+    clock.now += 31
+    assert cache.get("k") is None
+
+
+def test_lru_evicts_oldest_entry():
+    cache = ResponseCache(max_entries=2)
+    cache.put("a", "1", ttl=60)
+    cache.put("b", "2", ttl=60)
+    cache.get("a")
+    cache.put("c", "3", ttl=60)
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.info()["evictions"] == 1
+
+
+def test_model_answers_repeated_prompt_from_cache():
+    llm = CachedChatModel(fake_model("first", "second"), ResponseCache(), node="premarket")
+    assert llm.invoke("What moved futures overnight?").content == "first"
+    hit = llm.invoke("What  moved futures   overnight?")
+    assert hit.content == "first"
+    assert hit.response_metadata["cache_hit"]
+
+
+def test_cache_disabled_by_env(monkeypatch):
+    monkeypatch.setenv("TRADINGPAL_CACHE", "0")
+    helpers.set_client(fake_model("first", "second"))
+    try:
+        llm = helpers.get_llm("premarket")
+        assert llm.cache is None
+        assert llm.invoke("What moved futures overnight?").content == "first"
+        assert llm.invoke("What moved futures overnight?").content == "second"
+    finally:
+        helpers.set_client(None)
@@ -0,0 +1,101 @@
+# SqliteCheckpointer: a conversation interrupted in one process resumes from
+# the file in another, and per-thread retention / idle eviction bound growth.
+#   python -m pytest tests
+import operator
+from typing import Annotated, TypedDict
+
+import pytest
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.graph import END, START, StateGraph
+from langgraph.types import Command
+
+from src.routing import classifier
+from src.utils import helpers
+from src.utils.checkpointer import SqliteCheckpointer
+
+
+@pytest.fixture
+def offline_model(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "offline")
+    monkeypatch.setenv("TRADINGPAL_CACHE", "0")
+    monkeypatch.setenv("TRADINGPAL_ROUTER_THRESHOLD", "2")  # always ask the model to route
+    monkeypatch.delenv("TRADINGPAL_NEWS_PATH", raising=False)
+    monkeypatch.setattr(classifier, "_router", None)
+
+    def use(*replies):
+        helpers.set_client(GenericFakeChatModel(messages=iter([AIMessage(r) for r in replies])))
+
+    yield use
+    helpers.set_client(None)
+
+
+def test_interrupt_resumes_from_a_new_instance(tmp_path, offline_model):
+    from src.graph import trading_pal
+
+    path = str(tmp_path / "checkpoints.db")
+    config = {"configurable": {"thread_id": "t1"}}
+    offline_model("human_clarification\nI can only help with trading. What would you like to know?")
+    first = SqliteCheckpointer(path, compact_interval=0)
+    trading_pal(first).invoke({"messages": [HumanMessage("What's the weather like?")]}, config)
+    assert trading_pal(first).get_state(config).next == ("human_clarification",)
+    first.close()
+
+    offline_model("premarket", "Futures are flat ahead of the Fed.")
+    second = SqliteCheckpointer(path, compact_interval=0)
+    graph = trading_pal(second)
+    assert graph.get_state(config).next == ("human_clarification",)
+    result = graph.invoke(Command(resume="Then what does the news say about rates?"), config)
+    assert not graph.get_state(config).next
+    assert result["messages"][-1].content == "Futures are flat ahead of the Fed."
+    contents = [m.content for m in result["messages"]]
+    assert contents[0] == "What's the weather like?"
+    assert "Then what does the news say about rates?" in contents
+    second.close()
+
+
+class Counter(TypedDict):
+    steps: Annotated[list, operator.add]
+
+
+def counter_graph(checkpointer):
+    builder = StateGraph(Counter)
+    builder.add_node("step", lambda state: {"steps": [len(state["steps"])]})
+    builder.add_edge(START, "step")
+    builder.add_edge("step", END)
+    return builder.compile(checkpointer=checkpointer)
+
+
+def count(saver, table, thread_id):
+    return saver.conn.execute(f"SELECT COUNT(*) FROM {table} WHERE thread_id = ?", (thread_id,)).fetchone()[0]
+
+
+def test_keeps_only_the_latest_checkpoints(tmp_path):
+    saver = SqliteCheckpointer(str(tmp_path / "checkpoints.db"), max_checkpoints=3, compact_interval=0)
+    graph = counter_graph(saver)
+    config = {"configurable": {"thread_id": "t1"}}
+    for _ in range(10):
+        graph.invoke({"steps": []}, config)
+
+    assert count(saver, "checkpoints", "t1") == 3
+    kept = {row[0] for row in saver.conn.execute("SELECT checkpoint_id FROM checkpoints")}
+    written = {row[0] for row in saver.conn.execute("SELECT DISTINCT checkpoint_id FROM writes")}
+    assert written <= kept
+    # the state itself is intact after trimming
+    assert graph.get_state(config).values["steps"] == list(range(10))
+    saver.close()
+
+
+def test_compact_evicts_idle_threads(tmp_path):
+    saver = SqliteCheckpointer(str(tmp_path / "checkpoints.db"), idle_ttl=3600, compact_interval=0)
+    graph = counter_graph(saver)
+    for thread_id in ("idle", "active"):
+        graph.invoke({"steps": []}, {"configurable": {"thread_id": thread_id}})
+    saver.conn.execute("UPDATE threads SET last_access = last_access - 7200 WHERE thread_id = 'idle'")
+
+    assert saver.compact() == {"evicted_threads": 1}
+    assert count(saver, "checkpoints", "idle") == 0
+    assert count(saver, "writes", "idle") == 0
+    assert count(saver, "checkpoints", "active") > 0
+    assert graph.get_state({"configurable": {"thread_id": "idle"}}).values == {}
+    saver.close()
@@ -0,0 +1,91 @@
+# News store: re-ingesting a changed file replaces its chunks, removal keeps
+# BM25 scores identical to a fresh index, and premarket never gets a stand-in
+# article.
+#   python -m pytest tests
+import importlib
+import os
+
+import pytest
+
+from src.news import NewsStore
+from src.news.index import BM25Index
+
+FED = "Fed holds rates steady as inflation cools; futures rise on hopes of a cut in June."
+OIL = "Oil jumps after OPEC+ agrees to extend output cuts through the end of the year."
+CHIPS = "Chip stocks slide after export curbs on advanced semiconductors are widened."
+
+
+def write(path, text, mtime):
+    path.write_text(text)
+    os.utime(path, (mtime, mtime))
+
+
+def sources(store, query):
+    return [meta["source"] for _, _, meta in store.search(query, 10)]
+
+
+def test_changed_file_replaces_its_chunks(tmp_path):
+    store = NewsStore()
+    fed, oil = tmp_path / "fed.txt", tmp_path / "oil.txt"
+    write(fed, FED, 1000)
+    write(oil, OIL, 1000)
+    assert store.ingest_path(str(tmp_path)) == 2
+
+    # a corrected article: near-identical text must not be rejected as a
+    # duplicate of its own old version, and the old chunk must be gone
+    write(fed, FED.replace("June", "July"), 2000)
+    assert store.ingest_path(str(tmp_path)) == 1
+    results = store.search("fed rates cut", 10)
+    assert len(results) == 1
+    assert "July" in results[0][1]
+    assert store.stats["documents"] == 2
+
+    os.remove(oil)
+    store.ingest_path(str(tmp_path))
+    assert sources(store, "oil opec") == []
+    assert len(store.index) == 1
+
+
+def test_unchanged_files_are_skipped(tmp_path):
+    store = NewsStore()
+    write(tmp_path / "fed.txt", FED, 1000)
+    assert store.ingest_path(str(tmp_path)) == 1
+    assert store.ingest_path(str(tmp_path)) == 0
+    assert len(store.index) == 1
+
+
+def test_scores_after_removal_match_a_fresh_index():
+    texts = [FED, OIL, CHIPS, FED + " Treasury yields fall.", OIL + " Brent tops $90.", CHIPS + " Nvidia drops 4%."]
+    index = BM25Index()
+    for text in texts:
+        index.add(text, {"text": text})
+    index.remove([1, 3])
+    fresh = BM25Index()
+    for i, text in enumerate(texts):
+        if i not in (1, 3):
+            fresh.add(text, {"text": text})
+
+    for query in ("fed rates", "oil opec cuts", "chip stocks nvidia", "yields"):
+        got = [(round(score, 12), meta["text"]) for score, _, meta in index.search(query, 10)]
+        want = [(round(score, 12), meta["text"]) for score, _, meta in fresh.search(query, 10)]
+        assert got == want
+
+
+@pytest.fixture
+def premarket(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "offline")
+    # the package attribute is the node function; the module is in sys.modules
+    return importlib.import_module("src.experts.premarket")
+
+
+def test_premarket_says_when_there_is_no_news(premarket, monkeypatch):
+    monkeypatch.setattr(premarket, "get_news_store", lambda: None)
+    assert premarket._news_context("What moved futures?").startswith("No relevant overnight news was found")
+
+    store = NewsStore()
+    store.add_document("Oil", OIL, "oil.txt")
+    monkeypatch.setattr(premarket, "get_news_store", lambda: store)
+    assert "still being loaded" in premarket._news_context("fed rates")
+    store.ready.set()
+    assert premarket._news_context("fed rates") == premarket.NO_NEWS.format(reason="")
+    assert "OPEC+" in premarket._news_context("oil opec")
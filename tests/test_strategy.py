@@ -0,0 +1,89 @@
+# Local strategy parsing: only text the grammar fully covers compiles without
+# the model; anything it would have to drop goes to the model instead.
+#   python -m pytest tests
+import importlib
+import json
+
+import pytest
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+
+from src.backtest import generate_pine, parse_strategy_text
+from src.utils import helpers
+
+
+def test_full_strategy_parses():
+    spec = parse_strategy_text(
+        "Buy when RSI crosses below 30 and price is above 200 EMA. Sell when RSI crosses above 70. "
+        "Use 10% of equity per trade on the 1h chart. Set a stop loss at 5% and a take profit at 15%."
+    )
+    assert spec == {
+        "entry_condition": "rsi crosses below 30 and price is above 200 ema",
+        "exit_condition": "rsi crosses above 70",
+        "position_size": "10% of account equity",
+        "timeframe": "1h",
+        "stop_loss": "5%",
+        "take_profit": "15%",
+    }
+    assert "default_qty_value=10" in generate_pine(spec)
+
+
+@pytest.mark.parametrize("text,expected", [
+    ("Buy when RSI crosses below 30, sell when RSI crosses above 70, with a 2% stop loss. Backtest it.",
+     {"entry_condition": "rsi crosses below 30", "exit_condition": "rsi crosses above 70", "stop_loss": "2%"}),
+    ("Buy when close crosses above the 20 SMA on the daily chart and sell when close crosses below the 20 SMA",
+     {"entry_condition": "close crosses above the 20 sma", "timeframe": "daily",
+      "exit_condition": "close crosses below the 20 sma"}),
+    ("Buy when price is above 200 EMA; stop loss at 5%, take profit at 10%",
+     {"entry_condition": "price is above 200 ema", "stop_loss": "5%", "take_profit": "10%"}),
+    ("Buy when RSI crosses below 30 using 25% of my portfolio",
+     {"entry_condition": "rsi crosses below 30", "position_size": "25% of account equity"}),
+])
+def test_supported_phrasings(text, expected):
+    assert parse_strategy_text(text) == expected
+
+
+@pytest.mark.parametrize("text", [
+    "Buy when RSI crosses below 30. Only trade on Mondays. Use a 3% trailing stop.",
+    "Buy when RSI crosses below 30. Risk 2% per trade.",
+    "Buy when RSI crosses below 30. Use a 3% trailing stop.",
+    "Buy when RSI crosses below 30 only on Mondays.",
+    "Buy when RSI crosses below 30 with a stop loss at 5% trailing.",
+    "Buy when RSI crosses below 30 in the first hour of the session.",
+    "Buy when RSI crosses below 30. Sell when it crosses back above.",
+    "Buy when RSI crosses below 30. Sell half when RSI crosses above 60.",
+    "Buy when RSI crosses below 30. Buy when RSI crosses below 20.",
+    "I like buying dips. Buy when RSI crosses below 30.",
+    "Sell when RSI crosses above 70.",
+])
+def test_unsupported_clauses_are_not_parsed(text):
+    assert parse_strategy_text(text) is None
+
+
+@pytest.fixture
+def strategy_module(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "offline")
+    monkeypatch.setenv("TRADINGPAL_CACHE", "0")
+    monkeypatch.delenv("TRADINGPAL_OHLCV_PATH", raising=False)
+    yield importlib.import_module("src.experts.strategy")
+    helpers.set_client(None)
+
+
+def answer(module, question, *replies):
+    model = GenericFakeChatModel(messages=iter([AIMessage(r) for r in replies]))
+    helpers.set_client(model)
+    return module.strategy({"messages": [HumanMessage(question)]})["messages"][0].content
+
+
+def test_unsupported_rules_go_to_the_model(strategy_module):
+    spec = {"entry_condition": "RSI crosses below 30", "unsupported": ["only trade on Mondays", "3% trailing stop"]}
+    script = answer(strategy_module,
+                    "Buy when RSI crosses below 30. Only trade on Mondays. Use a 3% trailing stop. Backtest it.",
+                    json.dumps(spec), "//@version=5\n// model-written script")
+    assert script.startswith("//@version=5\n// model-written script")
+    assert "can't simulate only trade on Mondays; 3% trailing stop" in script
+
+
+def test_plain_strategy_needs_no_model(strategy_module):
+    script = answer(strategy_module, "Buy when RSI crosses below 30. Sell when RSI crosses above 70.")
+    assert "ta.crossunder(rsi14, 30)" in script